@@ -0,0 +1,224 @@
+import numpy as np
+import pandas as pd
+
+from analytics.valuation import DCFModel
+
+# Forward return horizons, in trading days of the ticker's own price history
+HORIZONS = {"1m": 21, "3m": 63, "12m": 252}
+
+
+class DCFBacktest:
+    """
+    Point-in-time DCF backtest: every company is valued at each past fiscal period with only the statements
+    published by then, and the implied upside is compared with the returns that followed.
+
+    - A period's statements become known 'filing_lag_days' after its end. The valuation date is the first trading
+      day on or after that, found for all (ticker, period) points at once by an as-of join on the price table.
+    - Closes are split-adjusted, reported share counts are not: the shares of a point are multiplied by the
+      ratios of the ticker's stock splits after its publication date (from the prices' 'Stock Splits' column),
+      so the fair value per share is on the same basis as the close.
+    - All points are valued in a single DCFModel.run_dcf_batch call.
+    - Forward returns for every horizon are read from the same sorted price table, 'days' rows after the entry.
+    """
+
+    def __init__(
+        self,
+        history: pd.DataFrame,
+        prices: pd.DataFrame,
+        dcf_config: pd.DataFrame,
+        filing_lag_days: int = 90,
+        horizons: dict[str, int] | None = None,
+        max_entry_gap_days: int = 10,
+        min_names: int = 5
+    ):
+        """
+        Parameters
+        ----------
+        history : pd.DataFrame
+            Point-in-time DCF inputs indexed by (Ticker, Date) with 'rev', 'roic', 'net_debt' and 'shares' columns
+            (PanelFundamentalProcessor.get_history). Shares are split-adjusted where 'reported_shares' is True
+            (all rows without that column).
+        prices : pd.DataFrame
+            Long price table with 'Date', 'Ticker' and 'Close' columns (YahooPriceConnector.fetch_many(long=True)),
+            and optionally 'Stock Splits' (split ratio on the split day, else 0 or NaN).
+        dcf_config : pd.DataFrame
+            Resolved DCF config per ticker (config.json names: revenue_growth_5y, operating_margin_target,
+            tax_rate, wacc, terminal_growth), indexed by ticker.
+        filing_lag_days : int
+            Days between a fiscal period end and the publication of its statements.
+        horizons : dict
+            Forward return horizons {name: trading days}, HORIZONS by default.
+        max_entry_gap_days : int
+            Points without a price within this many days of the publication date (not listed yet,
+            delisted) are left out.
+        min_names : int
+            Fewest tickers in a fiscal year for its cross-sectional rank IC to count.
+        """
+        self.history = history
+        self.prices = prices
+        self.dcf_config = dcf_config
+        self.filing_lag_days = filing_lag_days
+        self.horizons = horizons or HORIZONS
+        self.max_entry_gap_days = max_entry_gap_days
+        self.min_names = min_names
+        self._results: pd.DataFrame | None = None
+
+    # -------------------------
+    # Point-in-time valuations
+    # -------------------------
+    def run(self) -> pd.DataFrame:
+        """
+        One row per (ticker, fiscal period) with a valuation date: the entry Close, the DCF fair value,
+        the implied upside and the forward return over each horizon (NaN where the history ends earlier).
+        """
+        if self._results is not None:
+            return self._results.copy()
+
+        columns = ["Date", "Ticker", "Close", *(["Stock Splits"] if "Stock Splits" in self.prices else [])]
+        prices = self.prices[columns].dropna(subset=["Close"])
+        points = self.history.reset_index()
+        # Tickers as integer codes shared by both tables, dates as day numbers: the join runs on int64 keys
+        codes, _ = pd.factorize(np.concatenate([prices["Ticker"].to_numpy(dtype=object),
+                                                points["Ticker"].to_numpy(dtype=object)]))
+        price_codes, point_codes = codes[:len(prices)], codes[len(prices):]
+        price_days = _day_numbers(prices["Date"])
+        period_days = _day_numbers(points["Date"])
+        available = period_days + self.filing_lag_days
+        split_factor = self._split_factors(prices, price_codes, point_codes, available)
+
+        # Price table sorted by (ticker, date) once; a bar's forward bars are the next rows of the same ticker
+        price_keys = _join_keys(price_codes, price_days)
+        order = np.argsort(price_keys, kind="stable")
+        price_keys, price_codes, price_days = price_keys[order], price_codes[order], price_days[order]
+        close = prices["Close"].to_numpy(dtype=float)[order]
+
+        # As-of join (forward): first bar of the same ticker on or after the publication date
+        entry = np.searchsorted(price_keys, _join_keys(point_codes, available), side="left")
+        matched = entry < len(close)
+        entry = np.where(matched, entry, 0)
+        if len(close):
+            matched &= (price_codes[entry] == point_codes) & (price_days[entry] - available <= self.max_entry_gap_days)
+        entry = entry[matched]
+        points = points[matched]
+
+        results = pd.DataFrame({
+            "Ticker": points["Ticker"].to_numpy(),
+            "Date": pd.to_datetime(points["Date"]).to_numpy(),
+            "Entry": price_days[entry].astype("datetime64[D]").astype("datetime64[ns]"),
+            "Close": close[entry],
+        })
+        split_factor = split_factor[matched]
+        if "reported_shares" in points:
+            split_factor = np.where(points["reported_shares"].to_numpy(dtype=bool), split_factor, 1.0)
+        config = self.dcf_config.reindex(results["Ticker"])
+        fair_value = DCFModel.run_dcf_batch(
+            points["rev"].to_numpy(dtype=float),
+            gr_next5y=config["revenue_growth_5y"].to_numpy(dtype=float),
+            operating_margin_target=config["operating_margin_target"].to_numpy(dtype=float),
+            tax_rate=config["tax_rate"].to_numpy(dtype=float),
+            roic_target=points["roic"].to_numpy(dtype=float),
+            wacc=config["wacc"].to_numpy(dtype=float),
+            terminal_gr=config["terminal_growth"].to_numpy(dtype=float),
+            shares_outst=points["shares"].to_numpy(dtype=float) * split_factor,
+            net_debt=points["net_debt"].to_numpy(dtype=float),
+        )["share_price"]
+        results["split_factor"] = split_factor
+        results["fair_value"] = fair_value
+        results["upside"] = fair_value / results["Close"].to_numpy() - 1
+
+        # Forward returns: Close 'days' rows ahead, if that row still belongs to the ticker
+        for name, days in self.horizons.items():
+            exit_ = entry + days
+            safe_exit = np.minimum(exit_, len(close) - 1)
+            valid = (exit_ < len(close)) & (price_codes[safe_exit] == price_codes[entry])
+            results[f"fwd_{name}"] = np.where(valid, close[safe_exit] / close[entry] - 1, np.nan)
+
+        self._results = results.sort_values(["Ticker", "Date"], ignore_index=True)
+        return self._results.copy()
+
+    @staticmethod
+    def _split_factors(prices: pd.DataFrame, price_codes: np.ndarray, codes: np.ndarray,
+                       days: np.ndarray) -> np.ndarray:
+        # Product of each ticker's split ratios after 'days', read from suffix sums of log ratios over the
+        # (ticker, day) sorted split events at the ticker's first event after the day
+        if "Stock Splits" not in prices:
+            return np.ones(len(codes))
+        ratios = prices["Stock Splits"].to_numpy(dtype=float)
+        is_split = np.isfinite(ratios) & (ratios > 0) & (ratios != 1)
+        if not is_split.any():
+            return np.ones(len(codes))
+        split_codes, split_days = price_codes[is_split], _day_numbers(prices["Date"])[is_split]
+        split_keys = _join_keys(split_codes, split_days)
+        order = np.argsort(split_keys, kind="stable")
+        split_keys, split_codes, log_ratios = split_keys[order], split_codes[order], np.log(ratios[is_split][order])
+
+        # Log ratios of each event and the ticker's later ones
+        cumulative = np.cumsum(log_ratios)
+        ticker_last = np.searchsorted(split_codes, split_codes, side="right") - 1
+        after = cumulative[ticker_last] - cumulative + log_ratios
+
+        first = np.searchsorted(split_keys, _join_keys(codes, days), side="right")
+        safe = np.minimum(first, len(split_keys) - 1)
+        found = (first < len(split_keys)) & (split_codes[safe] == codes)
+        return np.where(found, np.exp(after[safe]), 1.0)
+
+    # -------------------------
+    # Signal quality
+    # -------------------------
+    def summary(self) -> pd.DataFrame:
+        """
+        Quality of the upside signal per horizon:
+            observations - points with both an upside and a forward return
+            hit_rate     - share of those where the upside and the forward return have the same sign
+            rank_ic      - mean over fiscal years of the cross-sectional Spearman correlation of the two
+            rank_ic_t    - t-statistic of the yearly rank ICs
+            periods      - fiscal years with at least 'min_names' tickers
+        """
+        results = self.run()
+        results = results[np.isfinite(results["upside"])]
+        rows = {}
+        for name in self.horizons:
+            column = f"fwd_{name}"
+            valid = results.dropna(subset=[column])
+            ic = self._rank_ic(valid["upside"], valid[column], valid["Date"].dt.year)
+            rows[name] = {
+                "observations": len(valid),
+                "hit_rate": float((np.sign(valid["upside"]) == np.sign(valid[column])).mean()) if len(valid) else np.nan,
+                "rank_ic": ic.mean(),
+                "rank_ic_t": ic.mean() / ic.std() * np.sqrt(len(ic)) if len(ic) > 1 else np.nan,
+                "periods": len(ic),
+            }
+        return pd.DataFrame.from_dict(rows, orient="index").rename_axis("horizon")
+
+    def yearly_rank_ic(self) -> pd.DataFrame:
+        """
+        Cross-sectional rank IC per fiscal year (rows) and horizon (columns).
+        """
+        results = self.run()
+        results = results[np.isfinite(results["upside"])]
+        columns = {}
+        for name in self.horizons:
+            valid = results.dropna(subset=[f"fwd_{name}"])
+            columns[name] = self._rank_ic(valid["upside"], valid[f"fwd_{name}"], valid["Date"].dt.year)
+        return pd.DataFrame(columns).rename_axis("year")
+
+    def _rank_ic(self, signal: pd.Series, target: pd.Series, period: pd.Series) -> pd.Series:
+        # Spearman correlation per period in grouped passes: Pearson correlation of the within-period ranks
+        ranks = pd.DataFrame({"x": signal, "y": target}).groupby(period).rank()
+        centered = ranks - ranks.groupby(period).transform("mean")
+        sums = pd.DataFrame({
+            "xy": centered["x"] * centered["y"], "xx": centered["x"] ** 2, "yy": centered["y"] ** 2
+        }).groupby(period).sum()
+        counts = period.value_counts()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ic = sums["xy"] / np.sqrt(sums["xx"] * sums["yy"])
+        return ic[counts.reindex(ic.index) >= self.min_names].dropna()
+
+
+def _day_numbers(dates: pd.Series) -> np.ndarray:
+    return pd.to_datetime(dates).to_numpy(dtype="datetime64[D]").astype(np.int64)
+
+
+def _join_keys(codes: np.ndarray, days: np.ndarray) -> np.ndarray:
+    # (ticker, day) packed into one sortable int64: ticker code in the high bits, offset day number in the low 32
+    return (codes.astype(np.int64) << 32) + (days + (1 << 31))
@@ -1,12 +1,12 @@
 import pandas as pd
 import numpy as np
 
-from data.logger import Logger
+from data.report import Report
 from data.models.fundamental_data import FundamentalData
 
 
 class FundamentalProcessor:  # Raw financial statement conversion to econ. metrics using the McKinsey Valuation framework (Valuation - measuring and managing the value of companies 8th ed.)
-    def __init__(self, data: FundamentalData, logger: Logger | None = None):
+    def __init__(self, data: FundamentalData, logger: Report | None = None):
         self.logger = logger
         self._data = data
         self._output: pd.DataFrame | None = None
@@ -123,3 +123,197 @@ class FundamentalProcessor:  # Raw financial statement conversion to econ. metri
         economic_df["Growth"] = economic_df["Revenue"].pct_change()
 
         return economic_df
+
+
+def statements_to_long(fundamentals: dict[str, FundamentalData]) -> pd.DataFrame:
+    """
+    Stacks the statements of many companies into one long (ticker, date, line_item, value) table.
+    NaN values are kept: a line item counts as reported by a company even where its values are missing,
+    as in the statement frames themselves.
+    """
+    tickers, dates, items, values = [], [], [], []
+    for ticker, data in fundamentals.items():
+        for df in data.statements.values():
+            if df.empty:
+                continue
+            rows, cols = df.shape
+            tickers.append(np.full(rows * cols, ticker, dtype=object))
+            dates.append(np.tile(pd.to_datetime(df.columns).to_numpy(), rows))
+            items.append(np.repeat(df.index.to_numpy(dtype=object), cols))
+            values.append(df.to_numpy(dtype=float).ravel())
+    if not values:
+        return pd.DataFrame({"ticker": [], "date": pd.to_datetime([]), "line_item": [], "value": []})
+    return pd.DataFrame({
+        "ticker": np.concatenate(tickers),
+        "date": np.concatenate(dates),
+        "line_item": np.concatenate(items),
+        "value": np.concatenate(values),
+    })
+
+
+class PanelFundamentalProcessor:
+    """
+    FundamentalProcessor for many companies at once: the same economic metrics and fallback rules,
+    computed column-wise over a long (ticker, date, line_item, value) statement table.
+    """
+
+    LINE_ITEMS = (
+        "EBIT", "Pretax Income", "Interest Expense", "Operating Income", "Tax Provision", "Current Assets",
+        "Cash And Cash Equivalents", "Current Liabilities", "Net PPE", "Gross PPE", "Accumulated Depreciation",
+        "Total Non Current Assets", "Total Revenue", "Total Debt", "Ordinary Shares Number"
+    )
+
+    def __init__(self, statements: pd.DataFrame, info: dict[str, dict] | None = None):
+        """
+        Parameters
+        ----------
+        statements : pd.DataFrame
+            Long table with 'ticker', 'date', 'line_item' and 'value' columns (see statements_to_long).
+        info : dict
+            Optional FundamentalData.info per ticker, for shares outstanding and the equity-only check.
+        """
+        self.info = info or {}
+        if self.info:
+            equities = [t for t, i in self.info.items() if i.get("quoteType") == "EQUITY"]
+            statements = statements[statements["ticker"].isin(equities)]
+        self.statements = statements
+        self._output: pd.DataFrame | None = None
+        # Line items pivoted to columns, and which items each ticker reports (set by _process_metrics)
+        self._wide: pd.DataFrame | None = None
+        self._present: pd.DataFrame | None = None
+
+    @classmethod
+    def from_fundamentals(cls, fundamentals: dict[str, FundamentalData]) -> "PanelFundamentalProcessor":
+        return cls(statements_to_long(fundamentals), {t: d.info for t, d in fundamentals.items()})
+
+    @classmethod
+    def from_warehouse(cls, warehouse, tickers: list[str] | None = None) -> "PanelFundamentalProcessor":
+        """
+        Reads statements straight from a FundamentalsWarehouse (data.connector.warehouse).
+        """
+        tickers = tickers or warehouse.tickers()
+        return cls(warehouse.long_statements(tickers), {t.upper(): warehouse.info(t) or {} for t in tickers})
+
+    def get_metrics(self) -> pd.DataFrame:
+        """
+        Metrics of all companies, indexed by (Ticker, Date); .loc[ticker] matches FundamentalProcessor.get_metrics
+        """
+        if self._output is None:
+            self._output = self._process_metrics()
+        return self._output.copy()
+
+    def get_latest_data(self) -> pd.DataFrame:
+        """
+        FundamentalProcessor.get_latest_data for every company, one row per ticker
+        """
+        metrics = self.get_metrics()
+        latest = metrics.groupby(level="Ticker").tail(1).droplevel("Date")
+        tickers = latest.index
+
+        # Net debt from the latest balance sheet (newest date with a Total Debt or Cash row,
+        # i.e. the first column of a yfinance statement)
+        wide = self._wide
+        debt_rows = self._present[["Total Debt", "Cash And Cash Equivalents"]].any(axis=1)
+        bs_dates = self.statements[self.statements["line_item"].isin(["Total Debt", "Cash And Cash Equivalents"])]
+        bs_latest = bs_dates.groupby("ticker")["date"].max()
+        keys = pd.MultiIndex.from_arrays([bs_latest.index, bs_latest.to_numpy()])
+        net_debt = pd.Series(
+            (self._get(wide, "Total Debt").reindex(keys) - self._get(wide, "Cash And Cash Equivalents").reindex(keys))
+            .to_numpy(), index=bs_latest.index
+        )
+        net_debt = net_debt.reindex(tickers).where(debt_rows.reindex(tickers, fill_value=False), 0.0)
+
+        return pd.DataFrame({
+            "rev": latest["Revenue"],
+            "nopat": latest["NOPAT"],
+            "roic": latest["ROIC"],
+            "net_debt": net_debt,
+            "shares": [self.info.get(t, {}).get("sharesOutstanding", 1) for t in tickers],
+        }, index=tickers)
+
+    def get_history(self) -> pd.DataFrame:
+        """
+        get_latest_data as of every reported period, indexed by (Ticker, Date): each row only uses statements
+        dated on or before it (input of point-in-time valuations, see analytics.backtest). Net debt is taken from
+        the period's own balance sheet, shares from its 'Ordinary Shares Number' where reported ('reported_shares'
+        True: counted before any later stock split), else the current sharesOutstanding.
+        """
+        metrics = self.get_metrics()
+        wide = self._wide
+        tickers = metrics.index.get_level_values("Ticker")
+        current_shares = pd.Series({t: i.get("sharesOutstanding", 1) for t, i in self.info.items()}, dtype=float)
+        reported_shares = np.where(self._has(wide, "Ordinary Shares Number"),
+                                   self._get(wide, "Ordinary Shares Number"), np.nan)
+        shares = np.where(np.isnan(reported_shares),
+                          current_shares.reindex(tickers).fillna(1).to_numpy(), reported_shares)
+        return pd.DataFrame({
+            "rev": metrics["Revenue"],
+            "nopat": metrics["NOPAT"],
+            "roic": metrics["ROIC"],
+            "net_debt": self._get(wide, "Total Debt") - self._get(wide, "Cash And Cash Equivalents"),
+            "shares": shares,
+            "reported_shares": ~np.isnan(reported_shares),
+        }, index=metrics.index)
+
+    # -------------------------
+    # Internal helpers
+    # -------------------------
+    def _get(self, wide: pd.DataFrame, item: str) -> pd.Series:
+        # full_df.get(item, 0): the company's values if it reports the item at all, else 0
+        reported = self._present[item].reindex(wide.index.get_level_values("Ticker")).to_numpy()
+        values = wide[item].to_numpy() if item in wide.columns else np.full(len(wide), np.nan)
+        return pd.Series(np.where(reported, values, 0.0), index=wide.index)
+
+    def _has(self, wide: pd.DataFrame, *items: str) -> np.ndarray:
+        tickers = wide.index.get_level_values("Ticker")
+        return np.logical_and.reduce([self._present[item].reindex(tickers).to_numpy() for item in items])
+
+    def _process_metrics(self) -> pd.DataFrame:
+        long = self.statements
+        # One row per (ticker, date) reported in any statement, as in the per-company concat
+        index = pd.MultiIndex.from_frame(
+            long[["ticker", "date"]].drop_duplicates().assign(date=lambda d: pd.to_datetime(d["date"])),
+            names=["Ticker", "Date"]
+        ).sort_values()
+        used = long[long["line_item"].isin(self.LINE_ITEMS)].drop_duplicates(["ticker", "date", "line_item"])
+        wide = used.set_index(["ticker", "date", "line_item"])["value"].unstack("line_item")
+        wide.index = wide.index.set_names(["Ticker", "Date"])
+        wide = wide.reindex(index)
+        self._wide = wide
+        self._present = (
+            used.groupby(["ticker", "line_item"]).size().unstack(fill_value=0)
+            .reindex(columns=list(self.LINE_ITEMS), fill_value=0)
+            .reindex(index.unique("Ticker"), fill_value=0) > 0
+        )
+        get = lambda item: self._get(wide, item)
+        economic_df = pd.DataFrame(index=index)
+
+        # NOPAT (Net Operating Profit Less Adjusted Taxes) = EBIT * (1 - Tax Rate)
+        ebit = np.where(
+            self._has(wide, "EBIT"), get("EBIT"),
+            np.where(self._has(wide, "Pretax Income", "Interest Expense"),
+                     get("Pretax Income") + get("Interest Expense").fillna(0), get("Operating Income"))
+        )
+        economic_df["NOPAT"] = ebit - get("Tax Provision")
+
+        # Invested Capital = Operating Working Cash + Net Fixed Assets
+        op_work_cap = (get("Current Assets") - get("Cash And Cash Equivalents")) - get("Current Liabilities")
+        net_ppe = np.where(self._has(wide, "Net PPE"), get("Net PPE"),
+                           get("Gross PPE") - get("Accumulated Depreciation"))
+        other_assets = get("Total Non Current Assets") - net_ppe
+        economic_df["Invested_Capital"] = op_work_cap + net_ppe + other_assets
+
+        # ROIC (Return On Invested Capital) = NOPAT / Invested Capital
+        economic_df["ROIC"] = economic_df["NOPAT"] / economic_df["Invested_Capital"].replace(0, np.nan)
+
+        # Free Cash Flow and Revenue Growth, per company
+        by_ticker = economic_df.groupby(level="Ticker")
+        economic_df["Change_in_IC"] = by_ticker["Invested_Capital"].diff()
+        economic_df["FCF"] = economic_df["NOPAT"] - economic_df["Change_in_IC"]
+
+        economic_df["Revenue"] = get("Total Revenue")
+        # pct_change with pandas' default padding: gaps are forward-filled within the company first
+        padded = economic_df.groupby(level="Ticker")["Revenue"].ffill()
+        economic_df["Growth"] = padded / padded.groupby(level="Ticker").shift(1) - 1
+
+        return economic_df
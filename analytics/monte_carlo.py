@@ -0,0 +1,266 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analytics.valuation import DCFAssumptions, DCFModel, DCF_INPUT_FIELDS
+
+
+# -------------------------
+# Input distributions
+# -------------------------
+class Distribution(ABC):
+    """
+    Base class for Monte Carlo input distributions.
+    """
+
+    @abstractmethod
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draw 'size' samples using 'rng'."""
+        pass
+
+
+@dataclass
+class Normal(Distribution):
+    mean: float
+    std: float
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return rng.normal(self.mean, self.std, size)
+
+
+@dataclass
+class Triangular(Distribution):
+    low: float
+    mode: float
+    high: float
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return rng.triangular(self.low, self.mode, self.high, size)
+
+
+class Empirical(Distribution):
+    """
+    Bootstrap distribution resampling observed values (e.g. historical revenue growth).
+    """
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=float)
+        self.values = values[np.isfinite(values)]
+        if self.values.size == 0:
+            raise ValueError("Empirical distribution needs at least one finite observation")
+
+    @classmethod
+    def from_history(cls, history: pd.Series) -> "Empirical":
+        return cls(history.dropna().to_numpy())
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return rng.choice(self.values, size=size, replace=True)
+
+
+# -------------------------
+# Chunk workers (module level, so they can be sent to worker processes)
+# -------------------------
+def _draw_share_prices(spec: dict, rng: np.random.Generator, size: int) -> np.ndarray:
+    inputs = dict(spec["base"])
+    fields = spec["fields"]
+    draws = np.column_stack([spec["distributions"][f].sample(rng, size) for f in fields]) if fields else None
+
+    if draws is not None and spec["cholesky"] is not None:
+        # Iman-Conover: reorder the independent marginal draws so that their ranks follow correlated normals
+        scores = rng.standard_normal((size, len(fields))) @ spec["cholesky"].T
+        ranks = scores.argsort(axis=0).argsort(axis=0)
+        draws = np.take_along_axis(np.sort(draws, axis=0), ranks, axis=0)
+
+    for i, field in enumerate(fields):
+        inputs[field] = draws[:, i]
+    return DCFModel.run_dcf_batch(spec["current_rev"], **inputs)["share_price"]
+
+
+def _summarize_chunk(values: np.ndarray, edges: np.ndarray, current_price: float | None) -> dict:
+    finite = values[np.isfinite(values)]
+    return {
+        "n": finite.size,
+        "invalid": values.size - finite.size,
+        "sum": finite.sum(),
+        "sum_sq": np.square(finite).sum(),
+        "min": finite.min() if finite.size else np.inf,
+        "max": finite.max() if finite.size else -np.inf,
+        "below": int(np.count_nonzero(finite < edges[0])),
+        "above": int(np.count_nonzero(finite > edges[-1])),
+        "counts": np.histogram(finite, bins=edges)[0],
+        "exceeds_price": int(np.count_nonzero(finite > current_price)) if current_price is not None else 0,
+    }
+
+
+def _run_chunk(args: tuple) -> dict:
+    spec, seed, size, edges, current_price = args
+    values = _draw_share_prices(spec, np.random.default_rng(seed), size)
+    return _summarize_chunk(values, edges, current_price)
+
+
+class MonteCarloDCF:
+    """
+    Monte Carlo valuation on top of DCFAssumptions / DCFModel.run_dcf_batch.
+
+    Samples are drawn and valued in fixed-size chunks; each chunk is reduced to running moments and a fixed-bin
+    histogram, so peak memory depends on chunk_size and bins only, never on n_samples.
+    """
+
+    def __init__(
+        self,
+        current_rev: float,
+        base_assumptions: DCFAssumptions,
+        distributions: dict[str, Distribution],
+        correlation: dict[tuple[str, str], float] | None = None,
+        chunk_size: int = 100_000,
+        bins: int = 20_000,
+        seed: int | None = None,
+        workers: int = 1
+    ):
+        """
+        Parameters
+        ----------
+        current_rev : float
+            Latest revenue, as for DCFModel.run_dcf.
+        base_assumptions : DCFAssumptions
+            Fixed values for every field without a distribution.
+        distributions : dict
+            DCFAssumptions field -> Distribution (e.g. {"wacc": Normal(0.08, 0.01)}).
+        correlation : dict
+            Optional rank correlations between stochastic fields, e.g. {("wacc", "terminal_gr"): 0.5}.
+        chunk_size : int
+            Samples valued per chunk (bounds peak memory).
+        bins : int
+            Histogram resolution used for percentiles.
+        seed : int
+            Seed for reproducible results, independent of the number of workers.
+        workers : int
+            Number of processes chunks are spread over (1 = run in this process).
+        """
+        unknown = set(distributions) - set(DCF_INPUT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown DCFAssumptions fields: {unknown}")
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+
+        fields = list(distributions)
+        self.scenario = base_assumptions.name
+        self.chunk_size = chunk_size
+        self.bins = bins
+        self.seed = seed
+        self.workers = workers
+        self._spec = {
+            "current_rev": current_rev,
+            "base": {f: getattr(base_assumptions, f) for f in DCF_INPUT_FIELDS},
+            "fields": fields,
+            "distributions": distributions,
+            "cholesky": self._cholesky(fields, correlation) if correlation else None,
+        }
+
+    @staticmethod
+    def _cholesky(fields: list[str], correlation: dict[tuple[str, str], float]) -> np.ndarray:
+        matrix = np.eye(len(fields))
+        for (a, b), rho in correlation.items():
+            if a not in fields or b not in fields:
+                raise ValueError(f"Correlation given for non-stochastic field pair ({a}, {b})")
+            i, j = fields.index(a), fields.index(b)
+            matrix[i, j] = matrix[j, i] = rho
+        return np.linalg.cholesky(matrix)
+
+    # -------------------------
+    # Simulation
+    # -------------------------
+    def run(
+        self,
+        n_samples: int = 1_000_000,
+        current_price: float | None = None,
+        percentiles: tuple = (5, 10, 25, 50, 75, 90, 95)
+    ) -> dict:
+        """
+        Draws n_samples valuations and returns the fair value distribution summary.
+        """
+        if n_samples < 1:
+            raise ValueError(f"n_samples must be at least 1, got {n_samples}")
+        sizes = [self.chunk_size] * (n_samples // self.chunk_size)
+        if n_samples % self.chunk_size:
+            sizes.append(n_samples % self.chunk_size)
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+
+        # The first chunk fixes the histogram range, the remaining ones only add to it
+        pilot = _draw_share_prices(self._spec, np.random.default_rng(seeds[0]), sizes[0])
+        edges = self._histogram_edges(pilot)
+        totals = _summarize_chunk(pilot, edges, current_price)
+        del pilot
+
+        # Chunk summaries are folded into the running totals as they arrive
+        tasks = ((self._spec, seed, size, edges, current_price) for seed, size in zip(seeds[1:], sizes[1:]))
+        if self.workers > 1 and len(sizes) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                for chunk in executor.map(_run_chunk, tasks):
+                    self._accumulate(totals, chunk)
+        else:
+            for task in tasks:
+                self._accumulate(totals, _run_chunk(task))
+
+        return self._summarize(totals, edges, current_price, percentiles)
+
+    @staticmethod
+    def _accumulate(totals: dict, chunk: dict) -> None:
+        for key, value in chunk.items():
+            if key == "min":
+                totals[key] = min(totals[key], value)
+            elif key == "max":
+                totals[key] = max(totals[key], value)
+            else:
+                totals[key] += value
+
+    def _histogram_edges(self, pilot: np.ndarray) -> np.ndarray:
+        finite = pilot[np.isfinite(pilot)]
+        if finite.size == 0:
+            raise ValueError("Monte Carlo pilot chunk produced no finite valuations")
+        low, high = np.percentile(finite, [0.5, 99.5])
+        pad = max(high - low, abs(high), 1e-9) * 0.5
+        return np.linspace(low - pad, high + pad, self.bins + 1)
+
+    def _summarize(self, totals: dict, edges: np.ndarray, current_price: float | None, percentiles: tuple) -> dict:
+        n = totals["n"]
+        if n == 0:
+            raise ValueError("Monte Carlo run produced no finite valuations")
+        mean = totals["sum"] / n
+        variance = max(totals["sum_sq"] / n - mean ** 2, 0.0) * n / max(n - 1, 1)
+        counts, below, above = totals["counts"], totals["below"], totals["above"]
+        low, high = totals["min"], totals["max"]
+
+        result = {
+            "scenario": self.scenario,
+            "samples": n,
+            "invalid_samples": totals["invalid"],
+            "mean": float(mean),
+            "std": float(np.sqrt(variance)),
+            "percentiles": pd.Series(
+                [self._percentile(q / 100, counts, edges, below, above, low, high, n) for q in percentiles],
+                index=[f"P{q}" for q in percentiles]
+            ),
+            "prob_above_price": np.nan,
+            "expected_upside": np.nan,
+        }
+        if current_price:
+            result["prob_above_price"] = totals["exceeds_price"] / n
+            result["expected_upside"] = float((mean - current_price) / current_price)
+        return result
+
+    @staticmethod
+    def _percentile(q, counts, edges, below, above, low, high, n) -> float:
+        # Linear interpolation inside the histogram bin (or the under/overflow tail) holding the q-th sample
+        target = q * n
+        if target <= below:
+            return low + (edges[0] - low) * (target / below if below else 1.0)
+        cumulative = below + np.cumsum(counts)
+        i = int(np.searchsorted(cumulative, target))
+        if i >= counts.size:
+            return edges[-1] + (high - edges[-1]) * ((target - cumulative[-1]) / above if above else 0.0)
+        before = cumulative[i] - counts[i]
+        return edges[i] + (edges[i + 1] - edges[i]) * (target - before) / counts[i]
@@ -7,7 +7,7 @@ class PriceAnalytics:
         Analytics for price-based risk and performance metrics.
     """
 
-    def __init__(self, data: pd.DataFrame, periods: int = 252):
+    def __init__(self, data: pd.DataFrame, periods: int = 252, lean: bool = False):
         """
         Parameters
         ----------
@@ -16,15 +16,26 @@ class PriceAnalytics:
             Must contain 'Date' and 'Close'.
         periods : int
             Number of trading days in the year
+        lean : bool
+            Keep only a float64 array of returns instead of a copy of the frame, and compute all summary
+            metrics from shared moments (memoized per risk-free rate). rolling() needs lean=False.
         """
         required_cols = {"Date", "Close"}
         missing = required_cols - set(data.columns)
         if missing:
             raise ValueError(f"Missing required columns: {missing}")
 
+        self.periods = periods
+        self.lean = lean
+        self._summaries: dict[float, pd.Series] = {}
+
+        if lean:
+            self.data = None
+            self._prepare_lean_returns(data["Close"])
+            return
+
         # To want to copy the value of object not the reference
         self.data = data.copy()
-        self.periods = periods
 
         # Ensure Date column is datetime
         self.data["Date"] = pd.to_datetime(self.data["Date"], errors="raise")
@@ -39,6 +50,58 @@ class PriceAnalytics:
         self.data["log_returns"] = np.log(self.data["Close"] / self.data["Close"].shift(1))
         self.returns = self.data["returns"].dropna()
 
+    def _prepare_lean_returns(self, close: pd.Series):
+        # A view on the frame's float64 block where possible; gaps are padded as pct_change does
+        values = close.to_numpy(dtype=float)
+        if np.isnan(values).any():
+            values = close.ffill().to_numpy(dtype=float)
+        returns = values[1:] / values[:-1] - 1
+        self.returns = np.ascontiguousarray(returns[~np.isnan(returns)])
+
+    def _lean_summary(self, risk_free_rate: float) -> pd.Series:
+        # All metrics from one set of moments, one partial sort and one cumulative pass
+        if risk_free_rate in self._summaries:
+            return self._summaries[risk_free_rate]
+
+        r = self.returns
+        n = r.size
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = r.sum() / n if n else np.nan
+            std = np.sqrt(np.dot(r - mean, r - mean) / (n - 1)) if n > 1 else np.nan
+
+            downside = r[r < 0]
+            downside_std = downside.std(ddof=1) if downside.size > 1 else np.nan
+            excess = mean - risk_free_rate / self.periods
+            sortino = np.sqrt(self.periods) * excess / downside_std if downside_std else np.nan
+
+            if n:
+                wealth = np.cumprod(1 + r)
+                drawdown = (wealth / np.maximum.accumulate(wealth) - 1).min()
+            else:
+                drawdown = np.nan
+
+            summary = pd.Series({
+                "Annualized Return": mean * self.periods,
+                "Sharpe Ratio": np.sqrt(self.periods) * excess / std,
+                "Sortino Ratio": sortino,
+                "Volatility": std * np.sqrt(self.periods),
+                "Max Drawdown": drawdown,
+                "CVaR (5%)": self._lean_cvar(0.05)
+            })
+        self._summaries[risk_free_rate] = summary
+        return summary
+
+    def _lean_cvar(self, alpha: float) -> float:
+        # Linear-interpolated quantile (as Series.quantile) from a single partition
+        n = self.returns.size
+        if n == 0:
+            return np.nan
+        pos = alpha * (n - 1)
+        lo, hi = int(np.floor(pos)), int(np.ceil(pos))
+        part = np.partition(self.returns, (lo, hi))
+        var = part[lo] + (part[hi] - part[lo]) * (pos - lo)
+        return part[part <= var].mean()
+
     # -------------------------
     # Performance metrics
     # -------------------------
@@ -46,6 +109,8 @@ class PriceAnalytics:
         """
         Annualized Sharpe Ratio
         """
+        if self.lean:
+            return self._lean_summary(risk_free_rate)["Sharpe Ratio"]
         excess_returns = self.returns - risk_free_rate / self.periods
         return np.sqrt(self.periods) * excess_returns.mean() / excess_returns.std()
 
@@ -53,6 +118,8 @@ class PriceAnalytics:
         """
         Annualized Sortino Ratio
         """
+        if self.lean:
+            return self._lean_summary(risk_free_rate)["Sortino Ratio"]
         downside = self.returns[self.returns < 0]
         downside_std = downside.std()
 
@@ -66,6 +133,8 @@ class PriceAnalytics:
         """
         Annualized arithmetic mean return
         """
+        if self.lean:
+            return self._lean_summary(0.0)["Annualized Return"]
         return self.returns.mean() * self.periods
 
     # -------------------------
@@ -75,12 +144,16 @@ class PriceAnalytics:
         """
         Annualized volatility
         """
+        if self.lean:
+            return self._lean_summary(0.0)["Volatility"]
         return self.returns.std() * np.sqrt(self.periods)
 
     def max_drawdown(self) -> float:
         """
         Maximum drawdown
         """
+        if self.lean:
+            return self._lean_summary(0.0)["Max Drawdown"]
         cumulative = (1 + self.returns).cumprod() # portfolio multiplier in time
         peak = cumulative.cummax() # de facto High Watermark - highest reached value in time
         drawdown = cumulative / peak - 1 # Reached relative downfall from High Watermark in time
@@ -90,9 +163,45 @@ class PriceAnalytics:
         """
         Conditional Value at Risk (Expected Shortfall)
         """
+        if self.lean:
+            return self._lean_cvar(alpha)
         var = self.returns.quantile(alpha)
         return self.returns[self.returns <= var].mean()
 
+    # -------------------------
+    # Rolling metrics
+    # -------------------------
+    def rolling(self, window: int = 63, risk_free_rate: float = 0.0, alpha: float = 0.05) -> pd.DataFrame:
+        """
+        Rolling-window metrics indexed by Date, in O(n) (O(n log n) for CVaR).
+        Drawdown is measured from the highest wealth level within the window.
+        """
+        if self.lean:
+            raise ValueError("Rolling metrics need the full frame; create PriceAnalytics with lean=False")
+        returns = self.returns
+        dates = pd.DatetimeIndex(self.data.loc[returns.index, "Date"], name="Date")
+        rolling = returns.rolling(window, min_periods=window)
+        mean = rolling.mean()
+        std = rolling.std()
+
+        downside_std = returns.where(returns < 0).rolling(window, min_periods=2).std()
+        downside_std = downside_std.where((downside_std != 0) & mean.notna())
+
+        wealth = (1 + returns).cumprod()
+        drawdown = wealth / wealth.rolling(window, min_periods=window).max() - 1
+
+        excess = mean - risk_free_rate / self.periods
+        result = pd.DataFrame({
+            "Annualized Return": mean * self.periods,
+            "Sharpe Ratio": np.sqrt(self.periods) * excess / std,
+            "Sortino Ratio": np.sqrt(self.periods) * excess / downside_std,
+            "Volatility": std * np.sqrt(self.periods),
+            "Drawdown": drawdown,
+            f"CVaR ({alpha:.0%})": _rolling_cvar(returns.to_numpy(), window, alpha),
+        })
+        result.index = dates
+        return result
+
     # -------------------------
     # Summary
     # -------------------------
@@ -100,6 +209,8 @@ class PriceAnalytics:
         """
         Summary of key metrics
         """
+        if self.lean:
+            return self._lean_summary(risk_free_rate).copy()
         return pd.Series({
             "Annualized Return": self.annualized_return(),
             "Sharpe Ratio": self.sharpe_ratio(risk_free_rate),
@@ -107,4 +218,322 @@ class PriceAnalytics:
             "Volatility": self.volatility(),
             "Max Drawdown": self.max_drawdown(),
             "CVaR (5%)": self.cvar(0.05)
-        })
\ No newline at end of file
+        })
+
+class _FenwickTree:
+    """
+        Binary indexed tree over value ranks, holding the count and the sum of the values currently
+        in a window, for order statistics and prefix sums in O(log n).
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.counts = np.zeros(size + 1, dtype=np.int64)
+        self.sums = np.zeros(size + 1)
+        self._top = 1 << (size.bit_length() - 1) if size else 0
+
+    def add(self, rank: int, value: float, count: int = 1):
+        i = rank + 1
+        while i <= self.size:
+            self.counts[i] += count
+            self.sums[i] += value * count
+            i += i & -i
+
+    def prefix(self, rank: int) -> tuple[int, float]:
+        """Count and sum of values with rank <= 'rank'."""
+        count, total = 0, 0.0
+        i = rank + 1
+        while i > 0:
+            count += self.counts[i]
+            total += self.sums[i]
+            i -= i & -i
+        return count, total
+
+    def kth(self, k: int) -> int:
+        """Rank of the k-th smallest value (0-based)."""
+        pos, remaining = 0, k + 1
+        step = self._top
+        while step:
+            if pos + step <= self.size and self.counts[pos + step] < remaining:
+                pos += step
+                remaining -= self.counts[pos]
+            step >>= 1
+        return pos
+
+
+def _rolling_cvar(returns: np.ndarray, window: int, alpha: float) -> np.ndarray:
+    # Historical CVaR over a sliding window: the window's order statistics live in a Fenwick tree
+    # keyed by global rank, so each bar costs O(log n) instead of re-sorting the window.
+    n = returns.size
+    result = np.full(n, np.nan)
+    if n < window:
+        return result
+
+    order = np.argsort(returns, kind="stable")
+    ordered = returns[order]
+    ranks = np.empty(n, dtype=np.int64)
+    ranks[order] = np.arange(n)
+
+    tree = _FenwickTree(n)
+    pos = alpha * (window - 1)
+    lo, hi = int(np.floor(pos)), int(np.ceil(pos))
+    for t in range(n):
+        tree.add(ranks[t], returns[t])
+        if t >= window:
+            tree.add(ranks[t - window], returns[t - window], -1)
+        if t >= window - 1:
+            low, high = ordered[tree.kth(lo)], ordered[tree.kth(hi)]
+            var = low + (high - low) * (pos - lo)  # Same linear interpolation as Series.quantile
+            count, total = tree.prefix(np.searchsorted(ordered, var, side="right") - 1)
+            result[t] = total / count
+    return result
+
+
+class StreamingPriceAnalytics:
+    """
+        Incrementally updated PriceAnalytics for live monitoring: each new close updates every metric in
+        constant time, from online moments (Welford), a running peak and a fixed-bin return histogram.
+    """
+
+    def __init__(
+        self,
+        periods: int = 252,
+        alpha: float = 0.05,
+        bins: int = 2_000,
+        return_range: tuple[float, float] = (-0.5, 0.5)
+    ):
+        """
+        Parameters
+        ----------
+        periods : int
+            Number of trading days (bars) in the year
+        alpha : float
+            CVaR tail probability.
+        bins, return_range : int, tuple
+            Histogram used for CVaR; returns outside the range are clipped into the edge bins
+            (their exact values still count in the tail mean).
+        """
+        self.periods = periods
+        self.alpha = alpha
+        self.edges = np.linspace(*return_range, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.sums = np.zeros(bins)
+
+        self.last_close = None
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.down_n = 0
+        self._down_mean = 0.0
+        self._down_m2 = 0.0
+        self.wealth = 1.0
+        self.peak = None
+        self.max_drawdown = np.nan
+
+    @classmethod
+    def from_prices(cls, data: pd.DataFrame, **kwargs) -> "StreamingPriceAnalytics":
+        """
+        Starts a stream from history (a PriceAnalytics-style frame with a 'Close' column).
+        """
+        stream = cls(**kwargs)
+        for close in data["Close"].to_numpy(dtype=float):
+            stream.update(close)
+        return stream
+
+    def update(self, close: float):
+        """
+        Adds one bar.
+        """
+        if np.isnan(close):
+            return
+        if self.last_close is None:
+            self.last_close = close
+            return
+        r = close / self.last_close - 1
+        self.last_close = close
+
+        # Welford moments, for all returns and for the downside
+        self.n += 1
+        delta = r - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (r - self.mean)
+        if r < 0:
+            self.down_n += 1
+            delta = r - self._down_mean
+            self._down_mean += delta / self.down_n
+            self._down_m2 += delta * (r - self._down_mean)
+
+        # Wealth path and high watermark (starting at the first return, as in PriceAnalytics)
+        self.wealth *= 1 + r
+        self.peak = self.wealth if self.peak is None else max(self.peak, self.wealth)
+        drawdown = self.wealth / self.peak - 1
+        self.max_drawdown = drawdown if np.isnan(self.max_drawdown) else min(self.max_drawdown, drawdown)
+
+        i = min(max(np.searchsorted(self.edges, r, side="right") - 1, 0), self.counts.size - 1)
+        self.counts[i] += 1
+        self.sums[i] += r
+
+    # -------------------------
+    # Metrics
+    # -------------------------
+    def volatility(self) -> float:
+        return np.sqrt(self._m2 / (self.n - 1) * self.periods) if self.n > 1 else np.nan
+
+    def annualized_return(self) -> float:
+        return self.mean * self.periods if self.n else np.nan
+
+    def sharpe_ratio(self, risk_free_rate: float = 0.0) -> float:
+        vol = self.volatility()
+        return (self.mean - risk_free_rate / self.periods) * self.periods / vol if vol else np.nan
+
+    def sortino_ratio(self, risk_free_rate: float = 0.0) -> float:
+        if self.down_n < 2 or self._down_m2 == 0:
+            return np.nan
+        downside_std = np.sqrt(self._down_m2 / (self.down_n - 1))
+        return np.sqrt(self.periods) * (self.mean - risk_free_rate / self.periods) / downside_std
+
+    def drawdown(self) -> float:
+        """
+        Current drawdown from the high watermark
+        """
+        return self.wealth / self.peak - 1 if self.peak is not None else np.nan
+
+    def cvar(self) -> float:
+        """
+        Historical CVaR from the histogram: whole bins below the VaR bin plus a pro-rata share of it
+        """
+        if self.n == 0:
+            return np.nan
+        cumulative = np.cumsum(self.counts)
+        target = max(self.alpha * self.n, 1.0)  # Observations in the tail
+        i = int(np.searchsorted(cumulative, target))
+        share = (target - (cumulative[i] - self.counts[i])) / self.counts[i]
+        return (self.sums[:i].sum() + self.sums[i] * share) / target
+
+    def summary(self, risk_free_rate: float = 0.0) -> pd.Series:
+        """
+        Summary of key metrics (same keys as PriceAnalytics.summary)
+        """
+        return pd.Series({
+            "Annualized Return": self.annualized_return(),
+            "Sharpe Ratio": self.sharpe_ratio(risk_free_rate),
+            "Sortino Ratio": self.sortino_ratio(risk_free_rate),
+            "Volatility": self.volatility(),
+            "Max Drawdown": self.max_drawdown,
+            f"CVaR ({self.alpha:.0%})": self.cvar()
+        })
+
+
+class PanelPriceAnalytics:
+    """
+        PriceAnalytics for a whole universe at once: the same metrics, computed for every column of an aligned
+        dates x tickers close-price matrix in vectorized passes.
+    """
+
+    def __init__(self, close: pd.DataFrame, periods: int = 252, chunk_size: int = 2_000):
+        """
+        Parameters
+        ----------
+        close : pd.DataFrame
+            Close prices, dates as index and tickers as columns. NaN marks dates without a price
+            (before listing, after delisting or trading halts); such rows are skipped, so the return
+            after a gap spans it, as if the rows were absent from a single-ticker frame.
+        periods : int
+            Number of trading days in the year
+        chunk_size : int
+            Tickers processed per pass, bounding the size of the temporary arrays.
+        """
+        self.close = close.sort_index()
+        self.periods = periods
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def from_prices(cls, prices: dict[str, pd.DataFrame], **kwargs) -> "PanelPriceAnalytics":
+        """
+        Builds the close matrix from per-ticker frames as returned by YahooPriceConnector.fetch_many.
+        """
+        dates = {ticker: np.asarray(data["Date"], dtype="datetime64[ns]") for ticker, data in prices.items()}
+        calendar = np.unique(np.concatenate(list(dates.values()))) if dates else np.array([], "datetime64[ns]")
+
+        close = np.full((len(calendar), len(prices)), np.nan)
+        for j, (ticker, data) in enumerate(prices.items()):
+            close[np.searchsorted(calendar, dates[ticker]), j] = data["Close"].to_numpy(dtype=float)
+        return cls(pd.DataFrame(close, index=pd.DatetimeIndex(calendar, name="Date"), columns=list(prices)), **kwargs)
+
+    # -------------------------
+    # Internal helpers
+    # -------------------------
+    def _returns(self, close: np.ndarray) -> np.ndarray:
+        # Simple returns against the last available close; NaN wherever there is no price
+        filled = pd.DataFrame(close).ffill().to_numpy()
+        returns = np.full_like(close, np.nan)
+        returns[1:] = filled[1:] / filled[:-1] - 1
+        returns[np.isnan(close)] = np.nan
+        return returns
+
+    def _metrics(self, returns: np.ndarray, risk_free_rate: float, alpha: float) -> dict[str, np.ndarray]:
+        valid = ~np.isnan(returns)
+        count = valid.sum(axis=0)
+        r = np.where(valid, returns, 0.0)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = r.sum(axis=0) / count
+            std = np.sqrt(np.where(valid, (returns - mean) ** 2, 0.0).sum(axis=0) / (count - 1))
+            std[count < 2] = np.nan
+
+            # Sortino: sample std of the negative returns only
+            down = valid & (returns < 0)
+            down_count = down.sum(axis=0)
+            down_mean = np.where(down, returns, 0.0).sum(axis=0) / down_count
+            down_std = np.sqrt(np.where(down, (returns - down_mean) ** 2, 0.0).sum(axis=0) / (down_count - 1))
+            down_std[down_std == 0] = np.nan
+
+            excess = mean - risk_free_rate / self.periods
+            sharpe = np.sqrt(self.periods) * excess / std
+            sortino = np.sqrt(self.periods) * excess / down_std
+
+            # Drawdown from the high watermark; skipped rows leave the wealth path unchanged and
+            # the watermark starts at the first return, as in PriceAnalytics.max_drawdown
+            wealth = np.cumprod(1 + r, axis=0)
+            leading = np.cumsum(valid, axis=0) == 0
+            peak = np.maximum.accumulate(np.where(leading, -np.inf, wealth), axis=0)
+            drawdown = np.where(leading, 0.0, wealth / peak - 1).min(axis=0)
+            drawdown[count == 0] = np.nan
+
+            # CVaR: linear-interpolated quantile per column, NaNs sort to the end
+            ordered = np.sort(returns, axis=0)
+            pos = alpha * (count - 1)
+            lo = np.clip(np.floor(pos).astype(int), 0, None)
+            hi = np.clip(np.ceil(pos).astype(int), 0, None)
+            lo_val = np.take_along_axis(ordered, lo[None, :], axis=0)[0]
+            hi_val = np.take_along_axis(ordered, hi[None, :], axis=0)[0]
+            var = lo_val + (hi_val - lo_val) * (pos - lo)
+            tail = ordered <= var
+            cvar = np.where(tail, ordered, 0.0).sum(axis=0) / tail.sum(axis=0)
+
+        return {
+            "Annualized Return": mean * self.periods,
+            "Sharpe Ratio": sharpe,
+            "Sortino Ratio": sortino,
+            "Volatility": std * np.sqrt(self.periods),
+            "Max Drawdown": drawdown,
+            f"CVaR ({alpha:.0%})": cvar,
+        }
+
+    # -------------------------
+    # Summary
+    # -------------------------
+    def summary(self, risk_free_rate: float = 0.0, alpha: float = 0.05) -> pd.DataFrame:
+        """
+        Summary of key metrics, one row per ticker (same columns as PriceAnalytics.summary)
+        """
+        close = self.close.to_numpy(dtype=float)
+        chunks = []
+        for start in range(0, close.shape[1], self.chunk_size):
+            returns = self._returns(close[:, start:start + self.chunk_size])
+            chunks.append(pd.DataFrame(self._metrics(returns, risk_free_rate, alpha)))
+
+        summary = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(
+            self._metrics(np.empty((0, 0)), risk_free_rate, alpha))
+        summary.index = pd.Index(self.close.columns, name="Ticker")
+        return summary
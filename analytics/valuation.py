@@ -1,7 +1,11 @@
-ingimport pandas as pd
+import pandas as pd
 import numpy as np
 from dataclasses import dataclass
 
+# Explicit forecast horizon and per-year projection table layout
+FORECAST_YEARS = 5
+PROJECTION_COLUMNS = ["Revenue", "EBIT", "NOPAT", "Reinvestment", "FCF", "PV_FCF"]
+
 @dataclass
 
 # Holds key inputs
@@ -16,95 +20,269 @@ class DCFAssumptions:
     shares_outst: float
     net_debt: float
 
+# Numeric DCFAssumptions fields, in the order accepted by DCFModel.run_dcf_batch
+DCF_INPUT_FIELDS = ("gr_next5y", "operating_margin_target", "tax_rate", "roic_target",
+                    "wacc", "terminal_gr", "shares_outst", "net_debt")
+
 class DCFModel:
 
     # Projects FCF for upcoming 5y - calculates terminal value, returns share price and detailed projections
     @staticmethod
     def run_dcf(current_rev: float, assumptions: DCFAssumptions) -> dict:
-        years = range(1, 6)  # forcast dataframe setup
-        projections = pd.DataFrame(index=years, columns=["Revenue","EBIT","NOPAT","Reinvestment","FCF","PV_FCF"])
-        prev_rev = current_rev
+        inputs = {field: getattr(assumptions, field) for field in DCF_INPUT_FIELDS}
+        result = DCFModel.run_dcf_batch(current_rev, **inputs, projections=True)
 
-        for year in years:
-            # Operating performance
-            rev = prev_rev*(1 + assumptions.gr_next5y)
-            ebit = rev * assumptions.operating_margin_target
-            nopat = ebit * (1 - assumptions.tax_rate)
+        # forcast dataframe setup (only built for the single scenario path)
+        projections = pd.DataFrame(result["projections"], index=range(1, FORECAST_YEARS + 1),
+                                   columns=PROJECTION_COLUMNS)
+
+        return {
+            "scenario": assumptions.name,
+            "share_price": float(result["share_price"]),
+            "enterprise_value": float(result["enterprise_value"]),
+            "equity_value": float(result["equity_value"]),
+            "projections": projections,
+            "terminal_value": float(result["terminal_value"])
+        }
+
+    # Array-backed DCF for many assumption sets at once. Every input is a scalar or an array, all inputs are
+    # broadcast against each other and results come back as NumPy arrays of the broadcast shape.
+    # Same formulas as run_dcf; the per-year table (shape [..., 5, 6]) is only built if projections=True.
+    @staticmethod
+    def run_dcf_batch(
+        current_rev,
+        gr_next5y,
+        operating_margin_target,
+        tax_rate,
+        roic_target,
+        wacc,
+        terminal_gr,
+        shares_outst,
+        net_debt,
+        projections: bool = False
+    ) -> dict:
+        rev0, growth, margin, tax, roic, wacc, terminal_gr, shares, net_debt = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (current_rev, gr_next5y, operating_margin_target, tax_rate,
+                                                   roic_target, wacc, terminal_gr, shares_outst, net_debt))
+        )
+
+        # Value driver: Reinvestment rate = g / ROIC (0 if ROIC is not positive)
+        roic_pos = roic > 0
+        safe_roic = np.where(roic_pos, roic, 1.0)
+        reinvest_rate = np.where(roic_pos, growth / safe_roic, 0.0)
 
-            # Value driver: Reinvestment rate = g / ROIC
-            if assumptions.roic_target > 0: 
-                reinvest_rate = assumptions.gr_next5y/assumptions.roic_target
-            else:
-                reinvest_rate = 0
+        table = np.empty(rev0.shape + (FORECAST_YEARS, len(PROJECTION_COLUMNS))) if projections else None
+        rev = rev0
+        nopat = np.zeros_like(rev0)
+        sum_pv_fcf = np.zeros_like(rev0)
+
+        for i, year in enumerate(range(1, FORECAST_YEARS + 1)):
+            # Operating performance
+            rev = rev*(1 + growth)
+            ebit = rev * margin
+            nopat = ebit * (1 - tax)
 
             investment = nopat*reinvest_rate
-            
             fcf = nopat - investment
 
             # Discount to present value
-            discount_factor = (1 + assumptions.wacc) ** year
+            discount_factor = (1 + wacc) ** year
             pv_fcf = fcf/discount_factor
+            sum_pv_fcf = sum_pv_fcf + pv_fcf
 
-            projections.loc[year] = [rev, ebit, nopat, investment, fcf, pv_fcf]
-            prev_rev = rev
+            if table is not None:
+                for j, column in enumerate((rev, ebit, nopat, investment, fcf, pv_fcf)):
+                    table[..., i, j] = column
 
         # Terminal Value formula
-        last_nopat = projections.loc[5, "NOPAT"]
-        terminal_nopat = last_nopat*(1 + assumptions.terminal_gr)
-        if assumptions.roic_target > 0:
-            tv_reinvest_rate = assumptions.terminal_gr/assumptions.roic_target
-        else:
-            tv_reinvest_rate = 0
+        terminal_nopat = nopat*(1 + terminal_gr)
+        tv_reinvest_rate = np.where(roic_pos, terminal_gr/safe_roic, 0.0)
         terminal_fcf = terminal_nopat*(1 - tv_reinvest_rate)
-        terminal_val = terminal_fcf / max(assumptions.wacc - assumptions.terminal_gr, 0.001)
-        pv_terminal_val = terminal_val/ ((1 + assumptions.wacc)**5)
+        terminal_val = terminal_fcf / np.maximum(wacc - terminal_gr, 0.001)
+        pv_terminal_val = terminal_val/ ((1 + wacc)**FORECAST_YEARS)
 
         # Equity value per share
-        sum_pv_fcf = projections["PV_FCF"].sum()
         enterprise_val = sum_pv_fcf + pv_terminal_val
-        equity_val = enterprise_val - assumptions.net_debt
-        share_price = equity_val/ (assumptions.shares_outst if assumptions.shares_outst > 0 else 1)
+        equity_val = enterprise_val - net_debt
+        share_price = equity_val/ np.where(shares > 0, shares, 1.0)
 
-        return {
-            "scenario": assumptions.name,
+        result = {
             "share_price": share_price,
             "enterprise_value": enterprise_val,
             "equity_value": equity_val,
-            "projections": projections,
             "terminal_value": terminal_val
         }
+        if table is not None:
+            result["projections"] = table
+        return result
 
-    # Calculates share price for a matrix of WACC x terminal growth rates (9 total), and returns a dataframe for pricing.
+    # Evaluates an N-dimensional grid over any subset of DCFAssumptions fields in one broadcast run_dcf_batch call.
+    # grid maps field name -> values (e.g. {"wacc": 50 values, "terminal_gr": 50 values, ...}), fields not in the grid
+    # stay at their base value. Returns the chosen output ("share_price", "enterprise_value", ...) as a SensitivityGrid.
     @staticmethod
-    def run_sensitivity_analysis(current_rev: float, base_assumptions: DCFAssumptions) -> pd.DataFrame:
-        wacc_range = [base_assumptions.wacc - 0.01, base_assumptions.wacc, base_assumptions.wacc + 0.01]
-        growth_range= [base_assumptions.terminal_gr - 0.01, base_assumptions.terminal_gr, base_assumptions.terminal_gr + 0.01]
-        results = {}
-
-        # Clones assumptions to avoid changing the original
-        temp_assumptions = DCFAssumptions(
-            name = base_assumptions.name,
-            gr_next5y = base_assumptions.gr_next5y,
-            operating_margin_target=base_assumptions.operating_margin_target,
-            tax_rate = base_assumptions.tax_rate,
-            roic_target= base_assumptions.roic_target,
-            wacc= base_assumptions.wacc,
-            terminal_gr = base_assumptions.terminal_gr,
-            shares_outst = base_assumptions.shares_outst,
-            net_debt = base_assumptions.net_debt
-        )
+    def run_sensitivity_grid(current_rev: float, base_assumptions: DCFAssumptions, grid: dict,
+                             output: str = "share_price") -> "SensitivityGrid":
+        unknown = set(grid) - set(DCF_INPUT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown DCFAssumptions fields in sensitivity grid: {unknown}")
+
+        inputs = {field: getattr(base_assumptions, field) for field in DCF_INPUT_FIELDS}
+        axes = {}
+        for dim, (field, values) in enumerate(grid.items()):
+            values = np.asarray(values, dtype=float).ravel()
+            shape = [1] * len(grid)
+            shape[dim] = values.size
+            inputs[field] = values.reshape(shape)  # each field varies along its own axis only
+            axes[field] = values
 
-        for g in growth_range:
-            row_results = []
-            for w in wacc_range:
-                temp_assumptions.wacc = w
-                temp_assumptions.terminal_gr = g
-                res = DCFModel.run_dcf(current_rev,temp_assumptions)
-                row_results.append(round(res["share_price"], 2))
-            results[f"Terminal Growth {g:.1%}"] = row_results
+        result = DCFModel.run_dcf_batch(current_rev, **inputs)
+        values = np.broadcast_to(result[output], tuple(v.size for v in axes.values()))
+        return SensitivityGrid(values, axes, output, base={field: getattr(base_assumptions, field) for field in grid})
 
-        df= pd.DataFrame(results, index=[f"WACC {w:.1%}" for w in wacc_range])
+    # Evenly spaced sensitivity axis of 'points' values centered on 'center' (e.g. center=8%, step=1%, points=3 -> 7/8/9%)
+    @staticmethod
+    def sensitivity_range(center: float, step: float, points: int = 3) -> np.ndarray:
+        return center + step * (np.arange(points) - (points - 1) / 2)
+
+    # Calculates share price for a matrix of WACC x terminal growth rates (3x3 by default), and returns a dataframe for pricing.
+    @staticmethod
+    def run_sensitivity_analysis(current_rev: float, base_assumptions: DCFAssumptions, wacc_step: float = 0.01,
+                                 growth_step: float = 0.01, points: int = 3) -> pd.DataFrame:
+        grid = DCFModel.run_sensitivity_grid(current_rev, base_assumptions, {
+            "wacc": DCFModel.sensitivity_range(base_assumptions.wacc, wacc_step, points),
+            "terminal_gr": DCFModel.sensitivity_range(base_assumptions.terminal_gr, growth_step, points),
+        })
+        df = grid.table("wacc", "terminal_gr").round(2)
+        df.index = [f"WACC {w:.1%}" for w in df.index]
+        df.columns = [f"Terminal Growth {g:.1%}" for g in df.columns]
         return df
+
+    # Default search interval of run_reverse_dcf per field. None bounds follow the other inputs: WACC is kept above
+    # terminal growth + 0.1% (below that the terminal value denominator is floored) and terminal growth below WACC - 0.1%.
+    REVERSE_DCF_BRACKETS = {
+        "gr_next5y": (-0.5, 1.0),
+        "operating_margin_target": (-1.0, 1.0),
+        "tax_rate": (-1.0, 1.0),
+        "roic_target": (0.001, 10.0),
+        "wacc": (None, 1.0),
+        "terminal_gr": (-0.5, None),
+        "shares_outst": (0.0, np.inf),
+        "net_debt": (-np.inf, np.inf),
+    }
+
+    # Reverse DCF: the value of one DCFAssumptions field that makes run_dcf return 'share_price', the other inputs held
+    # fixed. Inputs broadcast like run_dcf_batch (e.g. one entry per ticker), so a whole universe is solved at once.
+    # The share price is linear in margin, (1 - tax) and net debt and proportional to 1 / shares, so those fields have a
+    # closed form; growth, ROIC, WACC and terminal growth are found by vectorized bisection inside the bracket (the lowest
+    # root if there are several). Returns {"value": implied values (NaN where unsolved), "solved": bool mask}. A name is
+    # unsolved when the price is not reached anywhere in its bracket, or its inputs give no finite valuation.
+    @staticmethod
+    def run_reverse_dcf(field: str, share_price, current_rev, inputs: dict, bracket: tuple | None = None,
+                        tol: float = 1e-8, max_iter: int = 100, scan: int = 16) -> dict:
+        if field not in DCF_INPUT_FIELDS:
+            raise ValueError(f"Unknown DCFAssumptions field for reverse DCF: {field}")
+        missing = set(DCF_INPUT_FIELDS) - set(inputs) - {field}
+        if missing:
+            raise ValueError(f"Missing DCF inputs for reverse DCF: {sorted(missing)}")
+
+        fixed = {name: inputs[name] for name in DCF_INPUT_FIELDS if name != field}
+        price, rev0, *values = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (share_price, current_rev, *fixed.values()))
+        )
+        fixed = dict(zip(fixed, values))
+        lo, hi = bracket or DCFModel.REVERSE_DCF_BRACKETS[field]
+        if lo is None:
+            lo = fixed["terminal_gr"] + 0.001
+        if hi is None:
+            hi = fixed["wacc"] - 0.001
+        lo, hi = np.broadcast_to(lo, price.shape).astype(float), np.broadcast_to(hi, price.shape).astype(float)
+
+        def run(value) -> dict:
+            return DCFModel.run_dcf_batch(rev0, **fixed, **{field: value})
+
+        if field in ("operating_margin_target", "tax_rate", "net_debt", "shares_outst"):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                if field == "net_debt":
+                    shares = np.where(fixed["shares_outst"] > 0, fixed["shares_outst"], 1.0)
+                    value = run(0.0)["enterprise_value"] - price * shares
+                elif field == "shares_outst":
+                    value = run(1.0)["equity_value"] / price
+                else:
+                    shares = np.where(fixed["shares_outst"] > 0, fixed["shares_outst"], 1.0)
+                    target_ev = price * shares + fixed["net_debt"]
+                    if field == "operating_margin_target":
+                        value = target_ev / run(1.0)["enterprise_value"]  # EV at a 100% margin
+                    else:
+                        value = 1 - target_ev / run(0.0)["enterprise_value"]  # EV untaxed
+            solved = np.isfinite(value) & (value >= lo) & (value <= hi)
+            return {"value": np.where(solved, value, np.nan), "solved": solved}
+
+        # The price need not be monotone in the field (e.g. growth below the ROIC hurdle destroys value), so the bracket
+        # is first scanned on 'scan' sub-intervals and bisection runs in the lowest one that contains a sign change
+        steps = np.linspace(0.0, 1.0, scan + 1).reshape((-1,) + (1,) * price.ndim)
+        grid = lo + (hi - lo) * steps
+        f_grid = run(grid)["share_price"] - price
+        crossing = np.isfinite(f_grid[:-1]) & np.isfinite(f_grid[1:]) & (np.sign(f_grid[:-1]) * np.sign(f_grid[1:]) <= 0)
+        solved = crossing.any(axis=0) & (lo <= hi)
+        first = crossing.argmax(axis=0)[np.newaxis]
+        lo = np.take_along_axis(grid, first, axis=0)[0]
+        hi = np.take_along_axis(grid, first + 1, axis=0)[0]
+        f_lo = np.take_along_axis(f_grid, first, axis=0)[0]
+        for _ in range(max_iter):
+            if not np.any(solved & (hi - lo > tol)):
+                break
+            mid = (lo + hi) / 2
+            f_mid = run(mid)["share_price"] - price
+            root_above = np.sign(f_mid) == np.sign(f_lo)
+            lo = np.where(root_above, mid, lo)
+            f_lo = np.where(root_above, f_mid, f_lo)
+            hi = np.where(root_above, hi, mid)
+        return {"value": np.where(solved, (lo + hi) / 2, np.nan), "solved": solved}
+
+
+class SensitivityGrid:
+    # Labelled N-D array of one DCF output: values[i, j, ...] belongs to axes[field_0][i], axes[field_1][j], ...
+    def __init__(self, values: np.ndarray, axes: dict, output: str, base: dict | None = None):
+        self.values = values
+        self.axes = axes
+        self.output = output
+        self.base = base or {}
+
+    @property
+    def dims(self) -> list[str]:
+        return list(self.axes)
+
+    @property
+    def shape(self) -> tuple:
+        return self.values.shape
+
+    # Position of the grid point closest to 'value' along 'field'
+    def _index(self, field: str, value: float) -> int:
+        return int(np.abs(self.axes[field] - value).argmin())
+
+    # Fixes some fields at (the grid point nearest to) a value and returns the lower-dimensional grid
+    def sel(self, **fixed) -> "SensitivityGrid":
+        indexer = tuple(self._index(field, fixed[field]) if field in fixed else slice(None) for field in self.dims)
+        axes = {field: values for field, values in self.axes.items() if field not in fixed}
+        return SensitivityGrid(self.values[indexer], axes, self.output, self.base)
+
+    # 2-D slice as a DataFrame (rows x columns). Remaining fields are taken from 'fixed', otherwise from the base
+    # assumptions (nearest grid point), otherwise the middle of their axis.
+    def table(self, rows: str, columns: str, **fixed) -> pd.DataFrame:
+        for field in self.dims:
+            if field in (rows, columns) or field in fixed:
+                continue
+            axis = self.axes[field]
+            fixed[field] = self.base.get(field, axis[len(axis) // 2])
+        sliced = self.sel(**fixed)
+        values = sliced.values if sliced.dims == [rows, columns] else sliced.values.T
+        return pd.DataFrame(values, index=pd.Index(self.axes[rows], name=rows),
+                            columns=pd.Index(self.axes[columns], name=columns))
+
+    # Long format: one row per grid point, fields as MultiIndex levels
+    def to_frame(self) -> pd.DataFrame:
+        index = pd.MultiIndex.from_product(list(self.axes.values()), names=self.dims)
+        return pd.DataFrame({self.output: self.values.ravel()}, index=index)
             
         
 
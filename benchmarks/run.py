@@ -0,0 +1,235 @@
+"""
+Benchmark harness: runs each stage of the toolkit in isolation (and the full pipeline end-to-end) over a
+synthetic universe and reports throughput, p50/p99 latency and peak RSS as JSON.
+
+    python -m benchmarks.run --tickers 10 1000 --output bench.json
+    python -m benchmarks.run --tickers 1000 --stages run_dcf sensitivity --compare bench.json
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+import matplotlib
+matplotlib.use("Agg")  # Never open windows while benchmarking
+
+import numpy as np
+
+from analytics.ec_metric_processor import FundamentalProcessor
+from analytics.price_analytics import PriceAnalytics
+from analytics.valuation import DCFAssumptions, DCFModel
+from benchmarks.synthetic import SyntheticFundamentalsConnector, SyntheticPriceConnector, SyntheticUniverse
+from data.pipeline import AnalysisPipeline
+from data.plotter import Plotter
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+# =====================================================
+# Stage definitions: prepare(ctx, ticker) builds the inputs (not timed), run(*inputs) is timed
+# =====================================================
+def _dcf_inputs(ctx: dict, ticker: str) -> tuple:
+    fundamentals = ctx["universe"].fundamentals(ticker)
+    processor = FundamentalProcessor(fundamentals)
+    latest = processor.get_latest_data()
+    if not latest:
+        raise ValueError(f"No metrics for {ticker}")
+    cfg = ctx["pipeline"]._resolve_dcf_config(fundamentals.info.get("sector", "Unknown"))
+    assumptions = DCFAssumptions(
+        name=ticker,
+        gr_next5y=cfg["revenue_growth_5y"],
+        operating_margin_target=cfg["operating_margin_target"],
+        tax_rate=cfg["tax_rate"],
+        wacc=cfg["wacc"],
+        terminal_gr=cfg["terminal_growth"],
+        roic_target=latest["roic"],
+        shares_outst=latest["shares"],
+        net_debt=latest["net_debt"],
+    )
+    return latest["rev"], assumptions
+
+
+def _metrics(ctx: dict, ticker: str):
+    metrics = FundamentalProcessor(ctx["universe"].fundamentals(ticker)).get_metrics()
+    if metrics is None:
+        raise ValueError(f"No metrics for {ticker}")
+    return metrics
+
+
+def _run_pipeline(ctx: dict, ticker: str):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        ctx["pipeline"].run([ticker])
+
+
+STAGES = {
+    "fundamental_metrics": (
+        lambda ctx, t: (FundamentalProcessor(ctx["universe"].fundamentals(t)),),
+        lambda processor: processor._process_metrics(),
+    ),
+    "price_summary": (
+        lambda ctx, t: (ctx["universe"].prices(t),),
+        lambda prices: PriceAnalytics(prices, lean=True).summary(),
+    ),
+    "run_dcf": (_dcf_inputs, DCFModel.run_dcf),
+    "sensitivity": (_dcf_inputs, DCFModel.run_sensitivity_analysis),
+    "plot_price_ma": (
+        lambda ctx, t: (ctx["universe"].prices(t), ctx["out"], t),
+        Plotter.plot_price_ma,
+    ),
+    "plot_price_vs_dcf": (
+        lambda ctx, t: (ctx["universe"].prices(t), 100.0, ctx["out"], t),
+        Plotter.plot_price_vs_dcf,
+    ),
+    "plot_revenue_fcf": (
+        lambda ctx, t: (_metrics(ctx, t), ctx["out"], t),
+        Plotter.plot_revenue_fcf,
+    ),
+    "plot_roic_vs_wacc": (
+        lambda ctx, t: (_metrics(ctx, t), 0.08, ctx["out"], t),
+        Plotter.plot_roic_vs_wacc,
+    ),
+    "pipeline": (lambda ctx, t: (ctx, t), _run_pipeline),
+}
+# Stages rendering charts are capped at --slow_limit tickers
+SLOW_STAGES = {"plot_price_ma", "plot_price_vs_dcf", "plot_revenue_fcf", "plot_roic_vs_wacc", "pipeline"}
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB on Linux
+
+
+def run_stage(stage: str, n: int, seed: int, limit: int | None) -> dict:
+    universe = SyntheticUniverse(n, seed=seed)
+    tickers = universe.tickers[:limit] if limit else universe.tickers
+    prepare, run = STAGES[stage]
+    warnings.simplefilter("ignore", FutureWarning)  # pandas deprecation noise would swamp the report
+
+    with tempfile.TemporaryDirectory() as out:
+        pipeline = AnalysisPipeline(out)
+        pipeline.price_connector = SyntheticPriceConnector(universe)
+        pipeline.fundamental_connector = SyntheticFundamentalsConnector(universe)
+        ctx = {"universe": universe, "out": out, "pipeline": pipeline}
+
+        baseline_rss = peak_rss_mb()
+        latencies = []
+        errors = 0
+        for ticker in tickers:
+            try:
+                inputs = prepare(ctx, ticker)
+                started = time.perf_counter()
+                run(*inputs)
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                errors += 1  # e.g. non-equity names or statements too sparse to value
+
+    lat_ms = np.asarray(latencies) * 1000
+    total = lat_ms.sum() / 1000
+    return {
+        "stage": stage,
+        "universe": n,
+        "items": len(latencies),
+        "errors": errors,
+        "seconds": round(float(total), 4),
+        "throughput_per_s": round(len(latencies) / total, 2) if total > 0 else None,
+        "p50_ms": round(float(np.percentile(lat_ms, 50)), 4) if lat_ms.size else None,
+        "p99_ms": round(float(np.percentile(lat_ms, 99)), 4) if lat_ms.size else None,
+        "baseline_rss_mb": round(baseline_rss, 1) if baseline_rss is not None else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1) if resource is not None else None,
+    }
+
+
+def _run_stage_in_child(args: tuple, results: multiprocessing.Queue):
+    results.put(run_stage(*args))
+
+
+def run_isolated(stage: str, n: int, seed: int, limit: int | None) -> dict:
+    # Fresh interpreter per stage, so peak RSS belongs to that stage only
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    process = ctx.Process(target=_run_stage_in_child, args=((stage, n, seed, limit), results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+                                       text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, previous: dict):
+    """
+    Prints throughput of the current run relative to a previous result file.
+    """
+    old = {(r["stage"], r["universe"]): r for r in previous["results"]}
+    print(f"\nComparison with {previous.get('commit')} (throughput, items/s):")
+    print(f"{'stage':<22}{'universe':>10}{'before':>14}{'after':>14}{'ratio':>9}")
+    for r in current["results"]:
+        before = old.get((r["stage"], r["universe"]), {}).get("throughput_per_s")
+        after = r["throughput_per_s"]
+        ratio = f"{after / before:.2f}x" if before and after else "-"
+        print(f"{r['stage']:<22}{r['universe']:>10}{before or '-':>14}{after or '-':>14}{ratio:>9}")
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Benchmark the valuation toolkit on a synthetic universe")
+    parser.add_argument("--tickers", type=int, nargs="+", default=[10, 100], help="Universe sizes (10 - 50,000)")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--slow_limit", type=int, default=200,
+                        help="Max tickers for plotting and end-to-end pipeline stages")
+    parser.add_argument("--no_isolate", action="store_true",
+                        help="Run stages in this process (faster, but peak RSS is cumulative)")
+    parser.add_argument("--output", type=str, help="Write JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", type=str, help="Previous JSON results to compare throughput against")
+    args = parser.parse_args(argv)
+
+    results = []
+    for n in args.tickers:
+        for stage in args.stages:
+            limit = args.slow_limit if stage in SLOW_STAGES else None
+            runner = run_stage if args.no_isolate else run_isolated
+            result = runner(stage, n, args.seed, limit)
+            results.append(result)
+            print(f"{stage:<22} n={n:<7} {result['throughput_per_s']} items/s, p99 {result['p99_ms']} ms",
+                  file=sys.stderr)
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
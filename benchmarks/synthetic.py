@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+
+from data.connector.base import BaseConnector
+from data.models.fundamental_data import FundamentalData
+
+
+SECTORS = {
+    "Technology": ("Software - Infrastructure", "Semiconductors"),
+    "Consumer Defensive": ("Beverages - Non-Alcoholic", "Household & Personal Products"),
+    "Healthcare": ("Drug Manufacturers - General", "Medical Devices"),
+    "Energy": ("Oil & Gas Integrated", "Oil & Gas E&P"),
+    "Industrials": ("Aerospace & Defense", "Railroads"),
+    "Financial Services": ("Banks - Diversified", "Insurance - Diversified"),
+}
+
+
+class SyntheticUniverse:
+    """
+    Deterministic synthetic universe of N tickers for benchmarks.
+
+    Each ticker gets yfinance-shaped statements (line items as rows, fiscal year ends as columns, newest first)
+    and a daily OHLC frame shaped like YahooPriceConnector.fetch output. Data is generated on demand from a
+    per-ticker seed, so universes of 50,000 names do not have to be held in memory at once.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        seed: int = 0,
+        years: int = 4,
+        start: str = "2015-01-02",
+        end: str = "2025-12-31",
+        missing_rate: float = 0.03
+    ):
+        """
+        Parameters
+        ----------
+        n : int
+            Number of tickers.
+        seed : int
+            Universe seed; the same (n, seed) always produces the same data.
+        years : int
+            Fiscal years per statement.
+        start, end : str
+            Price history range (later listings start part-way through).
+        missing_rate : float
+            Share of statement values set to NaN; some line items are also dropped entirely,
+            to exercise the fallback rules of FundamentalProcessor.
+        """
+        self.n = n
+        self.seed = seed
+        self.years = years
+        self.calendar = pd.bdate_range(start, end)
+        self.missing_rate = missing_rate
+        self.tickers = [f"S{i:05d}" for i in range(n)]
+        self._index = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+    def __iter__(self):
+        return iter(self.tickers)
+
+    def _rng(self, ticker: str, stream: int) -> np.random.Generator:
+        return np.random.default_rng([self.seed, self._index[ticker], stream])
+
+    # -------------------------
+    # Prices
+    # -------------------------
+    def prices(self, ticker: str) -> pd.DataFrame:
+        rng = self._rng(ticker, 0)
+        # About one in five names lists after the start of the calendar
+        first = int(rng.integers(0, len(self.calendar) // 2)) if rng.random() < 0.2 else 0
+        dates = self.calendar[first:]
+        n = len(dates)
+        vol = rng.uniform(0.01, 0.035)
+        close = rng.uniform(5, 500) * np.exp(np.cumsum(rng.normal(0.0003, vol, n)))
+        spread = np.abs(rng.normal(0, vol / 2, n))
+        open_ = close * (1 + rng.normal(0, vol / 3, n))
+        return pd.DataFrame({
+            "Date": dates,
+            "Close": close,
+            "High": np.maximum(close, open_) * (1 + spread),
+            "Low": np.minimum(close, open_) * (1 - spread),
+            "Open": open_,
+            "Volume": rng.integers(10_000, 20_000_000, n).astype(float),
+            "Ticker": ticker,
+        })
+
+    # -------------------------
+    # Fundamentals
+    # -------------------------
+    def fundamentals(self, ticker: str) -> FundamentalData:
+        rng = self._rng(ticker, 1)
+        dates = pd.to_datetime([f"{2024 - i}-12-31" for i in range(self.years)])  # Newest first, like yfinance
+        growth = rng.normal(0.07, 0.08, self.years)
+        revenue = rng.uniform(5e7, 2e11) / np.cumprod(1 + growth)
+        margin = np.clip(rng.normal(0.15, 0.10), -0.2, 0.5) + rng.normal(0, 0.02, self.years)
+        operating_income = revenue * margin
+        interest = revenue * rng.uniform(0, 0.03)
+        pretax = operating_income - interest
+        tax = np.maximum(pretax, 0) * rng.uniform(0.12, 0.27)
+        gross_ppe = revenue * rng.uniform(0.2, 1.5)
+        depreciation = gross_ppe * rng.uniform(0.2, 0.6)
+        cur_assets = revenue * rng.uniform(0.2, 0.8)
+        cash = cur_assets * rng.uniform(0.1, 0.5)
+        non_current = (gross_ppe - depreciation) * rng.uniform(1.1, 2.5)
+
+        income = {
+            "Total Revenue": revenue,
+            "Operating Income": operating_income,
+            "EBIT": operating_income + rng.normal(0, 0.01, self.years) * revenue,
+            "Pretax Income": pretax,
+            "Interest Expense": interest,
+            "Tax Provision": tax,
+            "Net Income": pretax - tax,
+        }
+        balance = {
+            "Current Assets": cur_assets,
+            "Cash And Cash Equivalents": cash,
+            "Current Liabilities": revenue * rng.uniform(0.1, 0.6),
+            "Net PPE": gross_ppe - depreciation,
+            "Gross PPE": gross_ppe,
+            "Accumulated Depreciation": depreciation,
+            "Total Non Current Assets": non_current,
+            "Total Debt": revenue * rng.uniform(0, 1.2),
+        }
+        capex = -gross_ppe * rng.uniform(0.05, 0.15)
+        cash_flow = {
+            "Operating Cash Flow": (pretax - tax) * rng.uniform(1.0, 1.4),
+            "Capital Expenditure": capex,
+        }
+        cash_flow["Free Cash Flow"] = cash_flow["Operating Cash Flow"] + capex
+
+        # Exercise the fallback paths: some companies do not report EBIT or Net PPE at all
+        if rng.random() < 0.3:
+            del income["EBIT"]
+        if rng.random() < 0.2:
+            del balance["Net PPE"]
+
+        sector = list(SECTORS)[int(rng.integers(len(SECTORS)))]
+        info = {
+            "symbol": ticker,
+            "quoteType": "EQUITY" if rng.random() > 0.01 else "ETF",
+            "sector": sector,
+            "industry": SECTORS[sector][int(rng.integers(2))],
+            "sharesOutstanding": float(rng.uniform(1e7, 5e9)),
+        }
+        return FundamentalData(info, *(self._statement(rng, items, dates) for items in (income, balance, cash_flow)))
+
+    def _statement(self, rng: np.random.Generator, items: dict, dates: pd.DatetimeIndex) -> pd.DataFrame:
+        values = np.array(list(items.values()), dtype=float)
+        values[rng.random(values.shape) < self.missing_rate] = np.nan
+        return pd.DataFrame(values, index=list(items), columns=dates)
+
+
+# -------------------------
+# Stub connectors
+# -------------------------
+class SyntheticPriceConnector(BaseConnector):
+    """Serves SyntheticUniverse prices through the YahooPriceConnector interface."""
+
+    def __init__(self, universe: SyntheticUniverse):
+        self.universe = universe
+
+    def fetch(self, ticker: str, **kwargs) -> pd.DataFrame:
+        return self.universe.prices(ticker)
+
+    def fetch_many(self, tickers: list[str], **kwargs) -> dict[str, pd.DataFrame]:
+        return {ticker: self.universe.prices(ticker) for ticker in tickers}
+
+
+class SyntheticFundamentalsConnector(BaseConnector):
+    """Serves SyntheticUniverse statements through the YahooFundamentalsConnector interface."""
+
+    def __init__(self, universe: SyntheticUniverse):
+        self.universe = universe
+
+    def fetch(self, ticker: str, **kwargs) -> FundamentalData:
+        return self.universe.fundamentals(ticker)
@@ -0,0 +1,191 @@
+import asyncio
+import random
+import time
+
+import aiohttp
+import numpy as np
+import pandas as pd
+
+from .base import AsyncBaseConnector
+from .fundamental import YahooFundamentalsConnector
+from .rate_limit import RequestStats
+from ..models.fundamental_data import FundamentalData
+
+
+class AsyncHttpConnector(AsyncBaseConnector):
+    """
+    Shared plumbing for asyncio HTTP connectors: one pooled aiohttp session, a semaphore bounding
+    concurrent requests, per-request timeouts and retries with exponential backoff and jitter.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    HEADERS = {"User-Agent": "Mozilla/5.0 (FundamentalValuationToolkit)"}
+
+    def __init__(
+        self,
+        base_url: str,
+        max_concurrency: int = 10,
+        timeout: float = 10.0,
+        retries: int = 3,
+        backoff: float = 0.5
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.request_stats = RequestStats()
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        # Created lazily, so the session and the semaphore belong to the running event loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=self.HEADERS
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def _get_json(self, path: str, params: dict | None = None) -> dict:
+        session = self._ensure_session()
+        attempt = 0
+        while True:
+            started = None
+            try:
+                async with self._semaphore:
+                    started = time.perf_counter()  # Latency excludes the wait for a free slot
+                    async with session.get(f"{self.base_url}{path}", params=params) as response:
+                        if response.status in self.RETRY_STATUSES:
+                            raise aiohttp.ClientResponseError(
+                                response.request_info, response.history, status=response.status,
+                                message=response.reason or ""
+                            )
+                        if response.status == 404:
+                            raise LookupError(f"No data at {path}")
+                        response.raise_for_status()
+                        payload = await response.json(content_type=None)
+                self.request_stats.record(time.perf_counter() - started)
+                return payload
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Connection errors, timeouts and RETRY_STATUSES are retried; other 4xx / 5xx answers are final
+                final = attempt >= self.retries or (
+                    isinstance(e, aiohttp.ClientResponseError) and e.status not in self.RETRY_STATUSES
+                )
+                if started is not None:
+                    self.request_stats.record(time.perf_counter() - started, retried=not final, failed=final)
+                if final:
+                    raise
+                await asyncio.sleep(self.backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+                attempt += 1
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class AsyncYahooPriceConnector(AsyncHttpConnector):
+    """
+    Async counterpart of YahooPriceConnector using the Yahoo Finance chart API (v8).
+    Returns the same frame layout as YahooPriceConnector.fetch (auto-adjusted OHLC, Date and Ticker columns).
+    """
+
+    def __init__(self, base_url: str = "https://query1.finance.yahoo.com", **kwargs):
+        super().__init__(base_url, **kwargs)
+
+    async def fetch(
+        self,
+        ticker: str,
+        start: str = "2015-01-01",
+        end: str | None = None,
+        interval: str = "1d"
+    ) -> pd.DataFrame:
+        params = {
+            "period1": int(pd.Timestamp(start).timestamp()),
+            "period2": int(pd.Timestamp(end).timestamp()) if end else int(pd.Timestamp.now().timestamp()),
+            "interval": interval,
+            "events": "div,splits",
+        }
+        try:
+            payload = await self._get_json(f"/v8/finance/chart/{ticker.upper()}", params)
+        except LookupError:
+            payload = {}
+        data = self.parse_chart(payload, interval)
+        if data.empty:
+            raise ValueError(f"No price data returned for {ticker}")
+        data["Ticker"] = ticker.upper()
+        return data
+
+    @staticmethod
+    def parse_chart(payload: dict, interval: str = "1d") -> pd.DataFrame:
+        result = ((payload.get("chart") or {}).get("result") or [None])[0]
+        if not result or not result.get("timestamp"):
+            return pd.DataFrame()
+
+        quote = result["indicators"]["quote"][0]
+        dates = pd.to_datetime(np.asarray(result["timestamp"], dtype="int64"), unit="s", utc=True)
+        tz = result.get("meta", {}).get("exchangeTimezoneName")
+        if tz:
+            dates = dates.tz_convert(tz)
+        dates = dates.tz_localize(None)
+        if interval.endswith(("d", "wk", "mo")):
+            dates = dates.normalize()
+
+        # JSON nulls become NaN
+        data = pd.DataFrame({
+            col: np.asarray(quote.get(col.lower()) or [None] * len(dates), dtype=float)
+            for col in ("Close", "High", "Low", "Open", "Volume")
+        }, index=pd.Index(dates, name="Date" if interval.endswith(("d", "wk", "mo")) else "Datetime"))
+
+        # Same adjustment as yfinance auto_adjust=True: scale OHLC by AdjClose / Close
+        adjclose = (result["indicators"].get("adjclose") or [{}])[0].get("adjclose")
+        if adjclose is not None:
+            ratio = np.asarray(adjclose, dtype=float) / data["Close"].to_numpy()
+            for col in ("Open", "High", "Low"):
+                data[col] = data[col] * ratio
+            data["Close"] = np.asarray(adjclose, dtype=float)
+
+        # Events as in yfinance's actions=True columns: the dividend / split ratio on its day, else 0
+        events = result.get("events") or {}
+        for column, kind, value in (("Dividends", "dividends", lambda e: float(e["amount"])),
+                                    ("Stock Splits", "splits",
+                                     lambda e: float(e["numerator"]) / float(e["denominator"]))):
+            data[column] = 0.0
+            for event in (events.get(kind) or {}).values():
+                day = pd.Timestamp(int(event["date"]), unit="s", tz="UTC")
+                day = (day.tz_convert(tz) if tz else day).tz_localize(None)
+                if interval.endswith(("d", "wk", "mo")):
+                    day = day.normalize()
+                data.loc[data.index == day, column] = value(event)
+
+        return data.dropna(how="all", subset=["Close", "High", "Low", "Open", "Volume"]).reset_index()
+
+
+class AsyncFundamentalsConnector(AsyncHttpConnector):
+    """
+    Async fundamentals connector.
+
+    With a base_url, statements are read from '{base_url}/fundamentals/{ticker}' (FundamentalData.to_payload
+    format, as served by the local stand-in server). Without one, the yfinance-based YahooFundamentalsConnector
+    runs in worker threads, with the same concurrency bound.
+    """
+
+    def __init__(self, base_url: str | None = None, sync_connector: YahooFundamentalsConnector | None = None,
+                 **kwargs):
+        super().__init__(base_url or "", **kwargs)
+        self.use_http = base_url is not None
+        self.sync_connector = sync_connector or YahooFundamentalsConnector()
+
+    async def fetch(self, ticker: str) -> FundamentalData:
+        if not self.use_http:
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            async with self._semaphore:
+                return await asyncio.to_thread(self.sync_connector.fetch, ticker)
+
+        payload = await self._get_json(f"/fundamentals/{ticker.upper()}")
+        return FundamentalData.from_payload(payload)
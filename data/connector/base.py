@@ -8,4 +8,23 @@ class BaseConnector(ABC):
     @abstractmethod
     def fetch(self, **kwargs) -> pd.DataFrame:
         """Fetch raw data and return a DataFrame."""
-        pass
\ No newline at end of file
+        pass
+
+
+class AsyncBaseConnector(ABC):
+    """Abstract base class for asyncio data connectors."""
+
+    @abstractmethod
+    async def fetch(self, **kwargs):
+        """Fetch raw data without blocking the event loop."""
+        pass
+
+    async def close(self):
+        """Release pooled resources (HTTP sessions)."""
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
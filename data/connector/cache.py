@@ -0,0 +1,218 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .base import BaseConnector
+
+
+class CachedConnector(BaseConnector):
+    """
+    Caching wrapper around any BaseConnector.
+
+    Results are kept in an in-memory LRU and (optionally) pickled to disk, keyed by the fetch arguments.
+    Entries younger than `ttl` are served directly. Entries older than `ttl` but younger than `ttl + stale_ttl`
+    are served immediately while a background thread refreshes them (stale-while-revalidate).
+    In offline mode the wrapped connector is never called and any cached entry is served regardless of age.
+    Cache hits never reach the wrapped connector, so they also skip its rate-limit sleep.
+
+    Every lookup is counted once in `stats`: "hits" (fresh, from memory), "disk_hits" (fresh, loaded from disk),
+    "stale_hits" (served while refreshing) or "misses". close() stops the background refresh thread.
+    """
+
+    # Default freshness per data type (seconds): prices go stale within the trading day, statements change quarterly
+    DEFAULT_TTLS = {
+        "prices": 60 * 60,
+        "fundamentals": 21 * 24 * 60 * 60,
+    }
+    DEFAULT_STALE_TTLS = {
+        "prices": 24 * 60 * 60,
+        "fundamentals": 30 * 24 * 60 * 60,
+    }
+
+    def __init__(
+        self,
+        connector: BaseConnector,
+        data_type: str,
+        cache_dir: str | None = None,
+        ttl: float | None = None,
+        stale_ttl: float | None = None,
+        max_items: int = 256,
+        offline: bool = False
+    ):
+        self.connector = connector
+        self.data_type = data_type
+        self.cache_dir = os.path.join(cache_dir, data_type) if cache_dir else None
+        self.ttl = ttl if ttl is not None else self.DEFAULT_TTLS.get(data_type, 60 * 60)
+        self.stale_ttl = stale_ttl if stale_ttl is not None else self.DEFAULT_STALE_TTLS.get(data_type, 0)
+        self.max_items = max_items
+        self.offline = offline
+
+        self._memory: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._refresher: ThreadPoolExecutor | None = None
+        self.stats = {"hits": 0, "disk_hits": 0, "stale_hits": 0, "misses": 0, "refresh_errors": 0}
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def fetch(self, *args, **kwargs):
+        key = self._key(args, kwargs)
+        value = self._lookup(key, args, kwargs)
+        if value is not None:
+            return value
+
+        if self.offline:
+            raise LookupError(f"Offline mode: no cached {self.data_type} for {args or kwargs}")
+
+        self._count("misses")
+        value = self.connector.fetch(*args, **kwargs)
+        self._put(key, value)
+        return value
+
+    def fetch_many(self, tickers: list[str], **kwargs) -> dict:
+        """
+        Bulk variant for connectors with fetch_many (e.g. YahooPriceConnector): cached tickers are served from
+        the cache, the rest are fetched in one bulk call and cached under the same keys as fetch(ticker, **kwargs).
+        Tickers without data are left out of the result.
+        """
+        frames = {}
+        missing = []
+        for ticker in tickers:
+            value = self._lookup(self._key((ticker,), kwargs), (ticker,), kwargs)
+            if value is None:
+                missing.append(ticker)
+            else:
+                frames[ticker] = value
+
+        if missing and not self.offline:
+            with self._lock:
+                self.stats["misses"] += len(missing)
+            fetched = self.connector.fetch_many(missing, **kwargs)
+            for ticker in missing:
+                if ticker.upper() in fetched:
+                    frames[ticker] = fetched[ticker.upper()]
+                    self._put(self._key((ticker,), kwargs), frames[ticker])
+        return frames
+
+    def peek(self, *args, **kwargs):
+        """
+        The value fetch(*args, **kwargs) would serve from the cache, or None, without calling the wrapped connector
+        (for callers fetching misses through another client, e.g. the asyncio connectors).
+        """
+        return self._lookup(self._key(args, kwargs), args, kwargs)
+
+    def put(self, value, *args, **kwargs):
+        """
+        Caches a value fetched elsewhere under the key of fetch(*args, **kwargs).
+        """
+        self._put(self._key(args, kwargs), value)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+
+    def close(self):
+        """
+        Waits for running background refreshes and stops the refresh thread (a later stale hit starts a new one).
+        """
+        with self._lock:
+            refresher, self._refresher = self._refresher, None
+        if refresher is not None:
+            refresher.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------------
+    # Internal helpers
+    # -------------------------
+    def _lookup(self, key: str, args: tuple, kwargs: dict):
+        # Cached value if it may be served (fresh, stale-while-revalidate or offline), otherwise None
+        entry, from_disk = self._get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        age = time.time() - stored_at
+        if age <= self.ttl or self.offline:
+            self._count("disk_hits" if from_disk else "hits")
+            return value
+        if age <= self.ttl + self.stale_ttl:
+            self._count("stale_hits")
+            self._schedule_refresh(key, args, kwargs)
+            return value
+        return None
+
+    def _key(self, args: tuple, kwargs: dict) -> str:
+        raw = repr((type(self.connector).__name__, args, sorted(kwargs.items())))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _path(self, key: str) -> str | None:
+        return os.path.join(self.cache_dir, f"{key}.pkl") if self.cache_dir else None
+
+    def _get(self, key: str) -> tuple[tuple[float, object] | None, bool]:
+        # (entry or None, whether it was loaded from disk)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key], False
+
+        path = self._path(key)
+        if path is None or not os.path.exists(path):
+            return None, False
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None, False  # Corrupt or half-written file is treated as a miss
+        self._remember(key, entry)
+        return entry, True
+
+    def _put(self, key: str, value):
+        entry = (time.time(), value)
+        self._remember(key, entry)
+
+        path = self._path(key)
+        if path is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)  # Atomic, readers never see a partial file
+
+    def _remember(self, key: str, entry: tuple[float, object]):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+
+    def _schedule_refresh(self, key: str, args: tuple, kwargs: dict):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.data_type}-refresh")
+            self._refresher.submit(self._refresh, key, args, kwargs)
+
+    def _refresh(self, key: str, args: tuple, kwargs: dict):
+        try:
+            self._put(key, self.connector.fetch(*args, **kwargs))
+        except Exception:
+            self._count("refresh_errors")  # Keep serving the stale entry
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
@@ -1,7 +1,5 @@
-import yfinance as yf
-import time
-
 from .base import BaseConnector
+from .rate_limit import RequestStats, TokenBucket, call_with_retry, shared_limiter
 
 from ..models.fundamental_data import FundamentalData
 
@@ -9,9 +7,17 @@ from ..models.fundamental_data import FundamentalData
 class YahooFundamentalsConnector(BaseConnector):
     """Fetch financial statements from Yahoo Finance."""
 
+    def __init__(self, limiter: TokenBucket | None = None, retries: int = 3):
+        # To prevent API rate limit, potentially due to calling fetch method in loop (shared with price connector)
+        self.limiter = limiter or shared_limiter
+        self.retries = retries
+        self.request_stats = RequestStats()
+
     def fetch(self, ticker: str) -> FundamentalData:
-        stock = yf.Ticker(ticker)
-        # To prevent API rate limit, potentially due to calling fetch method in loop
-        time.sleep(1)
+        def _load() -> FundamentalData:
+            import yfinance as yf  # Loaded on the first live request only (slow import)
+
+            stock = yf.Ticker(ticker)
+            return FundamentalData(stock.info, stock.income_stmt, stock.balance_sheet, stock.cash_flow)
 
-        return FundamentalData(stock.info, stock.income_stmt, stock.balance_sheet, stock.cash_flow)
+        return call_with_retry(_load, limiter=self.limiter, retries=self.retries, stats=self.request_stats)
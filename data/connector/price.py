@@ -1,13 +1,64 @@
-import yfinance as yf
+import threading
+
 import pandas as pd
-import time
+import numpy as np
 
 from .base import BaseConnector
+from .price_store import PriceStore
+from .rate_limit import RequestStats, TokenBucket, call_with_retry, shared_limiter
+
+
+class MissingPriceData(ValueError):
+    """Some tickers of a download returned no data after a failed request (worth downloading again)."""
+
+    def __init__(self, tickers: list[str]):
+        super().__init__(f"No price data returned for {', '.join(tickers)}")
+        self.tickers = tickers
+
+
+# yfinance errors that another request cannot fix (delisted / unknown symbol, invalid period)
+PERMANENT_ERRORS = {"YFTickerMissingError", "YFTzMissingError", "YFPricesMissingError", "YFInvalidPeriodError"}
+
+
+def _retryable(error: Exception) -> bool:
+    # Failed ticker requests and network errors are retried, invalid arguments are not
+    return isinstance(error, MissingPriceData) or not isinstance(error, (ValueError, TypeError))
 
 
 class YahooPriceConnector(BaseConnector):
     """Fetch historical price data from Yahoo Finance."""
 
+    # yf.download keeps its results and errors in module globals, so downloads must not overlap
+    _download_lock = threading.Lock()
+
+    def __init__(
+        self,
+        store: PriceStore | None = None,
+        restatement_rtol: float = 1e-6,
+        limiter: TokenBucket | None = None,
+        retries: int = 3,
+        batch_size: int = 100
+    ):
+        """
+        store: optional local price history. When set, open-ended fetches (end=None) only download the bars
+            after the last stored date and append them to the store.
+        restatement_rtol: relative Close difference on the overlapping bar that marks history as restated
+            (auto-adjusted prices change after dividends and splits), triggering a full reload.
+        limiter: token bucket shared with other connectors (defaults to the module-wide shared limiter).
+        retries: retries (with exponential backoff) for a failed download request; tickers whose request
+            failed are downloaded again, tickers Yahoo reports as delisted or unknown are not.
+        batch_size: tickers per download in fetch_many. Each download takes one limiter token, yfinance
+            then requests the batch's tickers in parallel.
+        """
+        self.store = store
+        self.restatement_rtol = restatement_rtol
+        self.limiter = limiter or shared_limiter
+        self.retries = retries
+        self.batch_size = batch_size
+        self.request_stats = RequestStats()
+        # Tickers left out of a download -> reason (delisted / unknown symbol, or failed after all retries)
+        self.missing: dict[str, str] = {}
+
     def fetch(
         self,
         ticker: str,
@@ -16,23 +67,158 @@ class YahooPriceConnector(BaseConnector):
         end: str | None = None,
         interval: str = "1d"
     ) -> pd.DataFrame:
-        data = yf.download(
-            ticker,
-            start=start,
-            end=end,
-            interval=interval,
-            auto_adjust=True, # ALL OHLC automatically adjusted
-            progress=False # No progress printed
-        )
-
-        if data.empty:
-            raise ValueError(f"No price data returned for {ticker}")
-        if isinstance(data.columns, pd.MultiIndex):
-            data.columns = [c[0] for c in data.columns]
-        data.reset_index(inplace=True)
-        data["Ticker"] = ticker.upper()
-
-        # To prevent API rate limit, potentially due to calling fetch method in loop
-        time.sleep(1)
-
+        data = self.fetch_many([ticker], start, end, interval).get(ticker.upper())
+        if data is None or data.empty:
+            reason = self.missing.get(ticker.upper())
+            raise ValueError(f"No price data returned for {ticker}" + (f" ({reason})" if reason else ""))
         return data
+
+    def fetch_many(
+        self,
+        tickers: list[str],
+        start: str = "2015-01-01",
+        end: str | None = None,
+        interval: str = "1d",
+        long: bool = False
+    ) -> dict[str, pd.DataFrame] | pd.DataFrame:
+        """
+        Downloads many tickers in batches of batch_size.
+        Returns {ticker: frame} (tickers without data are left out), or one long frame if long=True.
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        if self.store is None or end is not None:
+            frames = self._download_many(tickers, start, end, interval)
+        else:
+            frames = self._fetch_incremental(tickers, start, interval)
+
+        for ticker, data in frames.items():
+            data["Ticker"] = ticker
+        if long:
+            return pd.concat(frames.values(), ignore_index=True) if frames else pd.DataFrame()
+        return frames
+
+    # -------------------------
+    # Incremental updates (local store)
+    # -------------------------
+    def _fetch_incremental(self, tickers: list[str], start: str, interval: str) -> dict[str, pd.DataFrame]:
+        frames = {}
+        reload = []
+        # Tickers sharing the same last stored bar are downloaded together
+        by_last_date: dict[pd.Timestamp, list[tuple[str, pd.DataFrame]]] = {}
+        for ticker in tickers:
+            stored = self.store.load(ticker, interval) if self.store.covers(ticker, start, interval) else None
+            if stored is None:
+                reload.append(ticker)
+            else:
+                last_date = stored[PriceStore.date_column(stored)].iloc[-1]
+                by_last_date.setdefault(last_date, []).append((ticker, stored))
+
+        for last_date, group in by_last_date.items():
+            # Re-download the last stored bar as well, it is used to detect restated history
+            recent = self._download_many([t for t, _ in group], last_date.strftime("%Y-%m-%d"), None, interval)
+            for ticker, stored in group:
+                merged = self._merge(ticker, stored, recent.get(ticker), start, interval)
+                if merged is None:
+                    reload.append(ticker)
+                else:
+                    frames[ticker] = merged
+
+        if reload:
+            for ticker, data in self._download_many(reload, start, None, interval).items():
+                self.store.replace(ticker, data, start, interval)
+                frames[ticker] = data
+        return frames
+
+    def _merge(self, ticker: str, stored: pd.DataFrame, recent: pd.DataFrame | None, start: str,
+               interval: str) -> pd.DataFrame | None:
+        # Returns None if stored history was restated and has to be reloaded
+        if recent is None or recent.empty:
+            return self._since(stored, start)
+
+        if set(recent.columns) - set(stored.columns):
+            return None  # Stored before a column was added (e.g. Stock Splits): reloaded once in full
+        date_col = PriceStore.date_column(stored)
+        last_date = stored[date_col].iloc[-1]
+        overlap = recent[recent[date_col] == last_date]
+        if overlap.empty or not np.isclose(overlap["Close"].iloc[0], stored["Close"].iloc[-1],
+                                           rtol=self.restatement_rtol, atol=0):
+            return None
+
+        new_rows = recent.loc[recent[date_col] > last_date, stored.columns]
+        self.store.append(ticker, new_rows, interval)
+        return self._since(pd.concat([stored, new_rows], ignore_index=True), start)
+
+    @staticmethod
+    def _since(data: pd.DataFrame, start: str) -> pd.DataFrame:
+        date_col = PriceStore.date_column(data)
+        return data[data[date_col] >= pd.Timestamp(start)].reset_index(drop=True)
+
+    # -------------------------
+    # Download
+    # -------------------------
+    def _download_many(self, tickers: list[str], start: str, end: str | None,
+                       interval: str) -> dict[str, pd.DataFrame]:
+        import yfinance as yf  # Loaded on the first live download only (slow import)
+
+        frames = {}
+        for i in range(0, len(tickers), self.batch_size):
+            pending = tickers[i:i + self.batch_size]
+
+            def download():
+                # yfinance logs and drops tickers whose request failed instead of raising. Tickers without data
+                # are recorded in self.missing; failed requests (not delisted / unknown) are downloaded again
+                nonlocal pending
+                with self._download_lock:
+                    raw = yf.download(
+                        pending,
+                        start=start,
+                        end=end,
+                        interval=interval,
+                        auto_adjust=True, # ALL OHLC automatically adjusted
+                        progress=False, # No progress printed
+                        group_by="ticker",
+                        actions=True, # Dividends and Stock Splits columns (split ratio on the split day, else 0)
+                        threads=True # The batch's tickers are requested in parallel
+                    )
+                    errors = dict(getattr(getattr(yf, "shared", None), "_ERRORS", {}))
+                frames.update(self._split(raw, pending))
+                failed = []
+                for ticker in pending:
+                    if ticker in frames:
+                        self.missing.pop(ticker, None)
+                    else:
+                        self.missing[ticker] = errors.get(ticker, "no price data in the requested range")
+                        if ticker in errors and errors[ticker].split("(", 1)[0] not in PERMANENT_ERRORS:
+                            failed.append(ticker)
+                pending = failed
+                if pending:
+                    raise MissingPriceData(pending)
+
+            try:
+                call_with_retry(download, limiter=self.limiter, retries=self.retries, stats=self.request_stats,
+                                retryable=_retryable)
+            except MissingPriceData:
+                pass  # Requests still failing after all retries: left out, with their error in self.missing
+        return frames
+
+    @staticmethod
+    def _split(raw: pd.DataFrame, batch: list[str]) -> dict[str, pd.DataFrame]:
+        # Splits the (ticker, field) MultiIndex columns of a multi-ticker download into per-ticker frames
+        if raw.empty:
+            return {}
+        if not isinstance(raw.columns, pd.MultiIndex):
+            per_ticker = {batch[0]: raw}
+        else:
+            level = 0 if set(batch) & set(raw.columns.get_level_values(0)) else 1
+            present = set(raw.columns.get_level_values(level))
+            per_ticker = {t: raw.xs(t, axis=1, level=level) for t in batch if t in present}
+
+        frames = {}
+        for ticker, data in per_ticker.items():
+            data = data.dropna(how="all")  # Rows added only to align with the other tickers of the batch
+            if data.empty:
+                continue
+            data = data.reset_index()
+            data.columns.name = None
+            frames[ticker] = data
+        return frames
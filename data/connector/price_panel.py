@@ -0,0 +1,346 @@
+import json
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .base import BaseConnector
+
+
+@dataclass(frozen=True)
+class _Layout:
+    # One consistent version of the panel: metadata, calendar, tickers and the field files mapped with its shape.
+    # Published as a whole by replacing PricePanel._layout, so a reader never mixes two versions.
+    meta: dict
+    calendar: np.ndarray
+    tickers: list[str]
+    index: dict[str, int]
+    maps: dict[str, np.memmap]
+    stamp: tuple | None = None
+
+
+class PricePanel:
+    """
+    On-disk dates x tickers panel of daily prices: a shared trading-day calendar and one memory-mapped float64
+    file per field (Open, High, Low, Close, Volume).
+
+        root/meta.json      fields, row capacity, used days and tickers, generation
+        root/calendar.npy   trading days (datetime64[D]), row order of every field file
+        root/tickers.json   tickers, column order of every field file
+        root/<field>.f64    capacity x tickers float64 in column-major (Fortran) order, NaN where there is no bar
+
+    Each ticker's history is one contiguous column, so readers get zero-copy NumPy views of the mapped pages and
+    worker processes opening the same panel share them through the OS page cache. New tickers are appended to
+    the end of the files; new days fill the slack rows reserved below the last day ('slack_days'). Files are only
+    rewritten when the slack runs out, a write brings days before the last one that are not in the calendar, or
+    stored histories are replaced (restated prices).
+
+    One process writes at a time; readers pick up its changes on their next access. Within a process, writes
+    are serialized and every read works on one layout (calendar, tickers and field files mapped together), which
+    a write replaces as a whole once its files are complete: replaced files stay mapped by the readers of the
+    previous layout.
+    """
+
+    FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+    def __init__(self, root: str, fields: tuple[str, ...] = FIELDS, slack_days: int = 512):
+        self.root = root
+        self.slack_days = slack_days
+        self._lock = threading.Lock()
+        self._layout = _Layout(
+            meta={"fields": list(fields), "capacity": 0, "days": 0, "tickers": 0, "generation": 0},
+            calendar=np.array([], dtype="datetime64[D]"), tickers=[], index={}, maps={}
+        )
+        self._reload()
+
+    # -------------------------
+    # Layout
+    # -------------------------
+    @property
+    def fields(self) -> list[str]:
+        return self._layout.meta["fields"]
+
+    @property
+    def calendar(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self._reload().calendar.astype("datetime64[ns]"), name="Date")
+
+    @property
+    def tickers(self) -> list[str]:
+        return list(self._reload().tickers)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker.upper() in self._reload().index
+
+    def __len__(self) -> int:
+        return len(self._reload().tickers)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def _reload(self) -> _Layout:
+        # Current layout, re-read from the small metadata files when another process changed them
+        try:
+            stat = os.stat(self._path("meta.json"))
+        except FileNotFoundError:
+            return self._layout
+        stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        layout = self._layout
+        if stamp == layout.stamp:
+            return layout
+        with self._lock:
+            if self._layout.stamp != stamp:
+                self._layout = self._load(stamp)
+            return self._layout
+
+    def _load(self, stamp: tuple | None) -> _Layout:
+        with open(self._path("meta.json"), "r") as f:
+            meta = json.load(f)
+        with open(self._path("tickers.json"), "r") as f:
+            tickers = json.load(f)[:meta["tickers"]]
+        calendar = np.load(self._path("calendar.npy"))[:meta["days"]]
+        maps = {}
+        if meta["capacity"] and meta["tickers"]:
+            maps = {field: np.memmap(self._path(f"{field}.f64"), dtype=np.float64, mode="r",
+                                     shape=(meta["capacity"], meta["tickers"]), order="F")
+                    for field in meta["fields"]}
+        return _Layout(meta, calendar, tickers, {ticker: j for j, ticker in enumerate(tickers)}, maps, stamp)
+
+    # -------------------------
+    # Reads (zero-copy views)
+    # -------------------------
+    def field(self, field: str = "Close") -> np.ndarray:
+        """
+        Read-only days x tickers view of one field (rows: calendar, columns: tickers).
+        """
+        return self._field(self._reload(), field)
+
+    @staticmethod
+    def _field(layout: _Layout, field: str) -> np.ndarray:
+        array = layout.maps.get(field)
+        if array is None:
+            return np.empty((layout.meta["days"], layout.meta["tickers"]))
+        return array[:layout.meta["days"]]
+
+    def series(self, ticker: str, field: str = "Close") -> np.ndarray:
+        """
+        Read-only view of one ticker's field over the whole calendar (NaN on days without a bar).
+        """
+        layout = self._reload()
+        return self._field(layout, field)[:, layout.index[ticker.upper()]]
+
+    def bar(self, ticker: str, date: pd.Timestamp, field: str = "Close") -> float:
+        """
+        One stored value (NaN if the ticker has no bar on that day or the day is not in the calendar).
+        """
+        layout = self._reload()
+        day = np.datetime64(pd.Timestamp(date), "D")
+        row = np.searchsorted(layout.calendar, day)
+        if row == len(layout.calendar) or layout.calendar[row] != day:
+            return np.nan
+        return float(self._field(layout, field)[row, layout.index[ticker.upper()]])
+
+    def close_frame(self) -> pd.DataFrame:
+        """
+        Close prices as a dates x tickers frame backed by the mapped file (input of PanelPriceAnalytics).
+        """
+        layout = self._reload()
+        return pd.DataFrame(self._field(layout, "Close"), copy=False,
+                            index=pd.DatetimeIndex(layout.calendar.astype("datetime64[ns]"), name="Date"),
+                            columns=list(layout.tickers))
+
+    def last_date(self, ticker: str) -> pd.Timestamp | None:
+        layout = self._reload()
+        bars = np.flatnonzero(~np.isnan(self._field(layout, "Close")[:, layout.index[ticker.upper()]]))
+        return pd.Timestamp(layout.calendar[bars[-1]]) if bars.size else None
+
+    def frame(self, ticker: str, start: str | None = None, end: str | None = None) -> pd.DataFrame | None:
+        """
+        One ticker's bars in the YahooPriceConnector layout ('Date' column plus the fields). The field columns
+        are views of the mapped file unless the ticker has no bar on some calendar days inside its history
+        (then those rows are dropped, which copies).
+        """
+        layout = self._reload()
+        column = layout.index.get(ticker.upper())
+        if column is None:
+            return None
+        calendar = layout.calendar
+        close = self._field(layout, "Close")[:, column]
+        lo = np.searchsorted(calendar, np.datetime64(pd.Timestamp(start), "D")) if start is not None else 0
+        hi = np.searchsorted(calendar, np.datetime64(pd.Timestamp(end), "D")) if end is not None else len(calendar)
+        bars = np.flatnonzero(~np.isnan(close[lo:hi])) + lo
+        if bars.size == 0:
+            return None
+        rows = slice(bars[0], bars[-1] + 1)
+        if bars.size < bars[-1] + 1 - bars[0]:
+            rows = bars
+        data = {"Date": calendar[rows].astype("datetime64[ns]")}
+        data.update({field: self._field(layout, field)[:, column][rows] for field in layout.meta["fields"]})
+        return pd.DataFrame(data, copy=False)
+
+    # -------------------------
+    # Writes
+    # -------------------------
+    def write(self, frames: dict[str, pd.DataFrame], replace: bool = False):
+        """
+        Stores daily bars (frames as returned by YahooPriceConnector.fetch_many). Bars on days already stored
+        are overwritten; with replace=True the tickers' stored histories are replaced (restated prices), in new
+        files published with the new layout.
+        """
+        frames = {ticker.upper(): data for ticker, data in frames.items() if data is not None and not data.empty}
+        if not frames:
+            return
+        self._reload()
+        with self._lock:
+            # The layout is only read here; the new one is built aside and published by _save_meta
+            layout = self._layout
+            meta, calendar, tickers = dict(layout.meta), layout.calendar, list(layout.tickers)
+            days = {ticker: pd.to_datetime(data[self._date_column(data)]).to_numpy(dtype="datetime64[D]")
+                    for ticker, data in frames.items()}
+            new_days = np.setdiff1d(np.concatenate(list(days.values())), calendar)
+            new_tickers = [ticker for ticker in frames if ticker not in layout.index]
+            # Replaced histories are cleared in new files: clearing them in place would show readers of the
+            # current layout an empty history until the new bars are written
+            cleared = [ticker for ticker in frames if ticker in layout.index] if replace else []
+
+            inserted = bool(new_days.size and calendar.size and new_days[0] < calendar[-1])
+            calendar = np.union1d(calendar, new_days) if inserted else np.concatenate([calendar, new_days])
+            tickers += new_tickers
+            rebuilt = inserted or len(calendar) > meta["capacity"] or bool(cleared)
+            if rebuilt:
+                meta["capacity"] = len(calendar) + self.slack_days
+                paths = self._rebuild(layout, calendar, meta["capacity"], len(tickers), cleared)
+            else:
+                self._add_tickers(meta["capacity"], new_tickers)
+                paths = {field: self._path(f"{field}.f64") for field in meta["fields"]}
+            meta["days"], meta["tickers"] = len(calendar), len(tickers)
+
+            index = {ticker: j for j, ticker in enumerate(tickers)}
+            for field, path in paths.items():
+                array = np.memmap(path, dtype=np.float64, mode="r+", shape=(meta["capacity"], len(tickers)), order="F")
+                for ticker in frames:
+                    if field in frames[ticker].columns:
+                        rows = np.searchsorted(calendar, days[ticker])
+                        array[rows, index[ticker]] = frames[ticker][field].to_numpy(dtype=float)
+                array.flush()
+                del array
+            if rebuilt:
+                for field, path in paths.items():
+                    os.replace(path, self._path(f"{field}.f64"))  # Readers of 'layout' keep the old file mapped
+            self._save_meta(meta, calendar, tickers)
+
+    @staticmethod
+    def _date_column(data: pd.DataFrame) -> str:
+        return "Date" if "Date" in data.columns else data.columns[0]
+
+    def _add_tickers(self, capacity: int, tickers: list[str]):
+        # Column-major files: new columns go at the end, existing pages are not touched
+        if not tickers:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        blank = np.full(capacity, np.nan).tobytes()
+        for field in self._layout.meta["fields"]:
+            with open(self._path(f"{field}.f64"), "ab") as f:
+                for _ in tickers:
+                    f.write(blank)
+
+    def _rebuild(self, layout: _Layout, calendar: np.ndarray, capacity: int, n: int,
+                 cleared: list[str]) -> dict[str, str]:
+        # Copies every field into a new (capacity x n) file, moving stored rows to their new positions and leaving
+        # the 'cleared' tickers' columns empty. Returns {field: path of the new file}, renamed over the old one by
+        # write() once the new bars are in.
+        os.makedirs(self.root, exist_ok=True)
+        rows = np.searchsorted(calendar, layout.calendar)
+        old_days, old_tickers = layout.meta["days"], len(layout.tickers)
+        paths = {}
+        for field in layout.meta["fields"]:
+            old = layout.maps.get(field)
+            paths[field] = self._path(f"{field}.f64.tmp")
+            new = np.memmap(paths[field], dtype=np.float64, mode="w+", shape=(capacity, n), order="F")
+            new[:] = np.nan
+            if old is not None:
+                for start in range(0, old_tickers, 1024):  # Bounded temporaries for wide panels
+                    stop = min(start + 1024, old_tickers)
+                    new[rows, start:stop] = old[:old_days, start:stop]
+                for ticker in cleared:
+                    new[:, layout.index[ticker]] = np.nan
+            new.flush()
+            del new
+        return paths
+
+    def _save_meta(self, meta: dict, calendar: np.ndarray, tickers: list[str]):
+        # Calendar and tickers first, meta.json (which readers check) last, each replaced atomically; then the
+        # new layout is published to this process's readers
+        os.makedirs(self.root, exist_ok=True)
+        with open(self._path("calendar.npy.tmp"), "wb") as f:
+            np.save(f, calendar)
+        os.replace(self._path("calendar.npy.tmp"), self._path("calendar.npy"))
+        for name, value in (("tickers.json", tickers),
+                            ("meta.json", {**meta, "generation": meta["generation"] + 1})):
+            with open(self._path(f"{name}.tmp"), "w") as f:
+                json.dump(value, f)
+            os.replace(self._path(f"{name}.tmp"), self._path(name))
+        stat = os.stat(self._path("meta.json"))
+        self._layout = self._load((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+
+
+class PanelPriceConnector(BaseConnector):
+    """
+    Serves daily prices from a PricePanel. Tickers not stored yet, or whose last bar is older than the previous
+    business day, are downloaded from 'source' (e.g. YahooPriceConnector) and written to the panel: only the
+    days after the stored ones, unless the overlapping bar shows restated history. Without a source the panel is
+    served as is. Other intervals than "1d" go to the source directly.
+    """
+
+    def __init__(self, panel: PricePanel, source: BaseConnector | None = None, restatement_rtol: float = 1e-6):
+        self.panel = panel
+        self.source = source
+        self.restatement_rtol = restatement_rtol
+
+    def fetch(self, ticker: str, start: str = "2015-01-01", end: str | None = None, interval: str = "1d") -> pd.DataFrame:
+        data = self.fetch_many([ticker], start, end, interval).get(ticker.upper())
+        if data is None or data.empty:
+            raise ValueError(f"No price data for {ticker}")
+        return data
+
+    def fetch_many(self, tickers: list[str], start: str = "2015-01-01", end: str | None = None,
+                   interval: str = "1d") -> dict[str, pd.DataFrame]:
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        if interval != "1d":
+            if self.source is None:
+                raise LookupError(f"The price panel only holds daily bars, not {interval}")
+            return self.source.fetch_many(tickers, start=start, end=end, interval=interval)
+        if self.source is not None:
+            self._update(tickers, start)
+        frames = {}
+        for ticker in tickers:
+            data = self.panel.frame(ticker, start, end)
+            if data is not None:
+                frames[ticker] = data
+        return frames
+
+    def _update(self, tickers: list[str], start: str):
+        stale_before = pd.Timestamp.today().normalize() - pd.offsets.BDay(1)
+        missing, by_last_date = [], {}
+        for ticker in tickers:
+            last_date = self.panel.last_date(ticker) if ticker in self.panel else None
+            if last_date is None:
+                missing.append(ticker)
+            elif last_date < stale_before:
+                by_last_date.setdefault(last_date, []).append(ticker)
+
+        if missing:
+            self.panel.write(self.source.fetch_many(missing, start=start))
+        for last_date, group in by_last_date.items():
+            # The last stored bar is downloaded again to detect restated (re-adjusted) history
+            recent = self.source.fetch_many(group, start=last_date.strftime("%Y-%m-%d"))
+            restated = [t for t, data in recent.items() if not self._continues(t, data, last_date)]
+            self.panel.write({t: data for t, data in recent.items() if t not in restated})
+            if restated:
+                self.panel.write(self.source.fetch_many(restated, start=start), replace=True)
+
+    def _continues(self, ticker: str, recent: pd.DataFrame, last_date: pd.Timestamp) -> bool:
+        overlap = recent[pd.to_datetime(recent[PricePanel._date_column(recent)]) == last_date]
+        stored = self.panel.bar(ticker, last_date)
+        return not overlap.empty and bool(np.isclose(overlap["Close"].iloc[0], stored, rtol=self.restatement_rtol, atol=0))
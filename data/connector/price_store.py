@@ -0,0 +1,72 @@
+import json
+import os
+
+import pandas as pd
+
+
+class PriceStore:
+    """
+    Append-only local store of price history, one CSV file per (interval, ticker).
+
+    New bars are appended to the end of the file; the whole file is only rewritten when the provider
+    restates history (e.g. a dividend or split changes auto-adjusted prices).
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, ticker: str, interval: str) -> str:
+        return os.path.join(self.root, interval, f"{ticker.upper()}.csv")
+
+    def _meta_path(self, ticker: str, interval: str) -> str:
+        return os.path.join(self.root, interval, f"{ticker.upper()}.meta.json")
+
+    @staticmethod
+    def date_column(data: pd.DataFrame) -> str:
+        # yfinance names the index 'Date' for daily bars and 'Datetime' for intraday bars
+        return "Date" if "Date" in data.columns else data.columns[0]
+
+    def load(self, ticker: str, interval: str = "1d") -> pd.DataFrame | None:
+        path = self._path(ticker, interval)
+        if not os.path.exists(path):
+            return None
+        data = pd.read_csv(path, float_precision="round_trip")
+        if data.empty:
+            return None
+        date_col = self.date_column(data)
+        data[date_col] = pd.to_datetime(data[date_col])
+        return data
+
+    def covers(self, ticker: str, start: str, interval: str = "1d") -> bool:
+        """
+        True if the stored history was downloaded from 'start' or earlier (listing date may be later).
+        """
+        try:
+            with open(self._meta_path(ticker, interval), "r") as f:
+                return pd.Timestamp(json.load(f)["start"]) <= pd.Timestamp(start)
+        except (FileNotFoundError, KeyError, ValueError):
+            return False
+
+    def append(self, ticker: str, data: pd.DataFrame, interval: str = "1d"):
+        """
+        Appends new bars (must be later than everything already stored).
+        """
+        if data.empty:
+            return
+        path = self._path(ticker, interval)
+        exists = os.path.exists(path)
+        if not exists:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        data.to_csv(path, mode="a", header=not exists, index=False)
+
+    def replace(self, ticker: str, data: pd.DataFrame, start: str, interval: str = "1d"):
+        """
+        Rewrites the full history (first download or restated prices) requested from 'start'.
+        """
+        path = self._path(ticker, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        data.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        with open(self._meta_path(ticker, interval), "w") as f:
+            json.dump({"start": str(start)}, f)
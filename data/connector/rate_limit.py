@@ -0,0 +1,126 @@
+import random
+import threading
+import time
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by connectors calling the same data provider.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each request takes one token
+    and waits only as long as needed for a token to become available.
+    """
+
+    def __init__(self, rate: float = 1.0, capacity: float = 1.0):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("TokenBucket needs rate > 0 and capacity >= 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Blocks until 'tokens' are available and returns the time spent waiting (seconds).
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class RequestStats:
+    """
+    Thread-safe request counters of one connector: attempts, retries, failures, time spent waiting for
+    the rate limiter and per-attempt latencies.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.limiter_wait = 0.0
+        self.latencies: list[float] = []
+
+    def record(self, latency: float, wait: float = 0.0, retried: bool = False, failed: bool = False):
+        with self._lock:
+            self.requests += 1
+            self.retries += retried
+            self.failures += failed
+            self.limiter_wait += wait
+            self.latencies.append(latency)
+
+    def summary(self) -> dict:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            requests, retries, failures, wait = self.requests, self.retries, self.failures, self.limiter_wait
+
+        def percentile(q: float) -> float:
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else float("nan")
+
+        return {
+            "requests": requests,
+            "retries": retries,
+            "failures": failures,
+            "limiter_wait_s": wait,
+            "latency_p50_ms": percentile(0.5),
+            "latency_p99_ms": percentile(0.99),
+            "latency_max_ms": latencies[-1] * 1000 if latencies else float("nan"),
+        }
+
+
+# Default limiter shared by all Yahoo connectors (about one request per second, like the former fixed sleeps)
+shared_limiter = TokenBucket(rate=1.0, capacity=1.0)
+
+
+def call_with_retry(
+    func: Callable[[], T],
+    limiter: TokenBucket | None = None,
+    retries: int = 3,
+    backoff: float = 1.0,
+    max_backoff: float = 30.0,
+    stats: RequestStats | None = None,
+    tokens: int | Callable[[], int] = 1,
+    retryable: Callable[[Exception], bool] | None = None
+) -> T:
+    """
+    Calls func() after taking limiter tokens, retrying failures with exponential backoff and jitter.
+    The last exception is re-raised once all retries are used up, or at once if retryable(exception) is False
+    (permanent errors; by default every exception is retried). Each attempt is recorded in 'stats'.
+    'tokens' is the number of provider requests one attempt makes (a callable is evaluated before every
+    attempt, for calls whose size shrinks on retry); they are taken one at a time, so any count works with
+    a bucket of capacity 1.
+    """
+    attempt = 0
+    while True:
+        count = tokens() if callable(tokens) else tokens
+        wait = sum(limiter.acquire() for _ in range(count)) if limiter is not None else 0.0
+        started = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            final = attempt >= retries or (retryable is not None and not retryable(e))
+            if stats is not None:
+                stats.record(time.perf_counter() - started, wait, retried=not final, failed=final)
+            if final:
+                raise
+            delay = min(max_backoff, backoff * 2 ** attempt)
+            time.sleep(delay * random.uniform(0.5, 1.5))
+            attempt += 1
+            continue
+        if stats is not None:
+            stats.record(time.perf_counter() - started, wait)
+        return result
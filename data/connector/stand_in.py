@@ -0,0 +1,298 @@
+"""
+Local stand-in for the HTTP endpoints used by the async connectors.
+
+Serves recorded (or synthetic) price and statement payloads with configurable latency and error injection,
+so the async connectors and AnalysisPipeline.run_async can be exercised and load-tested offline:
+
+    python -m data.connector.stand_in --load 10 100 1000 --latency 0.05 --error_rate 0.01
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+from aiohttp import web
+
+from .async_http import AsyncFundamentalsConnector, AsyncYahooPriceConnector
+from ..models.fundamental_data import FundamentalData
+
+
+def chart_payload(prices: pd.DataFrame) -> dict:
+    """
+    Converts a YahooPriceConnector frame into a Yahoo chart API (v8) payload (prices already adjusted).
+    """
+    dates = pd.to_datetime(prices["Date"])
+    timestamps = (dates - pd.Timestamp("1970-01-01")) // pd.Timedelta(seconds=1)
+
+    def column(name):
+        return [None if pd.isna(v) else float(v) for v in prices[name]] if name in prices else None
+
+    def event_days(name):
+        values = prices[name].to_numpy(dtype=float) if name in prices else np.zeros(len(prices))
+        return [(str(int(t)), int(t), float(v)) for t, v in zip(timestamps[values > 0], values[values > 0])]
+
+    events = {
+        "dividends": {key: {"date": t, "amount": v} for key, t, v in event_days("Dividends")},
+        "splits": {key: {"date": t, "numerator": v, "denominator": 1.0} for key, t, v in event_days("Stock Splits")},
+    }
+
+    return {"chart": {"result": [{
+        "meta": {"symbol": str(prices["Ticker"].iloc[0]) if "Ticker" in prices else None},
+        "timestamp": [int(t) for t in timestamps],
+        "events": events,
+        "indicators": {
+            "quote": [{key.lower(): column(key) for key in ("Open", "High", "Low", "Close", "Volume")}],
+            "adjclose": [{"adjclose": column("Close")}],
+        },
+    }], "error": None}}
+
+
+def record(tickers: list[str], record_dir: str, price_connector=None, fundamental_connector=None):
+    """
+    Records payloads from the (synchronous) live connectors, to be served later by the stand-in.
+    """
+    for ticker in tickers:
+        ticker = ticker.upper()
+        if price_connector is not None:
+            _write_json(os.path.join(record_dir, "prices", f"{ticker}.json"),
+                        chart_payload(price_connector.fetch(ticker)))
+        if fundamental_connector is not None:
+            _write_json(os.path.join(record_dir, "fundamentals", f"{ticker}.json"),
+                        fundamental_connector.fetch(ticker).to_payload())
+
+
+def _write_json(path: str, payload: dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+
+
+class StandInServer:
+    """
+    aiohttp server answering
+        GET /v8/finance/chart/{ticker}   (Yahoo chart API layout)
+        GET /fundamentals/{ticker}       (FundamentalData.to_payload layout)
+    from '{record_dir}/prices|fundamentals/{ticker}.json', or with deterministic synthetic data if the ticker
+    was not recorded and synthetic=True.
+    """
+
+    def __init__(
+        self,
+        record_dir: str | None = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        synthetic: bool = True,
+        seed: int = 0
+    ):
+        self.record_dir = record_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.synthetic = synthetic
+        self.stats = {"requests": 0, "injected_errors": 0, "not_found": 0}
+        self._random = random.Random(seed)
+        self._payloads: dict[tuple[str, str], bytes] = {}
+        self._runner: web.AppRunner | None = None
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Starts serving and returns the base URL (port=0 picks a free port).
+        """
+        app = web.Application()
+        app.router.add_get("/v8/finance/chart/{ticker}", self._handle_prices)
+        app.router.add_get("/fundamentals/{ticker}", self._handle_fundamentals)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port, backlog=4096)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # -------------------------
+    # Handlers
+    # -------------------------
+    async def _handle_prices(self, request: web.Request) -> web.Response:
+        return await self._respond("prices", request.match_info["ticker"].upper(), self._synthetic_prices)
+
+    async def _handle_fundamentals(self, request: web.Request) -> web.Response:
+        return await self._respond("fundamentals", request.match_info["ticker"].upper(),
+                                   self._synthetic_fundamentals)
+
+    async def _respond(self, kind: str, ticker: str, synthesize) -> web.Response:
+        self.stats["requests"] += 1
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._random.random() < self.error_rate:
+            self.stats["injected_errors"] += 1
+            return web.Response(status=self._random.choice((429, 500, 503)))
+
+        body = self._payload(kind, ticker, synthesize)
+        if body is None:
+            self.stats["not_found"] += 1
+            return web.Response(status=404)
+        return web.Response(body=body, content_type="application/json")
+
+    def _payload(self, kind: str, ticker: str, synthesize) -> bytes | None:
+        key = (kind, ticker)
+        if key not in self._payloads:
+            path = os.path.join(self.record_dir, kind, f"{ticker}.json") if self.record_dir else None
+            if path and os.path.exists(path):
+                with open(path, "rb") as f:
+                    self._payloads[key] = f.read()
+            elif self.synthetic:
+                self._payloads[key] = json.dumps(synthesize(ticker)).encode("utf-8")
+            else:
+                return None
+        return self._payloads[key]
+
+    # -------------------------
+    # Synthetic payloads (deterministic per ticker)
+    # -------------------------
+    @staticmethod
+    def _rng(ticker: str) -> np.random.Generator:
+        return np.random.default_rng(zlib.crc32(ticker.encode("utf-8")))
+
+    def _synthetic_prices(self, ticker: str) -> dict:
+        rng = self._rng(ticker)
+        dates = pd.bdate_range("2015-01-02", pd.Timestamp.today().normalize())
+        close = rng.uniform(10, 300) * np.exp(np.cumsum(rng.normal(0.0003, 0.018, len(dates))))
+        prices = pd.DataFrame({
+            "Date": dates, "Open": close * (1 + rng.normal(0, 0.003, len(dates))),
+            "High": close * 1.01, "Low": close * 0.99, "Close": close,
+            "Volume": rng.integers(10_000, 10_000_000, len(dates)).astype(float), "Ticker": ticker
+        })
+        return chart_payload(prices)
+
+    def _synthetic_fundamentals(self, ticker: str) -> dict:
+        rng = self._rng(ticker)
+        dates = pd.to_datetime(["2024-12-31", "2023-12-31", "2022-12-31", "2021-12-31"])
+        revenue = rng.uniform(1e9, 1e11) / np.cumprod(1 + rng.normal(0.06, 0.05, len(dates)))
+        margin = rng.uniform(0.05, 0.35)
+        income = pd.DataFrame({d: {"Total Revenue": r, "EBIT": r * margin, "Tax Provision": r * margin * 0.21}
+                               for d, r in zip(dates, revenue)})
+        balance = pd.DataFrame({d: {"Current Assets": r * 0.4, "Cash And Cash Equivalents": r * 0.1,
+                                    "Current Liabilities": r * 0.3, "Net PPE": r * 0.5,
+                                    "Total Non Current Assets": r * 0.8, "Total Debt": r * 0.3}
+                                for d, r in zip(dates, revenue)})
+        cash_flow = pd.DataFrame({d: {"Free Cash Flow": r * margin * 0.5} for d, r in zip(dates, revenue)})
+        info = {"symbol": ticker, "quoteType": "EQUITY", "sector": "Technology",
+                "sharesOutstanding": float(rng.uniform(1e8, 5e9))}
+        return FundamentalData(info, income, balance, cash_flow).to_payload()
+
+
+# =====================================================
+# Load measurement
+# =====================================================
+async def measure_load(base_url: str, concurrency: int, requests: int, kind: str = "prices") -> dict:
+    """
+    Issues 'requests' fetches through the async connector with 'concurrency' requests in flight and
+    reports throughput and latency percentiles.
+    """
+    connector_cls = AsyncYahooPriceConnector if kind == "prices" else AsyncFundamentalsConnector
+    latencies = []
+    errors = 0
+
+    async with connector_cls(base_url=base_url, max_concurrency=concurrency, retries=3, backoff=0.05) as connector:
+        remaining = iter(range(requests))
+
+        async def worker():
+            # Each worker keeps one request in flight, so latencies exclude client-side queueing
+            nonlocal errors
+            for i in remaining:
+                started = time.perf_counter()
+                try:
+                    await connector.fetch(f"T{i % 100:03d}")
+                    latencies.append(time.perf_counter() - started)
+                except Exception:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        retries = connector.request_stats.retries
+
+    lat_ms = np.asarray(latencies) * 1000
+    return {
+        "kind": kind,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "retries": retries,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(float(np.percentile(lat_ms, 50)), 2) if lat_ms.size else None,
+        "p99_ms": round(float(np.percentile(lat_ms, 99)), 2) if lat_ms.size else None,
+    }
+
+
+def _serve_forever(settings: dict, host: str, port: int, ready: multiprocessing.Queue):
+    async def serve():
+        server = StandInServer(**settings)
+        ready.put(await server.start(host, port))
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def start_in_process(host: str = "127.0.0.1", port: int = 0, **settings) -> tuple[str, multiprocessing.Process]:
+    """
+    Runs a StandInServer in a separate process (so it does not compete with the client for the event loop
+    and the GIL). Returns the base URL and the process; call process.terminate() to stop it.
+    """
+    ready: multiprocessing.Queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve_forever, args=(settings, host, port, ready), daemon=True)
+    process.start()
+    return ready.get(timeout=30), process
+
+
+async def _main(args: argparse.Namespace):
+    settings = {"record_dir": args.record_dir, "latency": args.latency, "jitter": args.jitter,
+                "error_rate": args.error_rate}
+    if not args.load:
+        # Already running on the event loop of asyncio.run(_main(...)): serve on it until interrupted
+        server = StandInServer(**settings)
+        print(f"Stand-in serving at {await server.start(args.host, args.port)}")
+        await asyncio.Event().wait()
+        return
+
+    base_url, process = start_in_process(args.host, args.port, **settings)
+    print(f"Stand-in serving at {base_url}")
+    try:
+        for concurrency in args.load:
+            for kind in ("prices", "fundamentals"):
+                result = await measure_load(base_url, concurrency, max(args.requests, concurrency), kind)
+                print(json.dumps(result))
+    finally:
+        process.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the price / statement HTTP endpoints")
+    parser.add_argument("--record_dir", type=str, help="Directory with recorded payloads (prices/, fundamentals/)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Added latency per request (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra uniform random latency (seconds)")
+    parser.add_argument("--error_rate", type=float, default=0.0, help="Share of requests answered with 429/5xx")
+    parser.add_argument("--load", type=int, nargs="*", help="Run load measurement at these concurrency levels")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per load measurement")
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
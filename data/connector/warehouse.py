@@ -0,0 +1,221 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+
+from .base import BaseConnector
+from ..models.fundamental_data import FundamentalData
+
+
+class FundamentalsWarehouse:
+    """
+    Local columnar store of financial statements, one uncompressed Arrow IPC (Feather v2) file per ticker.
+
+    Each file has one row per (statement, fiscal period end) and one float64 column per line item, so reads
+    are memory-mapped and only touch the requested columns. A line item a company does not report is null,
+    while a reported value that is missing stays NaN (the distinction FundamentalProcessor's fallbacks rely on).
+    Selected `info` fields are kept in the file's schema metadata.
+    """
+
+    STATEMENTS = ("income_statement", "balance_sheet", "cash_flow")
+    KEY_COLUMNS = ("statement", "date")
+    INFO_FIELDS = (
+        "symbol", "quoteType", "shortName", "longName", "sector", "industry", "country", "currency",
+        "sharesOutstanding", "marketCap", "currentPrice", "beta"
+    )
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.root, "statements", f"{ticker.upper()}.arrow")
+
+    def tickers(self) -> list[str]:
+        folder = os.path.join(self.root, "statements")
+        if not os.path.isdir(folder):
+            return []
+        return sorted(name[:-len(".arrow")] for name in os.listdir(folder) if name.endswith(".arrow"))
+
+    def __contains__(self, ticker: str) -> bool:
+        return os.path.exists(self._path(ticker))
+
+    # -------------------------
+    # Writes
+    # -------------------------
+    def put(self, ticker: str, data: FundamentalData):
+        """
+        Stores (or replaces) all statements and the selected info fields of one company.
+        """
+        parts = []
+        for statement in self.STATEMENTS:
+            df = data.statements.get(statement)
+            if df is None or df.empty:
+                continue
+            dates = pd.to_datetime(df.columns)
+            columns = {
+                "statement": pa.array([statement] * len(dates), pa.string()),
+                "date": pa.array(dates.to_numpy(dtype="datetime64[ns]"), pa.timestamp("ns")),
+            }
+            for item, values in zip(df.index, df.to_numpy(dtype=float)):
+                if item not in columns:
+                    columns[str(item)] = pa.array(values, pa.float64(), from_pandas=False)  # Keep NaN, not null
+            parts.append(pa.table(columns))
+
+        table = pa.concat_tables(parts, promote_options="default") if parts else pa.table({
+            "statement": pa.array([], pa.string()), "date": pa.array([], pa.timestamp("ns"))
+        })
+        info = {field: data.info[field] for field in self.INFO_FIELDS if data.info.get(field) is not None}
+        table = table.replace_schema_metadata({"info": json.dumps(info, default=str)})
+
+        path = self._path(ticker)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with pa.OSFile(tmp_path, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp_path, path)
+
+    def put_many(self, fundamentals: dict[str, FundamentalData]):
+        for ticker, data in fundamentals.items():
+            self.put(ticker, data)
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    def _open(self, ticker: str, columns: list[str] | None = None) -> pa.Table | None:
+        # Memory-mapped and column-projected: only the pages of the requested columns are read
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+        source = pa.memory_map(path, "r")
+        reader = ipc.open_file(source)
+        if columns is None:
+            return reader.read_all()
+        names = reader.schema.names
+        fields = [names.index(column) for column in columns if column in names]
+        table = ipc.open_file(source, options=ipc.IpcReadOptions(included_fields=fields)).read_all()
+        for column in columns:
+            if column not in names:
+                table = table.append_column(column, pa.nulls(len(table), pa.float64()))
+        return table.select(columns)
+
+    def info(self, ticker: str) -> dict | None:
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+        with pa.memory_map(path, "r") as source:
+            metadata = ipc.open_file(source).schema.metadata or {}
+        return json.loads(metadata.get(b"info", b"{}"))
+
+    def read(self, ticker: str) -> FundamentalData | None:
+        """
+        Rebuilds FundamentalData in the yfinance layout (line items as rows, newest period first).
+        """
+        table = self._open(ticker)
+        if table is None:
+            return None
+        statements = {}
+        for statement in self.STATEMENTS:
+            rows = table.filter(pc.equal(table["statement"], statement))
+            if len(rows) == 0:
+                statements[statement] = pd.DataFrame()
+                continue
+            items = [name for name in rows.column_names
+                     if name not in self.KEY_COLUMNS and rows[name].null_count < len(rows)]
+            df = rows.select(items).to_pandas()
+            df.index = pd.DatetimeIndex(rows["date"].to_numpy())
+            statements[statement] = df.sort_index(ascending=False).T
+        return FundamentalData(self.info(ticker), *(statements[s] for s in self.STATEMENTS))
+
+    def query(
+        self,
+        items: list[str],
+        tickers: list[str] | None = None,
+        last_years: int | None = None,
+        statement: str | None = None
+    ) -> pd.DataFrame:
+        """
+        Line items for many companies, reading only the requested columns, e.g.
+            warehouse.query(["Total Revenue", "EBIT"], last_years=5)
+        Returns one row per (ticker, statement, date); items a company does not report are NaN.
+        """
+        tables = []
+        for ticker in tickers or self.tickers():
+            table = self._open(ticker, list(self.KEY_COLUMNS) + list(items))
+            if table is None or len(table) == 0:
+                continue
+            if statement is not None:
+                table = table.filter(pc.equal(table["statement"], statement))
+            tables.append(table.add_column(0, "ticker", pa.array([ticker.upper()] * len(table), pa.string())))
+        if not tables:
+            return pd.DataFrame(columns=["ticker", *self.KEY_COLUMNS, *items])
+
+        result = pa.concat_tables(tables).to_pandas()
+        if last_years is not None:
+            cutoff = result.groupby("ticker")["date"].transform("max") - pd.DateOffset(years=last_years)
+            result = result[result["date"] > cutoff]
+        # Rows with none of the items (e.g. balance sheet rows when querying income items) are dropped
+        return result.dropna(subset=list(items), how="all").reset_index(drop=True)
+
+    def long_statements(self, tickers: list[str] | None = None) -> pd.DataFrame:
+        """
+        All statements as one long (ticker, date, line_item, value) table, the input of
+        PanelFundamentalProcessor. Unreported items are left out, missing values stay NaN.
+        """
+        tickers_, dates, items, values = [], [], [], []
+        for ticker in tickers or self.tickers():
+            table = self._open(ticker)
+            if table is None:
+                continue
+            date = table["date"].to_numpy()
+            for name in table.column_names:
+                if name in self.KEY_COLUMNS:
+                    continue
+                column = table[name]
+                reported = column.is_valid().to_numpy(zero_copy_only=False)
+                tickers_.append(np.full(reported.sum(), ticker.upper(), dtype=object))
+                dates.append(date[reported])
+                items.append(np.full(reported.sum(), name, dtype=object))
+                values.append(column.to_numpy(zero_copy_only=False)[reported])
+        if not values:
+            return pd.DataFrame({"ticker": [], "date": pd.to_datetime([]), "line_item": [], "value": []})
+        return pd.DataFrame({
+            "ticker": np.concatenate(tickers_),
+            "date": np.concatenate(dates),
+            "line_item": np.concatenate(items),
+            "value": np.concatenate(values).astype(float),
+        })
+
+    def info_table(self, tickers: list[str] | None = None) -> pd.DataFrame:
+        """
+        Stored info fields for many companies, indexed by ticker.
+        """
+        tickers = [t.upper() for t in tickers or self.tickers()]
+        return pd.DataFrame([self.info(ticker) or {} for ticker in tickers], index=pd.Index(tickers, name="Ticker"))
+
+
+class WarehouseFundamentalsConnector(BaseConnector):
+    """
+    Serves fundamentals from a FundamentalsWarehouse. Companies not yet stored are fetched from 'source'
+    (e.g. YahooFundamentalsConnector) and written to the warehouse; without a source they raise LookupError.
+    """
+
+    def __init__(self, warehouse: FundamentalsWarehouse, source: BaseConnector | None = None):
+        self.warehouse = warehouse
+        self.source = source
+
+    def fetch(self, ticker: str) -> FundamentalData:
+        data = self.warehouse.read(ticker)
+        if data is not None:
+            return data
+        if self.source is None:
+            raise LookupError(f"No fundamentals for {ticker} in the warehouse")
+        data = self.source.fetch(ticker)
+        self.warehouse.put(ticker, data)
+        return data
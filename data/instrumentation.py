@@ -0,0 +1,83 @@
+import contextlib
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+
+class Instrumentation:
+    """
+    Wall time, CPU time and (optionally) allocated memory of pipeline stages, per ticker.
+
+    measure() appends (stage, wall_s, cpu_s, alloc_mb) to a ticker's timing list (Report.timings, so timings
+    recorded in worker processes travel back with the report); collect() adds a finished ticker's list to the
+    run totals. CPU time is the calling thread's, so a low CPU / wall ratio points at waiting (network,
+    rate limiter, disk) rather than computing. Memory is the peak allocated by Python during the stage, only
+    recorded while tracemalloc is tracing (it slows Python down, so it is started by --profile only) and
+    'memory' is set: tracemalloc's peak is process-wide, so it is only attributed to a stage while no other
+    thread of the process is working (the pipeline turns it off for its concurrent fetching).
+    """
+
+    def __init__(self, memory: bool = True):
+        self.memory = memory
+        self._lock = threading.Lock()
+        self._rows: list[tuple] = []
+
+    @contextlib.contextmanager
+    def measure(self, timings: list, stage: str):
+        memory = self.memory and tracemalloc.is_tracing()
+        if memory:
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            alloc = (tracemalloc.get_traced_memory()[1] - start_memory) / 2 ** 20 if memory else float("nan")
+            timings.append((stage, time.perf_counter() - wall, time.thread_time() - cpu, alloc))
+
+    def collect(self, ticker: str, timings: list):
+        with self._lock:
+            self._rows.extend((ticker, *timing) for timing in timings)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        with self._lock:
+            rows = list(self._rows)
+        return pd.DataFrame(rows, columns=["ticker", "stage", "wall_s", "cpu_s", "alloc_mb"])
+
+    def stage_table(self) -> pd.DataFrame:
+        """
+        Totals per stage, slowest first.
+        """
+        frame = self.frame
+        grouped = frame.groupby("stage")
+        table = pd.DataFrame({
+            "calls": grouped.size(),
+            "wall_s": grouped["wall_s"].sum(),
+            "mean_ms": grouped["wall_s"].mean() * 1000,
+            "p99_ms": grouped["wall_s"].quantile(0.99) * 1000,
+            "max_ms": grouped["wall_s"].max() * 1000,
+            "cpu_s": grouped["cpu_s"].sum(),
+            "peak_alloc_mb": grouped["alloc_mb"].max(),
+        })
+        table["cpu_share"] = table["cpu_s"] / table["wall_s"]
+        return table.sort_values("wall_s", ascending=False)
+
+    def ticker_table(self, n: int = 10) -> pd.DataFrame:
+        """
+        The n slowest tickers with their slowest stage.
+        """
+        frame = self.frame
+        if frame.empty:
+            return pd.DataFrame(columns=["wall_s", "cpu_s", "slowest_stage", "slowest_stage_s"])
+        grouped = frame.groupby("ticker")
+        slowest = frame.loc[grouped["wall_s"].idxmax()].set_index("ticker")
+        table = pd.DataFrame({
+            "wall_s": grouped["wall_s"].sum(),
+            "cpu_s": grouped["cpu_s"].sum(),
+            "slowest_stage": slowest["stage"],
+            "slowest_stage_s": slowest["wall_s"],
+        })
+        return table.sort_values("wall_s", ascending=False).head(n)
@@ -1,3 +1,4 @@
+import json
 from typing import Any, Dict
 
 import pandas as pd
@@ -19,4 +20,21 @@ class FundamentalData:
             "cash_flow": cashflow
         }
         self.ticker: str = self.info.get("symbol")
-        self.quote_type: str = self.info.get("quoteType")
\ No newline at end of file
+        self.quote_type: str = self.info.get("quoteType")
+
+    def to_payload(self) -> Dict[str, Any]:
+        """JSON-serializable form (statements in pandas 'split' orientation)."""
+        payload: Dict[str, Any] = {"info": json.loads(json.dumps(self.info, default=str))}
+        for name, df in self.statements.items():
+            payload[name] = json.loads(df.to_json(orient="split", date_format="iso"))
+        return payload
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "FundamentalData":
+        """Inverse of to_payload."""
+        statements = []
+        for name in ("income_statement", "balance_sheet", "cash_flow"):
+            split = payload.get(name) or {"index": [], "columns": [], "data": []}
+            statements.append(pd.DataFrame(split["data"], index=split["index"],
+                                           columns=pd.to_datetime(split["columns"]), dtype=float))
+        return cls(payload.get("info", {}), *statements)
\ No newline at end of file
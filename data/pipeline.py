@@ -1,31 +1,139 @@
 import os
+import re
+import sys
+import asyncio
+import contextlib
+import cProfile
 import datetime
 import json
+import queue
+import threading
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator
 
+import numpy as np
 import pandas as pd
 
-from data.logger import Logger
+from data.instrumentation import Instrumentation
+from data.report import Report, ResultsSink
 from data.connector.price import YahooPriceConnector
 from data.connector.fundamental import YahooFundamentalsConnector
-from analytics.ec_metric_processor import FundamentalProcessor
+from data.connector.cache import CachedConnector
+from data.connector.price_store import PriceStore
+from data.connector.rate_limit import TokenBucket
+from analytics.ec_metric_processor import FundamentalProcessor, PanelFundamentalProcessor
 from analytics.price_analytics import PriceAnalytics
-from analytics.valuation import DCFModel, DCFAssumptions
+from analytics.valuation import DCFModel, DCFAssumptions, DCF_INPUT_FIELDS
+from analytics.monte_carlo import MonteCarloDCF, Normal
 from data.models.fundamental_data import FundamentalData
-from data.plotter import Plotter
+from data.plotter import Plotter, RenderQueue
+from data.results import ResultsTable
+from data.sector_stats import SectorStatsIndex
+from data.stage_cache import StageCache
 
 
 class AnalysisPipeline:
     """
     Orchestrates full equity analysis in small, testable steps.
     """
-    def __init__(self, output_path: str | None = None, show_plt: bool = False, config_path: str="config.json", overrides: dict = None):
+
+    # Info fields the statement metrics depend on (part of the fundamental_metrics stage key)
+    METRIC_INFO_FIELDS = ("symbol", "quoteType", "sharesOutstanding")
+    DCF_DEFAULTS = {
+        "revenue_growth_5y": 0.05,
+        "operating_margin_target": 0.20,
+        "tax_rate": 0.21,
+        "wacc": 0.08,
+        "terminal_growth": 0.03
+    }
+    # Sector assumptions (extended / replaced by an optional "sectors" config section); with a peer statistics
+    # index, growth and margin come from the sector's or industry's actual companies instead
+    SECTOR_DEFAULTS = {
+        "Technology": {"revenue_growth_5y": 0.15, "operating_margin_target": 0.30, "wacc": 0.10},
+        "Consumer Defensive": {"revenue_growth_5y": 0.04, "operating_margin_target": 0.20, "wacc": 0.065},
+        "Healthcare": {"revenue_growth_5y": 0.06, "operating_margin_target": 0.25, "wacc": 0.08},
+        "Energy": {"revenue_growth_5y": 0.03, "operating_margin_target": 0.15, "wacc": 0.09},
+    }
+    # Market-implied assumptions solved by reverse DCF -> results column
+    IMPLIED_FIELDS = {"gr_next5y": "implied_growth", "operating_margin_target": "implied_margin", "wacc": "implied_wacc"}
+
+    def __init__(self, output_path: str | None = None, show_plt: bool = False, config_path: str="config.json", overrides: dict = None,
+                 mc_samples: int | None = None, cache_dir: str | None = None, offline: bool = False,
+                 plots: str = "all", render_workers: int = 0, warehouse_dir: str | None = None,
+                 stage_cache_dir: str | None = None, outputs: tuple[str, ...] = ("text",), quiet: bool = False,
+                 instrument: bool = False, profile_dir: str | None = None, price_panel_dir: str | None = None,
+                 sector_stats_dir: str | None = None, stage_cache_max_age_days: float | None = 30,
+                 stage_cache_max_mb: float | None = None):
         self.show_plt = show_plt
+        self.plots = plots
+        self.render_workers = render_workers
+        self._render_queue: RenderQueue | None = None
         self.output_path = output_path
+        # Report outputs: "text" (per-ticker text report) and the structured ResultsSink formats
+        unknown = set(outputs) - {"text", *ResultsSink.FORMATS}
+        if unknown:
+            raise ValueError(f"Unknown outputs: {sorted(unknown)}")
+        self.outputs = tuple(outputs)
+        self.quiet = quiet
+        self._sink: ResultsSink | None = None
+        self._print_lock = threading.Lock()
+        # Per-stage timings (off by default: stages then run under a no-op context); profile_dir adds
+        # cProfile / tracemalloc dumps
+        self.profile_dir = profile_dir
+        self.instrumentation = Instrumentation() if instrument or profile_dir is not None else None
+        self._async_connectors: list = []
+        self.config_path = config_path
         self.config = self._load_config(config_path)
         self.overrides = overrides or {}
+        # DCF assumption sources, resolved once (see _resolve_dcf_config)
+        self.dcf_defaults = self.config.get("dcf", self.DCF_DEFAULTS)
+        self.sector_defaults = {**self.SECTOR_DEFAULTS, **self.config.get("sectors", {})}
+        self.sector_stats_dir = sector_stats_dir
+        self.sector_stats = SectorStatsIndex(sector_stats_dir) if sector_stats_dir is not None else None
+        self.mc_samples = mc_samples
+        self.offline = offline
         # Shared services
-        self.price_connector = YahooPriceConnector()
-        self.fundamental_connector = YahooFundamentalsConnector()
+        price_store = PriceStore(os.path.join(cache_dir, "price_history")) if cache_dir is not None else None
+        rate_cfg = self.config.get("rate_limit", {})
+        limiter = TokenBucket(rate_cfg.get("requests_per_second", 1.0), rate_cfg.get("burst", 1.0))
+        retries = rate_cfg.get("retries", 3)
+        self.batch_size = rate_cfg.get("batch_size", 100)
+        self.price_connector = YahooPriceConnector(store=price_store, limiter=limiter, retries=retries,
+                                                   batch_size=self.batch_size)
+        self.fundamental_connector = YahooFundamentalsConnector(limiter=limiter, retries=retries)
+        self.warehouse_dir = warehouse_dir
+        # Data fetched ahead of the per-ticker analysis (value, or the Exception raised while fetching it)
+        self._prefetched_prices: dict[str, pd.DataFrame | Exception] = {}
+        self._prefetched_fundamentals: dict[str, FundamentalData | Exception] = {}
+        # Per-ticker results of this run, saved to the screening table (ResultsTable) at the end
+        self.results: list[dict] = []
+        # Stage outputs memoized by input content, so re-runs only recompute what changed (<cache_dir>/stages)
+        if stage_cache_dir is None and cache_dir is not None:
+            stage_cache_dir = os.path.join(cache_dir, "stages")
+        self.stage_cache = StageCache(stage_cache_dir) if stage_cache_dir is not None else None
+        # Entries unused for this many days / beyond this size are pruned after each run
+        self.stage_cache_max_age_days = stage_cache_max_age_days
+        self.stage_cache_max_mb = stage_cache_max_mb
+        self._stage_cache_pruned = (0, 0)
+        if cache_dir is not None or offline:
+            self.price_connector = self._cached(self.price_connector, "prices", cache_dir, offline)
+        if warehouse_dir is not None:
+            # The warehouse persists statements itself; offline, only stored companies are served
+            from data.connector.warehouse import FundamentalsWarehouse, WarehouseFundamentalsConnector
+            self.fundamental_connector = WarehouseFundamentalsConnector(
+                FundamentalsWarehouse(warehouse_dir), source=None if offline else self.fundamental_connector
+            )
+        elif cache_dir is not None or offline:
+            self.fundamental_connector = self._cached(self.fundamental_connector, "fundamentals", cache_dir, offline)
+        self.price_panel_dir = price_panel_dir
+        if price_panel_dir is not None:
+            # Daily prices served from the memory-mapped panel, which replaces the price cache / PriceStore of
+            # cache_dir (statements are still cached); offline, only stored tickers are served
+            from data.connector.price_panel import PricePanel, PanelPriceConnector
+            source = None if offline else YahooPriceConnector(limiter=limiter, retries=retries, batch_size=self.batch_size)
+            self.price_connector = PanelPriceConnector(PricePanel(price_panel_dir), source=source)
         self.dcf_model = DCFModel()
 
     def _load_config(self, path: str) -> dict:
@@ -36,62 +144,590 @@ class AnalysisPipeline:
             print(f"{path} not found. Using defaults.")
             return {}
 
+    def _cached(self, connector, data_type: str, cache_dir: str | None, offline: bool) -> CachedConnector:
+        cache_cfg = self.config.get("cache", {})
+        return CachedConnector(
+            connector,
+            data_type,
+            cache_dir=cache_dir,
+            ttl=cache_cfg.get("ttl", {}).get(data_type),
+            stale_ttl=cache_cfg.get("stale_ttl", {}).get(data_type),
+            offline=offline
+        )
+
     # =====================================================
     # Public API
     # =====================================================
-    def run(self, tickers: list[str]):
+    def run(self, tickers: list[str], workers: int = 1, io_workers: int = 4):
+        """
+        Analyzes all tickers. With workers > 1, fetching runs in a thread pool (io_workers threads) and the
+        analysis, valuation and plotting run in a pool of worker processes.
+        """
         print("ANALYSIS STARTED:")
-        for ticker in tickers:
-            self._analyze_ticker(ticker.upper())
+        tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        profiler = self._start_profiling()
+        self._open_sink()
+        if self.instrumentation is not None:
+            # Stage memory is only meaningful without other threads allocating (worker processes record their own)
+            self.instrumentation.memory = workers <= 1
+        if workers > 1:
+            self._run_concurrent(tickers, workers, io_workers)
+        else:
+            self._start_rendering()
+            for batch in self._batches(tickers):
+                self._prefetch_prices(batch)
+                for ticker in batch:
+                    self._finish_ticker(*self._analyze_ticker(ticker))
+            self._finish_rendering()
+        self._close_sink()
+        self._save_results()
+        self._prune_stage_cache()
+        self._stop_profiling(profiler)
+        self._print_summary()
+
+    def run_async(self, tickers: list[str]):
+        """
+        Same analysis as run(), with data fetched through the asyncio connectors. Configured by an optional
+        "async" config section: price_url / fundamentals_url (e.g. a local stand-in server), max_concurrency,
+        timeout, retries. Without fundamentals_url, statements come from the regular connector in threads.
+        Data held by the cache (cache_dir) or the warehouse is served from there and only the misses are
+        requested; offline, misses are not requested at all. The price panel has no asyncio path.
+        """
+        if self.price_panel_dir is not None:
+            raise ValueError("The price panel is not supported with async fetching, use run()")
+        asyncio.run(self._run_async(list(dict.fromkeys(ticker.upper() for ticker in tickers))))
+
+    def backtest(self, tickers: list[str], filing_lag_days: int | None = None, io_workers: int = 4) -> pd.DataFrame:
+        """
+        Point-in-time DCF backtest of the tickers over their statement history (see analytics.backtest.DCFBacktest),
+        with each ticker's sector assumptions from the config. Peer statistics (sector_stats_dir) are not used:
+        they are derived from today's statements and would leak later data into past valuations. Options come from an optional "backtest" config section
+        (filing_lag_days, horizons, max_entry_gap_days, min_names). Prints and returns the hit rate and rank IC
+        per forward return horizon, and saves backtest.csv (one row per ticker and fiscal period) and
+        backtest_summary.csv to output_path.
+        """
+        from analytics.backtest import DCFBacktest
+
+        print("BACKTEST STARTED:")
+        fundamentals = self._fetch_fundamentals_many(tickers, io_workers)
+        try:
+            prices = self.price_connector.fetch_many(list(fundamentals))
+        except Exception as e:
+            print(f"Price download failed: {e}")
+            return pd.DataFrame()
+        if not prices:
+            print("No price data for the backtest.")
+            return pd.DataFrame()
+        for ticker, reason in self._missing_prices(set(fundamentals) - set(prices)).items():
+            print(f"{ticker}: no price data ({reason}), left out of the backtest")
+
+        history = PanelFundamentalProcessor.from_fundamentals(fundamentals).get_history()
+        dcf_config = pd.DataFrame.from_dict(
+            {t: self._resolve_dcf_config(data.info.get("sector", "Unknown"), data.info.get("industry"), peers=False)
+             for t, data in fundamentals.items()},
+            orient="index"
+        )
+        backtest_cfg = dict(self.config.get("backtest", {}))
+        if filing_lag_days is not None:
+            backtest_cfg["filing_lag_days"] = filing_lag_days
+        # Labelled here: frames served by the price panel have no Ticker column
+        prices = pd.concat([data[["Date", "Close", *(["Stock Splits"] if "Stock Splits" in data else [])]]
+                            .assign(Ticker=ticker) for ticker, data in prices.items()], ignore_index=True)
+        if "Stock Splits" not in prices:
+            print("Prices without split events (e.g. from the price panel): reported share counts are not "
+                  "split-adjusted.")
+        backtest = DCFBacktest(history, prices, dcf_config, **backtest_cfg)
+        results, summary = backtest.run(), backtest.summary()
+        print(f"\nPoint-in-time valuations: {len(results)} ({results['Ticker'].nunique()} tickers, "
+              f"filing lag {backtest.filing_lag_days} days)")
+        print("Assumptions: config sector defaults and overrides at every date. Peer statistics are not used (they "
+              "come from today's statements); sectors and the ticker list are today's.")
+        print(summary.round(3).to_string())
+        if self.output_path is not None:
+            os.makedirs(self.output_path, exist_ok=True)
+            results.to_csv(os.path.join(self.output_path, "backtest.csv"), index=False)
+            summary.to_csv(os.path.join(self.output_path, "backtest_summary.csv"))
+            print(f"Backtest saved in: ./{self.output_path}/")
+        return summary
+
+    def refresh_sector_stats(self, tickers: list[str], io_workers: int = 4) -> pd.DataFrame:
+        """
+        Adds the tickers' statements to the peer statistics index (see data.sector_stats.SectorStatsIndex);
+        companies whose statements did not change since the last refresh are not reprocessed. Prints and
+        returns the sector table.
+        """
+        if self.sector_stats is None:
+            raise ValueError("No sector statistics index configured (sector_stats_dir)")
+        fundamentals = self._fetch_fundamentals_many(tickers, io_workers)
+        updated = self.sector_stats.update(fundamentals)
+        print(f"Sector statistics: {updated} of {len(fundamentals)} companies updated, "
+              f"{len(self.sector_stats)} in the index")
+        table = self.sector_stats.table("sector")
+        print(table.round(3).to_string())
+        return table
+
+    def close(self):
+        """
+        Stops the background refresh threads of the cached connectors. The pipeline is also a context manager.
+        """
+        for connector in (self.price_connector, self.fundamental_connector):
+            if isinstance(connector, CachedConnector):
+                connector.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _start_rendering(self):
+        # Charts are rendered by a process pool while the next tickers are analyzed
+        if self.render_workers > 0 and self.plots != "none" and not self.show_plt and self.output_path is not None:
+            self._render_queue = RenderQueue(self.render_workers)
+
+    def _finish_rendering(self):
+        if self._render_queue is not None:
+            for failure in self._render_queue.close():
+                print(f"Rendering failed: {failure}")
+            self._render_queue = None
+
+    def _open_sink(self):
+        formats = [name for name in self.outputs if name in ResultsSink.FORMATS]
+        if self.output_path is not None and formats:
+            self._sink = ResultsSink(self.output_path, tuple(formats))
+
+    def _close_sink(self):
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def _finish_ticker(self, report: Report, record: dict | None):
+        # Collects a finished ticker: screening row, structured records and (unless quiet) the terminal text
+        if record is not None:
+            self.results.append(record)
+        if self.instrumentation is not None:
+            self.instrumentation.collect(report.ticker, report.timings)
+        if self._sink is not None:
+            self._sink.add(report)
+        if not self.quiet:
+            with self._print_lock:
+                sys.stdout.write(report.text())
+                sys.stdout.flush()
+
+    def _print_failure(self, ticker: str, message: str):
+        with self._print_lock:
+            sys.stdout.write(f"{ticker}: {message}\n")
+            sys.stdout.flush()
+
+    def _save_results(self):
+        if self.output_path is not None and self.results:
+            ResultsTable(self.output_path).upsert(self.results)
+
+    def _stage(self, stage: str, inputs: tuple, compute, report: Report | None = None):
+        # Memoized on disk by input content when the stage cache is enabled. With a report, the notes the stage
+        # logs to it are stored with the output and replayed on a hit, so cached and cold reports match
+        if self.stage_cache is None:
+            return compute()
+        if report is None:
+            return self.stage_cache.memo(stage, inputs, compute)
+        start = len(report.entries)
+        computed = False
+
+        def compute_with_notes():
+            nonlocal computed
+            computed = True
+            value = compute()
+            return (value, report.entries[start:]) if value is not None else None
+
+        stored = self.stage_cache.memo(stage, inputs, compute_with_notes)
+        if stored is None:
+            return None
+        value, notes = stored
+        if not computed:
+            report.entries.extend(notes)
+        return value
+
+    def _prune_stage_cache(self):
+        if self.stage_cache is not None and (self.stage_cache_max_age_days is not None
+                                             or self.stage_cache_max_mb is not None):
+            max_bytes = int(self.stage_cache_max_mb * 1024 ** 2) if self.stage_cache_max_mb is not None else None
+            self._stage_cache_pruned = self.stage_cache.prune(self.stage_cache_max_age_days, max_bytes)
+
+    def _timed(self, timings: list, stage: str):
+        if self.instrumentation is None:
+            return contextlib.nullcontext()
+        return self.instrumentation.measure(timings, stage)
+
+    def _plot(self, report: Report, chart: str, *args):
+        if self.plots == "none" or (self.plots == "summary" and chart not in Plotter.SUMMARY_CHARTS):
+            return
+        with self._timed(report.timings, chart):
+            self._draw(chart, *args)
+
+    def _draw(self, chart: str, *args):
+        # Charts are files: skip rendering when the chart at this path was last drawn from the same inputs
+        output_path, ticker = args[-2], args[-1]
+        cached = self.stage_cache is not None and output_path is not None and not self.show_plt
+        if cached:
+            path = Plotter.chart_path(chart, output_path, ticker)
+            inputs_key = self.stage_cache.key(chart, *args, Plotter.max_points)
+            if self.stage_cache.is_current(chart, path, inputs_key):
+                return
+        if self._render_queue is not None:
+            # Marked once the chart is written: a failed render must not make an older file look current
+            on_success = (lambda: self.stage_cache.mark(chart, path, inputs_key)) if cached else None
+            self._render_queue.submit(chart, *args, on_success=on_success)
+            return
+        getattr(Plotter, chart)(*args, self.show_plt)
+        if cached:
+            self.stage_cache.mark(chart, path, inputs_key)
+
+    def _print_summary(self):
         print("\nANALYSIS FINISHED.")
+        for connector in (self.price_connector, self.fundamental_connector):
+            if isinstance(connector, CachedConnector):
+                print(f"Cache ({connector.data_type}): {connector.stats}")
+        if self.stage_cache is not None and any(self.stage_cache.stats.values()):
+            print(f"Stage cache: {self.stage_cache.stats}")
+        if self._stage_cache_pruned[0]:
+            print(f"Stage cache: pruned {self._stage_cache_pruned[0]} entries "
+                  f"({self._stage_cache_pruned[1] / 1024 ** 2:.1f} MB)")
         if self.output_path is not None:
             print(f"Reports saved in: ./{self.output_path}/")
+        if self.instrumentation is not None:
+            self._print_timings()
+
+    def _print_timings(self):
+        with pd.option_context("display.width", 200, "display.max_columns", 20):
+            print("\nStage timings (wall / CPU seconds, peak Python allocations with --profile where stages do not "
+                  "overlap other threads):")
+            print(self.instrumentation.stage_table().round(3).to_string())
+            print("\nSlowest tickers:")
+            print(self.instrumentation.ticker_table().round(3).to_string())
+            requests = self._request_stats()
+            if not requests.empty:
+                print("\nData provider requests:")
+                print(requests.round(1).to_string())
+        if self.profile_dir is not None:
+            print(f"\nProfile saved in: {self.profile_dir}/ (pipeline.prof for pstats / snakeviz, "
+                  f"tracemalloc.snapshot, timings.csv)")
+
+    def _request_stats(self) -> pd.DataFrame:
+        # Latency and retries per data provider connector, looking through caching / warehouse wrappers
+        rows = {}
+        for connector in (self.price_connector, self.fundamental_connector, *self._async_connectors):
+            while connector is not None and not hasattr(connector, "request_stats"):
+                connector = getattr(connector, "connector", None) or getattr(connector, "source", None)
+            if connector is not None and connector.request_stats.requests:
+                rows[type(connector).__name__] = connector.request_stats.summary()
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+    def _start_profiling(self) -> cProfile.Profile | None:
+        if self.profile_dir is None:
+            return None
+        tracemalloc.start()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _stop_profiling(self, profiler: cProfile.Profile | None):
+        if profiler is None:
+            return
+        profiler.disable()
+        os.makedirs(self.profile_dir, exist_ok=True)
+        profiler.dump_stats(os.path.join(self.profile_dir, "pipeline.prof"))
+        tracemalloc.take_snapshot().dump(os.path.join(self.profile_dir, "tracemalloc.snapshot"))
+        tracemalloc.stop()
+        self.instrumentation.frame.to_csv(os.path.join(self.profile_dir, "timings.csv"), index=False)
+
+    async def _run_async(self, tickers: list[str]):
+        print("ANALYSIS STARTED:")
+        profiler = self._start_profiling()
+        if self.instrumentation is not None:
+            self.instrumentation.memory = False  # Next batch is fetched while a ticker is analyzed
+        from data.connector.async_http import AsyncYahooPriceConnector, AsyncFundamentalsConnector  # aiohttp
+
+        async_cfg = self.config.get("async", {})
+        options = {
+            "max_concurrency": async_cfg.get("max_concurrency", 10),
+            "timeout": async_cfg.get("timeout", 10.0),
+            "retries": async_cfg.get("retries", 3),
+        }
+        price_connector = AsyncYahooPriceConnector(
+            async_cfg.get("price_url", "https://query1.finance.yahoo.com"), **options
+        )
+        fundamental_connector = AsyncFundamentalsConnector(
+            async_cfg.get("fundamentals_url"), sync_connector=self.fundamental_connector, **options
+        )
+        self._async_connectors = [price_connector, fundamental_connector]
+
+        async def fetch_one(ticker: str) -> tuple:
+            prices, fundamentals = await asyncio.gather(
+                self._fetch_local_first(self.price_connector, price_connector, ticker),
+                self._fetch_local_first(self.fundamental_connector, fundamental_connector, ticker)
+                if fundamental_connector.use_http else fundamental_connector.fetch(ticker),
+                return_exceptions=True
+            )
+            return ticker, prices, fundamentals
+
+        async def fetch_batch(batch: list[str]) -> list[tuple]:
+            return await asyncio.gather(*(fetch_one(ticker) for ticker in batch))
+
+        self._open_sink()
+        self._start_rendering()
+        async with price_connector, fundamental_connector:
+            batches = self._batches(tickers)
+            pending = asyncio.create_task(fetch_batch(batches[0])) if batches else None
+            for i in range(len(batches)):
+                fetched = await pending
+                # Next batch is fetched while the current one is analyzed
+                pending = asyncio.create_task(fetch_batch(batches[i + 1])) if i + 1 < len(batches) else None
+                for ticker, prices, fundamentals in fetched:
+                    self._prefetched_prices[ticker] = prices
+                    self._prefetched_fundamentals[ticker] = fundamentals
+                    if self.show_plt:
+                        self._finish_ticker(*self._analyze_ticker(ticker))  # Interactive plots need the main thread
+                    else:
+                        self._finish_ticker(*await asyncio.to_thread(self._analyze_ticker, ticker))
+        await asyncio.to_thread(self._finish_rendering)
+        self._close_sink()
+        self._save_results()
+        self._prune_stage_cache()
+        self._stop_profiling(profiler)
+        self._print_summary()
+
+    async def _fetch_local_first(self, local, remote, ticker: str):
+        # Stored data of the sync connector (cache, warehouse) first; misses from the asyncio connector, stored back
+        value = await asyncio.to_thread(self._read_local, local, ticker)
+        if value is not None:
+            return value
+        if self.offline:
+            raise LookupError(f"Offline mode: no stored data for {ticker}")
+        value = await remote.fetch(ticker)
+        await asyncio.to_thread(self._write_local, local, ticker, value)
+        return value
+
+    @staticmethod
+    def _read_local(connector, ticker: str):
+        from data.connector.warehouse import WarehouseFundamentalsConnector
+
+        if isinstance(connector, CachedConnector):
+            return connector.peek(ticker)
+        if isinstance(connector, WarehouseFundamentalsConnector):
+            return connector.warehouse.read(ticker)
+        return None
+
+    @staticmethod
+    def _write_local(connector, ticker: str, value):
+        from data.connector.warehouse import WarehouseFundamentalsConnector
+
+        if isinstance(connector, CachedConnector):
+            connector.put(value, ticker)
+        elif isinstance(connector, WarehouseFundamentalsConnector):
+            connector.warehouse.put(ticker, value)
+
+    def _batches(self, tickers: list[str]) -> list[list[str]]:
+        return [tickers[i:i + self.batch_size] for i in range(0, len(tickers), self.batch_size)]
+
+    def _prefetch_prices(self, tickers: list[str]):
+        # Bulk download (batched requests) instead of one request per ticker
+        if len(tickers) < 2 or not hasattr(self.price_connector, "fetch_many"):
+            return
+        timings = []
+        try:
+            with self._timed(timings, "prefetch_prices"):
+                prices = self.price_connector.fetch_many(tickers)
+        except Exception as e:
+            print(f"Bulk price download failed, falling back to per-ticker requests: {e}")
+        else:
+            # Tickers left out were already retried by the connector: reported, not requested again
+            self._prefetched_prices.update(prices)
+            for ticker, reason in self._missing_prices(set(tickers) - set(prices)).items():
+                self._prefetched_prices[ticker] = LookupError(f"No price data returned for {ticker} ({reason})")
+        if self.instrumentation is not None:
+            self.instrumentation.collect(f"(batch of {len(tickers)})", timings)
+
+    def _missing_prices(self, tickers: set[str]) -> dict[str, str]:
+        # Why the price connector left tickers out of a bulk download, looking through caching / panel wrappers
+        connector = self.price_connector
+        while connector is not None and not hasattr(connector, "missing"):
+            connector = getattr(connector, "connector", None) or getattr(connector, "source", None)
+        missing = connector.missing if connector is not None else {}
+        return {ticker: missing.get(ticker, "not available") for ticker in sorted(tickers)}
+
+    def _get_prices(self, ticker: str) -> pd.DataFrame:
+        prices = self._prefetched_prices.pop(ticker, None)
+        if isinstance(prices, Exception):
+            raise prices
+        return prices if prices is not None else self.price_connector.fetch(ticker)
+
+    def _get_fundamentals(self, ticker: str) -> FundamentalData:
+        fundamentals = self._prefetched_fundamentals.pop(ticker, None)
+        if isinstance(fundamentals, Exception):
+            raise fundamentals
+        return fundamentals if fundamentals is not None else self.fundamental_connector.fetch(ticker)
+
+    # =====================================================
+    # Concurrent execution
+    # =====================================================
+    def _run_concurrent(self, tickers: list[str], workers: int, io_workers: int):
+        if self.show_plt:
+            print("Interactive plots are not available with --workers > 1, plots are only saved.")
+        # Bounded queue between the I/O and CPU stages: fetchers block once 'workers * 2' tickers are waiting
+        fetched: queue.Queue = queue.Queue(maxsize=workers * 2)
+        in_flight = threading.BoundedSemaphore(workers * 2)
+        # Set when the run ends, so fetchers of an aborted run stop instead of blocking on the full queue
+        stopped = threading.Event()
+
+        def fetch_batch(batches: Iterator[list[str]]):
+            # One bulk price request per batch, then the batch's tickers are fetched by all I/O threads; the next
+            # batch is queued behind them, so its prices download while these statements are fetched
+            batch = next(batches, None) if not stopped.is_set() else None
+            if batch is None:
+                return
+            self._prefetch_prices(batch)
+            for ticker in batch:
+                io_pool.submit(fetch_ticker, ticker)
+            io_pool.submit(fetch_batch, batches)
+
+        def fetch_ticker(ticker: str):
+            if stopped.is_set():
+                return
+            result = self._fetch_ticker(ticker)
+            while not stopped.is_set():
+                try:
+                    fetched.put(result, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def report_done(ticker: str, future: Future):
+            try:
+                self._finish_ticker(*future.result())
+            except BrokenProcessPool:
+                # A worker process died (e.g. killed for memory): every ticker it had in flight is reported
+                # failed, the next submit replaces the pool
+                self._print_failure(ticker, "worker process died before this ticker was finished")
+            except Exception as e:  # Result could not be sent back or collected
+                self._print_failure(ticker, f"Unexpected pipeline failure: {e}")
+            in_flight.release()
+
+        settings = {
+            "output_path": self.output_path,
+            "config_path": self.config_path,
+            "overrides": self.overrides,
+            "mc_samples": self.mc_samples,
+            "plots": self.plots,
+            "instrument": self.instrumentation is not None,
+            "profile_dir": self.profile_dir,
+            "outputs": self.outputs,
+            "quiet": self.quiet,
+            "stage_cache_dir": self.stage_cache.root if self.stage_cache is not None else None,
+            "price_panel_dir": self.price_panel_dir,
+            "sector_stats_dir": self.sector_stats_dir,
+        }
+        def new_pool() -> ProcessPoolExecutor:
+            return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(settings,))
+
+        with ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="fetch") as io_pool:
+            cpu_pool = new_pool()
+            try:
+                io_pool.submit(fetch_batch, iter(self._batches(tickers)))
+                for _ in tickers:
+                    ticker, prices, fundamentals = fetched.get()
+                    in_flight.acquire()
+                    try:
+                        future = cpu_pool.submit(_analyze_in_worker, ticker, prices, fundamentals)
+                    except BrokenProcessPool:
+                        cpu_pool.shutdown(wait=False)
+                        cpu_pool = new_pool()
+                        future = cpu_pool.submit(_analyze_in_worker, ticker, prices, fundamentals)
+                    future.add_done_callback(lambda f, t=ticker: report_done(t, f))
+            finally:
+                stopped.set()
+                cpu_pool.shutdown()
+
+    def _fetch_ticker(self, ticker: str) -> tuple:
+        # Runs in the I/O stage; failures are passed on so they are reported in the ticker's own report
+        prices = self._fetch_ticker_part(ticker, self._get_prices)
+        if self.price_panel_dir is not None and not isinstance(prices, Exception):
+            prices = None  # Stored in the panel: workers map its pages instead of receiving a pickled copy
+        return ticker, prices, self._fetch_ticker_part(ticker, self._get_fundamentals)
+
+    @staticmethod
+    def _fetch_ticker_part(ticker: str, fetch):
+        try:
+            return fetch(ticker)
+        except Exception as e:
+            return RuntimeError(str(e))  # Plain exception type, always picklable
+
+    def _fetch_fundamentals_many(self, tickers: list[str], io_workers: int) -> dict[str, FundamentalData]:
+        # Statements of many tickers fetched in a thread pool; failures are reported and left out
+        tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        with ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="fetch") as pool:
+            fetched = dict(zip(tickers, pool.map(
+                lambda t: self._fetch_ticker_part(t, self._get_fundamentals), tickers)))
+        fundamentals = {}
+        for ticker, data in fetched.items():
+            if isinstance(data, Exception):
+                print(f"{ticker}: Fundamentals not available: {data}")
+            else:
+                fundamentals[ticker] = data
+        return fundamentals
 
     # =====================================================
     # Per-ticker pipeline
     # =====================================================
-    def _analyze_ticker(self, ticker: str):
-        logger = self._create_logger(ticker)
+    def _analyze_ticker(self, ticker: str) -> tuple[Report, dict | None]:
+        report = self._create_report(ticker)
+        # Screening fields collected along the way (see ResultsTable)
+        record = {"ticker": ticker}
         try:
-            self._write_header(logger, ticker)
-            prices = self._run_price_analysis(logger, ticker)
-            self._run_fundamental_analysis(prices, logger, ticker)
+            self._write_header(report, ticker)
+            prices = self._run_price_analysis(report, ticker, record)
+            self._run_fundamental_analysis(prices, report, ticker, record)
         except Exception as e:
-            logger.log(f"Unexpected pipeline failure: {e}")
-        finally:
-            logger.close()
+            report.log(f"Unexpected pipeline failure: {e}")
+        if "text" in self.outputs and report.log_dir is not None:
+            report.save_text(os.path.join(report.log_dir, f"{ticker}_report.txt"))
+        if not self.quiet:
+            report.text()  # Rendered here, so worker processes hand back finished text
+        return report, record if len(record) > 1 else None
 
     # =====================================================
     # Setup
     # =====================================================
-    def _create_logger(self, ticker: str) -> Logger:
-        path = os.path.join(self.output_path, ticker, f"{ticker}_report.txt") if self.output_path else None
-        return Logger(path)
+    def _create_report(self, ticker: str) -> Report:
+        return Report(ticker, os.path.join(self.output_path, ticker) if self.output_path else None)
 
     @staticmethod
-    def _write_header(logger: Logger, ticker: str):
+    def _write_header(report: Report, ticker: str):
 
-        logger.section(
+        report.section(
             f"Ticker: {ticker}\nRun Time: {datetime.datetime.now()}"
         )
 
     # =====================================================
     # Price Analysis
     # =====================================================
-    def _run_price_analysis(self, logger: Logger, ticker: str) -> pd.DataFrame | None:
-        logger.subsection("Risk and Performance Metrics")
+    def _run_price_analysis(self, report: Report, ticker: str, record: dict) -> pd.DataFrame | None:
+        report.subsection("Risk and Performance Metrics")
         try:
-            prices = self.price_connector.fetch(ticker)
-            analysis = PriceAnalytics(prices)
-            summary = analysis.summary()
-            logger.log(summary)
+            with self._timed(report.timings, "fetch_prices"):
+                prices = self._get_prices(ticker)
+            with self._timed(report.timings, "price_analytics"):
+                summary = self._stage("price_summary", (prices,),
+                                      lambda: PriceAnalytics(prices, lean=True).summary())
+            report.add("risk_summary", summary)
+            record["current_price"] = float(prices["Close"].iloc[-1])
+            record.update({_field_name(name): float(value) for name, value in summary.items()})
             # Price MA plot
-            Plotter.plot_price_ma(prices, logger.log_dir, ticker, self.show_plt)
+            self._plot(report, "plot_price_ma", prices, report.log_dir, ticker)
             return prices
 
         except Exception as e:
 
-            logger.log(f"Price analysis failed {e}")
+            report.log(f"Price analysis failed {e}")
             return None
 
     # =====================================================
@@ -100,74 +736,188 @@ class AnalysisPipeline:
     def _run_fundamental_analysis(
         self,
         prices: pd.DataFrame,
-        logger: Logger,
-        ticker: str
+        report: Report,
+        ticker: str,
+        record: dict
     ) -> None:
-        logger.subsection("\nFundamental Analysis:")
-        fundamentals: FundamentalData = self.fundamental_connector.fetch(ticker)
-        processor = FundamentalProcessor(fundamentals, logger)
-        metrics = processor.get_metrics()
+        report.subsection("\nFundamental Analysis:")
+        with self._timed(report.timings, "fetch_fundamentals"):
+            fundamentals: FundamentalData = self._get_fundamentals(ticker)
+        with self._timed(report.timings, "fundamental_metrics"):
+            metrics, latest = self._stage(
+                "fundamental_metrics",
+                (fundamentals.statements, {field: fundamentals.info.get(field) for field in self.METRIC_INFO_FIELDS}),
+                lambda: self._process_fundamentals(fundamentals, report),
+                report
+            ) or (None, None)
         if metrics is not None:
-            logger.subsection(f"Key Metrics for {ticker} (Last 5 years)")
-            logger.log(metrics[["Revenue", "NOPAT", "ROIC", "FCF"]].tail(5))
-            latest = processor.get_latest_data()
+            report.subsection(f"Key Metrics for {ticker} (Last 5 years)")
+            report.add("metrics", metrics)
             sector = fundamentals.info.get("sector", "Unknown")
-            final_dcf_cfg = self._resolve_dcf_config(sector)
-            logger.subsection("\nValuation Model (DCF)")
-            logger.log(f"Sector Detected: {sector}")
-            logger.log(f"Assumptions Used: Growth={final_dcf_cfg['revenue_growth_5y']:.1%}, WACC={final_dcf_cfg['wacc']:.1%}, Margin={final_dcf_cfg['operating_margin_target']:.1%}")
-            base_assumptions = DCFAssumptions(
-                name=f"Sector: {sector} + Overrides",
-                gr_next5y=final_dcf_cfg["revenue_growth_5y"],
-                operating_margin_target=final_dcf_cfg["operating_margin_target"],
-                tax_rate=final_dcf_cfg["tax_rate"],
-                wacc=final_dcf_cfg["wacc"],
-                terminal_gr=final_dcf_cfg["terminal_growth"],
-                roic_target=latest["roic"],
-                shares_outst=latest["shares"],
-                net_debt=latest["net_debt"],
-            )
+            final_dcf_cfg = self._resolve_dcf_config(sector, fundamentals.info.get("industry"))
+            record.update({
+                "sector": sector,
+                "revenue": float(latest["rev"]),
+                "nopat": float(latest["nopat"]),
+                "roic": float(latest["roic"]),
+                "growth": float(metrics["Growth"].iloc[-1]),
+                "fcf": float(metrics["FCF"].iloc[-1]),
+                "wacc": final_dcf_cfg["wacc"],
+                "roic_wacc_spread": float(latest["roic"]) - final_dcf_cfg["wacc"],
+            })
+            report.subsection("\nValuation Model (DCF)")
+            report.add("assumptions", {"sector": sector, **final_dcf_cfg})
+            base_assumptions = self._dcf_assumptions(sector, final_dcf_cfg, latest)
             try:
-                result = self.dcf_model.run_dcf(latest["rev"], base_assumptions)
-                logger.log(f"Scenario: {result['scenario']}")
-                logger.log(f"Estimated fair value per share: ${result['share_price']:.2f}")
+                with self._timed(report.timings, "dcf"):
+                    result = self._stage("dcf", (latest["rev"], base_assumptions),
+                                         lambda: self.dcf_model.run_dcf(latest["rev"], base_assumptions))
+                dcf = {name: value for name, value in result.items() if name != "projections"}
+                report.add("dcf", dcf)
+                report.add("projections", result["projections"])
                 intr_val = result['share_price']
+                record["dcf_share_price"] = float(intr_val)
                 curr_price = prices['Close'].iloc[-1]
-                logger.log(f"Current Market Price: ${curr_price:.2f}")
+                dcf["current_price"] = float(curr_price)
                 upside = (intr_val - curr_price) / curr_price
-                logger.log(f"Implied Upside: {upside:.1%}")
+                dcf["upside"] = float(upside)
+                record["upside"] = float(upside)
+                # What the market price implies, one assumption at a time
+                with self._timed(report.timings, "reverse_dcf"):
+                    implied = self._implied_assumptions(latest["rev"], base_assumptions, float(curr_price))
+                report.add("implied", implied)
+                record.update({self.IMPLIED_FIELDS[field]: implied[field] for field in self.IMPLIED_FIELDS})
                 # Revenue / FCF plot
-                Plotter.plot_revenue_fcf(metrics, logger.log_dir, ticker, self.show_plt)
+                self._plot(report, "plot_revenue_fcf", metrics, report.log_dir, ticker)
                 # ROIC vs WACC
-                Plotter.plot_roic_vs_wacc(metrics, base_assumptions.wacc, logger.log_dir, ticker, self.show_plt)
+                self._plot(report, "plot_roic_vs_wacc", metrics, base_assumptions.wacc, report.log_dir, ticker)
                 # Price vs DCF (after DCF calculated)
-                Plotter.plot_price_vs_dcf(prices, intr_val, logger.log_dir, ticker, self.show_plt)
+                self._plot(report, "plot_price_vs_dcf", prices, intr_val, report.log_dir, ticker)
             except Exception as e:
-                logger.log(f"DCF analysis failed: {e}")
-            logger.subsection("Sensitivity Analysis")
-            sensitivity_df = self.dcf_model.run_sensitivity_analysis(latest["rev"], base_assumptions)
-            logger.log(sensitivity_df)
+                report.log(f"DCF analysis failed: {e}")
+            report.subsection("Sensitivity Analysis")
+            sensitivity_cfg = self.config.get("sensitivity", {})
+            with self._timed(report.timings, "sensitivity"):
+                sensitivity_df = self._stage(
+                    "sensitivity", (latest["rev"], base_assumptions, sensitivity_cfg),
+                    lambda: self.dcf_model.run_sensitivity_analysis(latest["rev"], base_assumptions, **sensitivity_cfg)
+                )
+            report.add("sensitivity", sensitivity_df)
+            if self.mc_samples:
+                with self._timed(report.timings, "monte_carlo"):
+                    self._run_monte_carlo(latest["rev"], base_assumptions, prices, report)
+
+    def _implied_assumptions(self, current_rev: float, assumptions: DCFAssumptions, price: float) -> dict:
+        # Value of each IMPLIED_FIELDS assumption (others fixed) at which the DCF returns the market price, NaN if none
+        inputs = {field: getattr(assumptions, field) for field in DCF_INPUT_FIELDS}
+        implied = {"current_price": price}
+        for field in self.IMPLIED_FIELDS:
+            result = self.dcf_model.run_reverse_dcf(field, price, current_rev, inputs)
+            implied[field] = float(result["value"])
+        return implied
+
+    def _process_fundamentals(self, fundamentals: FundamentalData, report: Report) -> tuple[pd.DataFrame, dict] | None:
+        processor = FundamentalProcessor(fundamentals, report)
+        metrics = processor.get_metrics()
+        return (metrics, processor.get_latest_data()) if metrics is not None else None
+
+    # =====================================================
+    # Monte Carlo Valuation
+    # =====================================================
+    def _run_monte_carlo(self, current_rev: float, base_assumptions: DCFAssumptions, prices: pd.DataFrame | None,
+                         report: Report) -> None:
+        report.subsection(f"Monte Carlo Valuation ({self.mc_samples:,} samples)")
+        mc_cfg = self.config.get("monte_carlo", {})
+        stds = {
+            "gr_next5y": 0.03,
+            "operating_margin_target": 0.03,
+            "wacc": 0.01,
+            "terminal_gr": 0.005
+        }
+        stds.update(mc_cfg.get("std", {}))
+        distributions = {field: Normal(getattr(base_assumptions, field), std) for field, std in stds.items()}
+        try:
+            model = MonteCarloDCF(
+                current_rev,
+                base_assumptions,
+                distributions,
+                chunk_size=mc_cfg.get("chunk_size", 100_000),
+                seed=mc_cfg.get("seed"),
+                workers=mc_cfg.get("workers", 1)
+            )
+            curr_price = prices["Close"].iloc[-1] if prices is not None else None
+            if mc_cfg.get("seed") is None:
+                result = model.run(self.mc_samples, current_price=curr_price)
+            else:  # Only seeded runs are reproducible, and so worth memoizing
+                result = self._stage(
+                    "monte_carlo",
+                    (current_rev, base_assumptions, stds, mc_cfg.get("chunk_size", 100_000), mc_cfg["seed"],
+                     mc_cfg.get("workers", 1), self.mc_samples, curr_price),
+                    lambda: model.run(self.mc_samples, current_price=curr_price)
+                )
+            report.add("monte_carlo", result)
+        except Exception as e:
+            report.log(f"Monte Carlo analysis failed: {e}")
     # =====================================================
     # DCF Assumption Resolution
     # =====================================================
-    def _resolve_dcf_config(self, sector: str) -> dict:
-        # Load base results
-        base = self.config.get("dcf", {
-            "revenue_growth_5y": 0.05,
-            "operating_margin_target": 0.20,
-            "tax_rate": 0.21,
-            "wacc": 0.08,
-            "terminal_growth": 0.03
-        }).copy()
-        # Use specific sector assumptions
-        sector_map = {
-            "Technology": {"revenue_growth_5y": 0.15, "operating_margin_target": 0.30, "wacc": 0.10},
-            "Consumer Defensive": {"revenue_growth_5y": 0.04, "operating_margin_target": 0.20, "wacc": 0.065},
-            "Healthcare": {"revenue_growth_5y": 0.06, "operating_margin_target": 0.25, "wacc": 0.08},
-            "Energy": {"revenue_growth_5y": 0.03, "operating_margin_target": 0.15, "wacc": 0.09},
-        }   
-        if sector in sector_map:
-            base.update(sector_map[sector])
+    @staticmethod
+    def _dcf_assumptions(sector: str, dcf_cfg: dict, latest: dict) -> DCFAssumptions:
+        # Resolved config (see _resolve_dcf_config) + the company's latest metrics
+        return DCFAssumptions(
+            name=f"Sector: {sector} + Overrides",
+            gr_next5y=dcf_cfg["revenue_growth_5y"],
+            operating_margin_target=dcf_cfg["operating_margin_target"],
+            tax_rate=dcf_cfg["tax_rate"],
+            wacc=dcf_cfg["wacc"],
+            terminal_gr=dcf_cfg["terminal_growth"],
+            roic_target=latest["roic"],
+            shares_outst=latest["shares"],
+            net_debt=latest["net_debt"],
+        )
+
+    def _resolve_dcf_config(self, sector: str, industry: str | None = None, peers: bool = True) -> dict:
+        # Precedence: config "dcf" section < sector defaults < peer statistics (growth, margin) < overrides.
+        # peers=False leaves the peer statistics out (point-in-time valuations, see backtest)
+        base = dict(self.dcf_defaults)
+        base.update(self.sector_defaults.get(sector, {}))
+        peers = self.sector_stats.lookup(sector, industry) if self.sector_stats is not None and peers else None
+        if peers is not None:
+            # Median peer NOPAT margin, grossed up to the pre-tax operating margin the DCF applies its tax rate to
+            peer_values = {"revenue_growth_5y": peers["growth"],
+                           "operating_margin_target": peers["nopat_margin"] / (1 - base["tax_rate"])}
+            base.update({name: float(value) for name, value in peer_values.items() if np.isfinite(value)})
+            base["peer_group"] = f"{peers['level']} {peers['name']} ({peers['count']} companies)"
         base.update(self.overrides) # Use config.json overides
-        
+
         return base
+
+
+# =====================================================
+# Worker process entry points (CPU stage of the concurrent mode)
+# =====================================================
+_worker_pipeline: AnalysisPipeline | None = None
+
+
+def _init_worker(settings: dict):
+    global _worker_pipeline
+    if settings.get("plots", "all") != "none":
+        import matplotlib
+        matplotlib.use("Agg")  # Worker processes only save plots
+    if settings.get("profile_dir") is not None:
+        tracemalloc.start()  # Per-stage allocations in the worker's timings (cProfile covers the parent only)
+    _worker_pipeline = AnalysisPipeline(show_plt=False, **settings)
+    if settings.get("price_panel_dir") is not None:
+        _worker_pipeline.price_connector.source = None  # Only the parent downloads and writes to the panel
+
+
+def _analyze_in_worker(ticker: str, prices, fundamentals) -> tuple[Report, dict | None]:
+    # Text report file is written here; the report (records and rendered text) goes back to the parent
+    _worker_pipeline._prefetched_prices[ticker] = prices
+    _worker_pipeline._prefetched_fundamentals[ticker] = fundamentals
+    return _worker_pipeline._analyze_ticker(ticker)
+
+
+def _field_name(metric: str) -> str:
+    # "CVaR (5%)" -> "cvar_5", "Sharpe Ratio" -> "sharpe_ratio"
+    return re.sub(r"[^a-z0-9]+", "_", metric.lower()).strip("_")
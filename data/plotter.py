@@ -1,8 +1,80 @@
+import multiprocessing
 import os
-import matplotlib.pyplot as plt
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable
+
+import numpy as np
 import pandas as pd
 
 
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling. Returns the indices of 'threshold' points that preserve the
+    visual shape of the series (peaks and troughs are kept, flat stretches are thinned out).
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Bucket boundaries for the n - 2 interior points, and each bucket's average point
+    bounds = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(int)
+    bounds = np.append(bounds, n)  # The last "bucket" is the final point
+    avg_x = (np.add.reduceat(x, bounds[:-1]) / np.diff(bounds)).tolist()
+    avg_y = (np.add.reduceat(y, bounds[:-1]) / np.diff(bounds)).tolist()
+    bounds = bounds.tolist()
+
+    # Sequential part in plain Python: buckets are small and each pick depends on the previous one
+    xs, ys = x.tolist(), y.tolist()
+    indices = [0]
+    a = 0
+    for i in range(threshold - 2):
+        ax, ay = xs[a], ys[a]
+        bx, by = avg_x[i + 1], avg_y[i + 1]
+        best, best_area = bounds[i], -1.0
+        for j in range(bounds[i], bounds[i + 1]):
+            # Twice the area of the triangle (previous pick, candidate, next bucket's average)
+            area = abs((ax - bx) * (ys[j] - ay) - (ax - xs[j]) * (by - ay))
+            if area > best_area:
+                best, best_area = j, area
+        indices.append(best)
+        a = best
+    indices.append(n - 1)
+    return np.asarray(indices)
+
+
+class _ChartTemplate:
+    """
+    Figure with pre-created axes, lines and legend. Rendering only swaps data, limits and title,
+    so figures, axes and legends are built once per process instead of once per chart.
+    """
+
+    def __init__(self, lines: tuple[dict, ...], levels: tuple[dict, ...], xlabel: str, ylabel: str):
+        from matplotlib.figure import Figure  # matplotlib is only loaded once a chart is rendered
+
+        self.fig = Figure(figsize=(10, 5))
+        self.ax = self.fig.subplots()
+        self.lines = [self.ax.plot([], [], **style)[0] for style in lines]
+        self.levels = [self.ax.axhline(0, **style) for style in levels]
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.ax.legend()
+        self.ax.grid(True)
+
+    def render(self, title: str, series: list[tuple], levels: list[float], path: str):
+        for line, (x, y) in zip(self.lines, series):
+            self.ax.xaxis.update_units(x)
+            line.set_data(x, y)
+        for line, value in zip(self.levels, levels):
+            line.set_ydata([value, value])
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.ax.set_title(title)
+        self.fig.savefig(path, bbox_inches="tight")  # Cropped to the labels and legend
+
+
 class Plotter:
     """
     Generates key plots for equity analysis:
@@ -10,99 +82,168 @@ class Plotter:
     - Price vs DCF Value
     - Revenue / FCF over time
     - ROIC vs WACC
+
+    Saved charts are drawn on reusable Agg figure templates (one set per thread) and long price series are
+    downsampled with LTTB to 'max_points' points; pyplot is only used to show charts interactively.
     """
 
+    max_points = 1_000
+    # Charts produced with --plots summary
+    SUMMARY_CHARTS = ("plot_price_vs_dcf",)
+
+    TEMPLATES = {
+        "price_ma": (
+            ({"label": "Close Price", "color": "blue"}, {"label": "MA 50", "color": "orange"},
+             {"label": "MA 200", "color": "green"}),
+            (), "Date", "Price ($)"
+        ),
+        "price_vs_dcf": (
+            ({"label": "Market Price", "color": "blue"},),
+            ({"color": "red", "linestyle": "--", "label": "DCF Value"},), "Date", "Price ($)"
+        ),
+        "revenue_fcf": (
+            ({"marker": "o", "label": "Revenue"}, {"marker": "o", "label": "FCF"}), (), "Date", "USD"
+        ),
+        "roic_vs_wacc": (
+            ({"marker": "o", "label": "ROIC"},), ({"color": "red", "linestyle": "--", "label": "WACC"},),
+            "Date", "Rate"
+        ),
+    }
+    _local = threading.local()
+
     @staticmethod
-    def _save_or_show(fig, output_path: str | None, filename: str, show: bool = False):
+    def chart_path(chart: str, output_path: str, ticker: str) -> str:
+        # "plot_price_ma" -> <output_path>/<ticker>_price_ma.png
+        return os.path.join(output_path, f"{ticker}_{chart.removeprefix('plot_')}.png")
+
+    @classmethod
+    def _template(cls, name: str) -> _ChartTemplate:
+        templates = getattr(cls._local, "templates", None)
+        if templates is None:
+            templates = cls._local.templates = {}
+        if name not in templates:
+            templates[name] = _ChartTemplate(*cls.TEMPLATES[name])
+        return templates[name]
+
+    @classmethod
+    def _render(cls, name: str, title: str, series: list[tuple], levels: list[float], output_path: str | None,
+                filename: str, show: bool = False):
+        if show:
+            cls._show(name, title, series, levels, output_path, filename)
+        elif output_path:
+            os.makedirs(output_path, exist_ok=True)
+            cls._template(name).render(title, series, levels, os.path.join(output_path, filename))
+
+    @classmethod
+    def _show(cls, name: str, title: str, series: list[tuple], levels: list[float], output_path: str | None,
+              filename: str):
+        import matplotlib.pyplot as plt  # Interactive display only
+
+        lines, level_styles, xlabel, ylabel = cls.TEMPLATES[name]
+        fig, ax = plt.subplots(figsize=(10, 5))
+        for style, (x, y) in zip(lines, series):
+            ax.plot(x, y, **style)
+        for style, value in zip(level_styles, levels):
+            ax.axhline(y=value, **style)
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.legend()
+        ax.grid(True)
         if output_path:
             os.makedirs(output_path, exist_ok=True)
             fig.savefig(os.path.join(output_path, filename), bbox_inches="tight")
-        if show:
-            plt.show()
+        plt.show()
         plt.close(fig)
 
+    @classmethod
+    def _price_series(cls, prices: pd.DataFrame, *columns: pd.Series) -> list[tuple]:
+        # Close plus any derived series, all thinned out at the points LTTB picks for Close
+        if "Date" in prices.columns:
+            dates = pd.to_datetime(prices["Date"]).to_numpy()
+        else:
+            dates = prices.index.to_numpy()
+        close = prices["Close"].to_numpy(dtype=float)
+        keep = lttb(dates.astype("datetime64[ns]").astype(np.int64), close, cls.max_points)
+        return [(dates[keep], close[keep])] + [(dates[keep], np.asarray(c, dtype=float)[keep]) for c in columns]
+
     # =====================================================
     # Price + Moving Averages
     # =====================================================
-    @staticmethod
-    def plot_price_ma(prices: pd.DataFrame, output_path: str | None, ticker: str, show: bool = False):
+    @classmethod
+    def plot_price_ma(cls, prices: pd.DataFrame, output_path: str | None, ticker: str, show: bool = False):
         """
         Plots closing price + 50 & 200-day moving averages
         """
-        if "Date" in prices.columns:
-            plot_data = prices.set_index("Date")
-        else:
-            plot_data = prices
-        
-        fig, ax = plt.subplots(figsize=(10, 5))
-
-        ax.plot(plot_data.index, plot_data["Close"], label="Close Price", color="blue")
-        ax.plot(plot_data["Close"].rolling(50).mean(), label="MA 50", color="orange")
-        ax.plot(plot_data["Close"].rolling(200).mean(), label="MA 200", color="green")
-
-        ax.set_title(f"{ticker} Price Trend")
-        ax.set_xlabel("Date")
-        ax.set_ylabel("Price ($)")
-        ax.legend()
-        ax.grid(True)
-
-        Plotter._save_or_show(fig, output_path, f"{ticker}_price_ma.png", show)
+        close = prices["Close"].reset_index(drop=True)
+        series = cls._price_series(prices, close.rolling(50).mean(), close.rolling(200).mean())
+        cls._render("price_ma", f"{ticker} Price Trend", series, [], output_path, f"{ticker}_price_ma.png", show)
 
     # =====================================================
     # Price vs DCF Value
     # =====================================================
-    @staticmethod
-    def plot_price_vs_dcf(prices: pd.DataFrame, dcf_value: float, output_path: str | None, ticker: str,
+    @classmethod
+    def plot_price_vs_dcf(cls, prices: pd.DataFrame, dcf_value: float, output_path: str | None, ticker: str,
                           show: bool = False):
-        if "Date" in prices.columns:
-            plot_data = prices.set_index("Date")
-        else:
-            plot_data = prices
-        fig, ax = plt.subplots(figsize=(10, 5))
-
-        ax.plot(plot_data.index, plot_data["Close"], label="Market Price", color="blue")
-        ax.axhline(y=dcf_value, color="red", linestyle="--", label="DCF Value")
-
-        ax.set_title(f"{ticker} Market Price vs DCF")
-        ax.set_xlabel("Date")
-        ax.set_ylabel("Price ($)")
-        ax.legend()
-        ax.grid(True)
-
-        Plotter._save_or_show(fig, output_path, f"{ticker}_price_vs_dcf.png", show)
+        cls._render("price_vs_dcf", f"{ticker} Market Price vs DCF", cls._price_series(prices), [dcf_value],
+                    output_path, f"{ticker}_price_vs_dcf.png", show)
 
     # =====================================================
     # Revenue & FCF
     # =====================================================
-    @staticmethod
-    def plot_revenue_fcf(metrics: pd.DataFrame, output_path: str | None, ticker: str, show: bool = False):
-        fig, ax = plt.subplots(figsize=(10, 5))
-
-        ax.plot(metrics.index, metrics["Revenue"], marker="o", label="Revenue")
-        ax.plot(metrics.index, metrics["FCF"], marker="o", label="FCF")
-
-        ax.set_title(f"{ticker} Revenue & Free Cash Flow")
-        ax.set_xlabel("Date")
-        ax.set_ylabel("USD")
-        ax.legend()
-        ax.grid(True)
-
-        Plotter._save_or_show(fig, output_path, f"{ticker}_revenue_fcf.png", show)
+    @classmethod
+    def plot_revenue_fcf(cls, metrics: pd.DataFrame, output_path: str | None, ticker: str, show: bool = False):
+        series = [(metrics.index, metrics["Revenue"]), (metrics.index, metrics["FCF"])]
+        cls._render("revenue_fcf", f"{ticker} Revenue & Free Cash Flow", series, [], output_path,
+                    f"{ticker}_revenue_fcf.png", show)
 
     # =====================================================
     # ROIC vs WACC
     # =====================================================
-    @staticmethod
-    def plot_roic_vs_wacc(metrics: pd.DataFrame, wacc: float, output_path: str | None, ticker: str, show: bool = False):
-        fig, ax = plt.subplots(figsize=(10, 5))
+    @classmethod
+    def plot_roic_vs_wacc(cls, metrics: pd.DataFrame, wacc: float, output_path: str | None, ticker: str,
+                          show: bool = False):
+        cls._render("roic_vs_wacc", f"{ticker} ROIC vs WACC", [(metrics.index, metrics["ROIC"])], [wacc],
+                    output_path, f"{ticker}_roic_vs_wacc.png", show)
 
-        ax.plot(metrics.index, metrics["ROIC"], marker="o", label="ROIC")
-        ax.axhline(y=wacc, color="red", linestyle="--", label="WACC")
 
-        ax.set_title(f"{ticker} ROIC vs WACC")
-        ax.set_xlabel("Date")
-        ax.set_ylabel("Rate")
-        ax.legend()
-        ax.grid(True)
+# =====================================================
+# Render queue (charts rendered in worker processes)
+# =====================================================
+def _render_chart(chart: str, args: tuple):
+    getattr(Plotter, chart)(*args)
 
-        Plotter._save_or_show(fig, output_path, f"{ticker}_roic_vs_wacc.png", show)
+
+class RenderQueue:
+    """
+    Renders Plotter charts in a pool of worker processes, so rendering runs off the analytics path.
+    At most 'max_pending' charts wait at a time; submit() blocks beyond that to bound memory.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int | None = None):
+        # Spawned, not forked: charts may be queued from threads (e.g. the async pipeline)
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self._pending = threading.BoundedSemaphore(max_pending or workers * 4)
+        self.failures: list[str] = []
+
+    def submit(self, chart: str, *args, on_success: Callable[[], None] | None = None):
+        """
+        Queues Plotter.<chart>(*args); 'on_success' is called (in a pool thread) once the chart file is written.
+        """
+        self._pending.acquire()
+        future = self._pool.submit(_render_chart, chart, args)
+        future.add_done_callback(lambda f: self._done(chart, args, f, on_success))
+
+    def _done(self, chart: str, args: tuple, future: Future, on_success: Callable[[], None] | None):
+        self._pending.release()
+        if future.exception() is not None:
+            self.failures.append(f"{chart} ({args[-1]}): {future.exception()}")
+        elif on_success is not None:
+            on_success()
+
+    def close(self) -> list[str]:
+        """
+        Waits for all queued charts and returns the failures.
+        """
+        self._pool.shutdown(wait=True)
+        return self.failures
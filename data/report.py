@@ -0,0 +1,240 @@
+import datetime
+import io
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+
+# =====================================================
+# Text views of the typed records (None: record is not shown in the text report)
+# =====================================================
+def _assumptions_text(value: dict) -> str:
+    text = (f"Sector Detected: {value['sector']}\n"
+            f"Assumptions Used: Growth={value['revenue_growth_5y']:.1%}, WACC={value['wacc']:.1%}, "
+            f"Margin={value['operating_margin_target']:.1%}")
+    if "peer_group" in value:
+        text += f"\nPeer Statistics: {value['peer_group']}"
+    return text
+
+
+def _dcf_text(value: dict) -> str:
+    lines = [f"Scenario: {value['scenario']}", f"Estimated fair value per share: ${value['share_price']:.2f}"]
+    if "current_price" in value:
+        lines.append(f"Current Market Price: ${value['current_price']:.2f}")
+    if "upside" in value:
+        lines.append(f"Implied Upside: {value['upside']:.1%}")
+    return "\n".join(lines)
+
+
+def _implied_text(value: dict) -> str:
+    def fmt(field):
+        return "no solution" if np.isnan(value[field]) else f"{value[field]:.1%}"
+    return (f"Market-Implied at ${value['current_price']:.2f} (one at a time): Growth={fmt('gr_next5y')}, "
+            f"Margin={fmt('operating_margin_target')}, WACC={fmt('wacc')}")
+
+
+def _monte_carlo_text(value: dict) -> str:
+    lines = [f"Fair value per share: mean ${value['mean']:.2f}, std ${value['std']:.2f}", str(value["percentiles"].round(2))]
+    if not np.isnan(value["prob_above_price"]):
+        lines.append(f"Probability fair value > market price: {value['prob_above_price']:.1%}")
+        lines.append(f"Expected Upside: {value['expected_upside']:.1%}")
+    return "\n".join(lines)
+
+
+TEXT_VIEWS = {
+    "risk_summary": str,
+    "metrics": lambda df: str(df[["Revenue", "NOPAT", "ROIC", "FCF"]].tail(5)),
+    "assumptions": _assumptions_text,
+    "dcf": _dcf_text,
+    "projections": None,
+    "implied": _implied_text,
+    "sensitivity": str,
+    "monte_carlo": _monte_carlo_text,
+}
+
+
+class Report:
+    """
+    One ticker's output as an ordered list of entries: headings, free-text notes (e.g. errors) and typed records
+    (risk summary Series, metrics / projections / sensitivity DataFrames, DCF and Monte Carlo dicts).
+
+    Records are what ResultsSink writes to JSON Lines / Arrow; the text report is a view rendered from
+    the entries on demand (TEXT_VIEWS), so nothing is formatted unless a text output is requested.
+    """
+
+    def __init__(self, ticker: str, log_dir: str | None = None):
+        self.ticker = ticker
+        self.log_dir = log_dir  # Ticker's output directory (charts, text report)
+        self.entries: list[tuple[str, str | None, object]] = []
+        # (stage, wall_s, cpu_s, alloc_mb) when the pipeline is instrumented
+        self.timings: list[tuple] = []
+        self._text: str | None = None
+
+    def section(self, title: str):
+        self.entries.append(("section", None, title))
+
+    def subsection(self, title: str):
+        self.entries.append(("subsection", None, title))
+
+    def log(self, message):
+        self.entries.append(("text", None, message))
+
+    def add(self, name: str, value):
+        """
+        Adds a typed record. Dict records may still be filled in afterwards (they are rendered at the end).
+        """
+        self.entries.append(("record", name, value))
+
+    @property
+    def records(self) -> list[tuple[str, object]]:
+        return [(name, value) for kind, name, value in self.entries if kind == "record"]
+
+    # -------------------------
+    # Text view
+    # -------------------------
+    def text(self) -> str:
+        if self._text is None:
+            out = io.StringIO()
+            for kind, name, value in self.entries:
+                if kind == "record":
+                    view = TEXT_VIEWS.get(name, str)
+                    if view is None:
+                        continue
+                    value = view(value)
+                elif kind == "subsection":
+                    value = f"\n{value}\n{'=' * len(value)}\n"
+                elif kind == "section":
+                    line = "=" * len(value)
+                    value = f"\n{line}\n{value}\n{line}\n"
+                out.write(f"{value}\n")
+            self._text = out.getvalue()
+        return self._text
+
+    def save_text(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.text())
+
+
+# =====================================================
+# Structured sink
+# =====================================================
+def without_nan(value):
+    """
+    The value with NaN / inf floats (e.g. an unsolved reverse DCF, a degenerate DCF) replaced by None, in nested
+    dicts, lists and tuples: they are not valid JSON.
+    """
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: without_nan(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [without_nan(v) for v in value]
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return json.loads(value.to_json(orient="split", date_format="iso"))  # NaN written as null
+    if isinstance(value, np.generic):
+        return without_nan(value.item())
+    if isinstance(value, (pd.Timestamp, datetime.date)):
+        return value.isoformat()
+    return str(value)
+
+
+class ResultsSink:
+    """
+    Writes report records in batches, to 'records.jsonl' (one {"ticker", "record", "value"} object per line,
+    tables in pandas 'split' layout) and/or 'records.arrow'.
+
+    The Arrow IPC file is a long table with a fixed schema, one row per value:
+        ticker, record, row (index label), column, value (numbers), text (strings)
+    e.g. sensitivity cells are (ticker, "sensitivity", "WACC 9.0%", "Terminal Growth 2.0%", 517.43, null).
+    Records are buffered and written every 'batch_size' tickers, and when the sink is closed.
+    """
+
+    FORMATS = ("jsonl", "arrow")
+    SCHEMA = pa.schema([
+        ("ticker", pa.string()), ("record", pa.string()), ("row", pa.string()), ("column", pa.string()),
+        ("value", pa.float64()), ("text", pa.string()),
+    ])
+
+    def __init__(self, path: str, formats: tuple[str, ...] = ("jsonl",), batch_size: int = 100):
+        unknown = set(formats) - set(self.FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown result formats: {sorted(unknown)}")
+        self.path = path
+        self.formats = tuple(formats)
+        self.batch_size = batch_size
+        self._pending: list[Report] = []
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._jsonl = open(os.path.join(path, "records.jsonl"), "w", encoding="utf-8", buffering=1 << 20) \
+            if "jsonl" in self.formats else None
+        self._arrow_sink = pa.OSFile(os.path.join(path, "records.arrow"), "wb") if "arrow" in self.formats else None
+        self._arrow = ipc.new_file(self._arrow_sink, self.SCHEMA) if self._arrow_sink is not None else None
+
+    def add(self, report: Report):
+        with self._lock:
+            self._pending.append(report)
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            if self._jsonl is not None:
+                self._jsonl.close()
+            if self._arrow is not None:
+                self._arrow.close()
+                self._arrow_sink.close()
+
+    def _flush(self):
+        reports, self._pending = self._pending, []
+        if not reports:
+            return
+        if self._jsonl is not None:
+            self._jsonl.write("".join(
+                json.dumps({"ticker": report.ticker, "record": name, "value": without_nan(value)},
+                           default=_json_default, allow_nan=False) + "\n"
+                for report in reports for name, value in report.records
+            ))
+        if self._arrow is not None:
+            columns = {name: [] for name in self.SCHEMA.names}
+            for report in reports:
+                for name, value in report.records:
+                    self._append_rows(columns, report.ticker, name, value)
+            self._arrow.write_batch(pa.record_batch(columns, schema=self.SCHEMA))
+
+    @staticmethod
+    def _append_rows(columns: dict, ticker: str, record: str, value):
+        def row(label, column, cell):
+            columns["ticker"].append(ticker)
+            columns["record"].append(record)
+            columns["row"].append(None if label is None else str(label))
+            columns["column"].append(None if column is None else str(column))
+            number = isinstance(cell, (int, float, np.integer, np.floating)) and not isinstance(cell, bool)
+            columns["value"].append(float(cell) if number else None)
+            columns["text"].append(None if number or cell is None else str(cell))
+
+        if isinstance(value, pd.DataFrame):
+            for label, values in zip(value.index, value.to_numpy(dtype=object)):
+                for column, cell in zip(value.columns, values):
+                    row(label, column, cell)
+        elif isinstance(value, pd.Series):
+            for label, cell in value.items():
+                row(label, None, cell)
+        elif isinstance(value, dict):
+            for key, cell in value.items():
+                if isinstance(cell, (pd.DataFrame, pd.Series, dict)):
+                    ResultsSink._append_rows(columns, ticker, f"{record}.{key}", cell)
+                else:
+                    row(None, key, cell)
+        else:
+            row(None, None, value)
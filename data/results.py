@@ -0,0 +1,177 @@
+import ast
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+
+class ResultsTable:
+    """
+    Columnar table of per-ticker pipeline results (one row per ticker, latest run wins), persisted as an
+    Arrow IPC file next to a second file holding one sorted index (argsort permutation) per numeric column.
+
+    Top-k and range queries walk the sorted indexes instead of sorting or scanning the whole universe:
+        table.top("upside", k=50)
+        table.screen("roic_wacc_spread > 0.05 and sector == 'Technology'", rank="upside", k=20)
+    """
+
+    FILENAME = "results.arrow"
+    INDEX_FILENAME = "results.index.arrow"
+    _COMPARISON = re.compile(r"^\s*(\w+)\s*(<=|>=|==|!=|<|>)\s*(.+?)\s*$")
+
+    def __init__(self, path: str):
+        """
+        Parameters
+        ----------
+        path : str
+            Directory holding the results files (e.g. the pipeline output directory).
+        """
+        self.path = path
+        self._frame: pd.DataFrame | None = None
+        self._orders: dict[str, np.ndarray] = {}
+        self._valid: dict[str, int] = {}
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        if self._frame is None:
+            self._load()
+        return self._frame
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+    def upsert(self, records: list[dict]):
+        """
+        Adds or replaces the results of the given tickers and rebuilds the sorted indexes.
+        """
+        if not records:
+            return
+        new = pd.DataFrame(records)
+        frame = self.frame
+        if not frame.empty:
+            new = pd.concat([frame[~frame["ticker"].isin(new["ticker"])], new], ignore_index=True)
+        new = new.sort_values("ticker", ignore_index=True)
+
+        orders = {}
+        for column in new.columns:
+            if pd.api.types.is_numeric_dtype(new[column]) and not pd.api.types.is_bool_dtype(new[column]):
+                # Stable argsort with NaN last; the first _valid[column] entries are the non-NaN rows
+                orders[column] = np.argsort(new[column].to_numpy(dtype=float), kind="stable")
+
+        os.makedirs(self.path, exist_ok=True)
+        self._write(pa.Table.from_pandas(new, preserve_index=False), self.FILENAME)
+        self._write(pa.table(orders), self.INDEX_FILENAME)
+        self._frame = None
+
+    def _write(self, table: pa.Table, filename: str):
+        path = os.path.join(self.path, filename)
+        tmp_path = f"{path}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    def _load(self):
+        path = os.path.join(self.path, self.FILENAME)
+        if not os.path.exists(path):
+            self._frame, self._orders, self._valid = pd.DataFrame({"ticker": []}), {}, {}
+            return
+        with pa.memory_map(path, "r") as source:
+            self._frame = ipc.open_file(source).read_pandas()
+        with pa.memory_map(os.path.join(self.path, self.INDEX_FILENAME), "r") as source:
+            orders = ipc.open_file(source).read_all()
+        self._orders = {name: orders[name].to_numpy() for name in orders.column_names}
+        self._valid = {name: int(self._frame[name].notna().sum()) for name in self._orders}
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def _sorted(self, column: str) -> tuple[np.ndarray, np.ndarray]:
+        # Row ids in ascending order of the column (NaN excluded) and the matching sorted values
+        if column not in self._orders:
+            raise KeyError(f"No sorted index for column '{column}'")
+        order = self._orders[column][:self._valid[column]]
+        return order, self.frame[column].to_numpy(dtype=float)[order]
+
+    def top(self, column: str, k: int = 50, ascending: bool = False) -> pd.DataFrame:
+        """
+        k best rows by a numeric column, straight from its sorted index.
+        """
+        frame = self.frame
+        order, _ = self._sorted(column)
+        rows = order[:k] if ascending else order[::-1][:k]
+        return frame.iloc[rows].reset_index(drop=True)
+
+    def range(self, column: str, low: float | None = None, high: float | None = None,
+              inclusive: tuple[bool, bool] = (True, True)) -> pd.DataFrame:
+        """
+        Rows with low <= column <= high (either bound optional), found by binary search on the sorted index.
+        """
+        return self.frame.iloc[np.sort(self._range_rows(column, low, high, inclusive))].reset_index(drop=True)
+
+    def _range_rows(self, column: str, low: float | None, high: float | None,
+                    inclusive: tuple[bool, bool] = (True, True)) -> np.ndarray:
+        order, values = self._sorted(column)
+        start = 0 if low is None else np.searchsorted(values, low, side="left" if inclusive[0] else "right")
+        end = len(values) if high is None else np.searchsorted(values, high, side="right" if inclusive[1] else "left")
+        return order[start:end]
+
+    def screen(self, where: str | None = None, rank: str | None = None, k: int = 50,
+               ascending: bool = False) -> pd.DataFrame:
+        """
+        Filters rows and returns the top k by 'rank'.
+
+        'where' is a pandas query expression; conjunctions of simple comparisons (column op literal) on numeric
+        columns are answered from the sorted indexes. 'rank' is a column (served from its sorted index) or
+        any pandas eval expression, e.g. "roic - wacc".
+        """
+        frame = self.frame
+        mask = self._filter(where) if where else None
+
+        if rank is None:
+            rows = np.flatnonzero(mask) if mask is not None else np.arange(len(frame))
+            return frame.iloc[rows[:k]].reset_index(drop=True)
+
+        if rank in self._orders:
+            order, _ = self._sorted(rank)
+            order = order if ascending else order[::-1]
+            rows = order[mask[order]][:k] if mask is not None else order[:k]
+            return frame.iloc[rows].reset_index(drop=True)
+
+        # Ranking expression: evaluated on the matching rows only, then a partial sort
+        candidates = frame[mask] if mask is not None else frame
+        score = candidates.eval(rank).to_numpy(dtype=float)
+        score = np.where(np.isnan(score), np.inf if ascending else -np.inf, score)
+        k = min(k, len(score))
+        if k == 0:
+            return candidates.iloc[:0].assign(score=[])
+        best = np.argpartition(score if ascending else -score, k - 1)[:k]
+        best = best[np.argsort(score[best] if ascending else -score[best], kind="stable")]
+        return candidates.iloc[best].assign(score=score[best]).reset_index(drop=True)
+
+    def _filter(self, where: str) -> np.ndarray:
+        frame = self.frame
+        mask = np.ones(len(frame), dtype=bool)
+        for clause in re.split(r"\s+and\s+", where.strip()):
+            match = self._COMPARISON.match(clause)
+            try:
+                column, op, literal = match.groups()
+                value = ast.literal_eval(literal)
+            except (AttributeError, ValueError, SyntaxError):
+                # Not a simple conjunction: evaluate the whole expression with pandas
+                return frame.eval(where).to_numpy(dtype=bool)
+
+            if column in self._orders and op in ("<", "<=", ">", ">=") and isinstance(value, (int, float)):
+                low, high = (value, None) if op in (">", ">=") else (None, value)
+                inclusive = (op == ">=", True) if op in (">", ">=") else (True, op == "<=")
+                hit = np.zeros(len(frame), dtype=bool)
+                hit[self._range_rows(column, low, high, inclusive)] = True
+                mask &= hit
+            else:
+                mask &= frame.eval(f"{column} {op} {literal}").to_numpy(dtype=bool)
+        return mask
@@ -0,0 +1,167 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from analytics.ec_metric_processor import PanelFundamentalProcessor
+from data.models.fundamental_data import FundamentalData
+from data.stage_cache import fingerprint
+
+
+class SectorStatsIndex:
+    """
+    Peer statistics of the analyzed universe per sector and per industry: median revenue growth, NOPAT margin
+    and ROIC with their interquartile ranges, derived from FundamentalProcessor metrics.
+
+    Two small Arrow IPC files:
+        sector_stats.companies.arrow  one row per company (its median metrics and a fingerprint of its statements)
+        sector_stats.groups.arrow     one row per (level, group) with the peer medians, IQRs and counts
+    update() only reprocesses the statements of companies that are new or whose statements changed (in one
+    PanelFundamentalProcessor pass); the group statistics are then re-aggregated over the company table.
+    lookup() is a dict access.
+    """
+
+    COMPANIES_FILENAME = "sector_stats.companies.arrow"
+    GROUPS_FILENAME = "sector_stats.groups.arrow"
+    METRICS = ("growth", "nopat_margin", "roic")
+    INFO_FIELDS = ("quoteType", "sector", "industry", "sharesOutstanding")
+
+    def __init__(self, path: str, min_peers: int = 5):
+        """
+        Parameters
+        ----------
+        path : str
+            Directory holding the index files.
+        min_peers : int
+            Fewest companies for a group's statistics to be returned by lookup().
+        """
+        self.path = path
+        self.min_peers = min_peers
+        self._companies: pd.DataFrame | None = None
+        self._groups: dict[tuple[str, str], dict] | None = None
+
+    @property
+    def companies(self) -> pd.DataFrame:
+        if self._companies is None:
+            self._companies = self._read(self.COMPANIES_FILENAME, self._empty_companies())
+        return self._companies
+
+    def __len__(self) -> int:
+        return len(self.companies)
+
+    # -------------------------
+    # Refresh
+    # -------------------------
+    def update(self, fundamentals: dict[str, FundamentalData]) -> int:
+        """
+        Adds or refreshes companies and re-aggregates the groups. Returns the number of companies whose
+        statements were (re)processed; unchanged ones are skipped.
+        """
+        companies = self.companies
+        stored = dict(zip(companies["ticker"], companies["fingerprint"]))
+        keys = {ticker.upper(): fingerprint(data.statements, {f: data.info.get(f) for f in self.INFO_FIELDS})
+                for ticker, data in fundamentals.items()}
+        changed = {t: data for t, data in fundamentals.items() if stored.get(t.upper()) != keys[t.upper()]}
+        if not changed:
+            return 0
+
+        rows = self._company_stats({t.upper(): data for t, data in changed.items()})
+        rows["fingerprint"] = rows["ticker"].map(keys)
+        kept = companies[~companies["ticker"].isin([t.upper() for t in changed])]
+        self._save(pd.concat([kept, rows], ignore_index=True).sort_values("ticker", ignore_index=True))
+        return len(changed)
+
+    def remove(self, tickers: list[str]):
+        companies = self.companies
+        self._save(companies[~companies["ticker"].isin([t.upper() for t in tickers])].reset_index(drop=True))
+
+    def _company_stats(self, fundamentals: dict[str, FundamentalData]) -> pd.DataFrame:
+        # Each company's median metrics over its reported years, all companies in one grouped pass
+        processor = PanelFundamentalProcessor.from_fundamentals(fundamentals)
+        metrics = processor.get_metrics()
+        per_year = pd.DataFrame({
+            "growth": metrics["Growth"],
+            "nopat_margin": metrics["NOPAT"] / metrics["Revenue"].replace(0, np.nan),
+            "roic": metrics["ROIC"],
+        }).replace([np.inf, -np.inf], np.nan)
+        # Companies without metrics are kept (NaN) so their fingerprint spares them the next refresh too
+        medians = per_year.groupby(level="Ticker").median().reindex(list(fundamentals))
+        tickers = medians.index
+        return pd.DataFrame({
+            "ticker": tickers,
+            "sector": [fundamentals[t].info.get("sector") or "Unknown" for t in tickers],
+            "industry": [fundamentals[t].info.get("industry") or "Unknown" for t in tickers],
+            **{metric: medians[metric].to_numpy(dtype=float) for metric in self.METRICS},
+        })
+
+    def _aggregate(self, companies: pd.DataFrame) -> pd.DataFrame:
+        companies = companies.dropna(subset=list(self.METRICS), how="all")
+        parts = []
+        for level in ("sector", "industry"):
+            grouped = companies.groupby(level)[list(self.METRICS)]
+            median, q25, q75 = grouped.median(), grouped.quantile(0.25), grouped.quantile(0.75)
+            stats = pd.DataFrame({"level": level, "name": median.index, "count": grouped.size().to_numpy()})
+            for metric in self.METRICS:
+                stats[metric] = median[metric].to_numpy()
+                stats[f"{metric}_iqr"] = (q75[metric] - q25[metric]).to_numpy()
+            parts.append(stats)
+        return pd.concat(parts, ignore_index=True)
+
+    # -------------------------
+    # Lookup
+    # -------------------------
+    def lookup(self, sector: str | None, industry: str | None = None) -> dict | None:
+        """
+        Peer statistics of the industry, or of the sector if the industry has fewer than 'min_peers' companies
+        (None if neither has): {"level", "name", "count", "growth", "growth_iqr", "nopat_margin", ...}.
+        """
+        groups = self._load_groups()
+        for level, name in (("industry", industry), ("sector", sector)):
+            stats = groups.get((level, name))
+            if stats is not None and stats["count"] >= self.min_peers:
+                return stats
+        return None
+
+    def table(self, level: str = "sector") -> pd.DataFrame:
+        groups = pd.DataFrame(list(self._load_groups().values()), columns=self._group_columns())
+        return groups[groups["level"] == level].drop(columns="level").set_index("name")
+
+    def _load_groups(self) -> dict[tuple[str, str], dict]:
+        if self._groups is None:
+            groups = self._read(self.GROUPS_FILENAME, pd.DataFrame(columns=self._group_columns()))
+            self._groups = {(row["level"], row["name"]): row for row in groups.to_dict("records")}
+        return self._groups
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+    def _empty_companies(self) -> pd.DataFrame:
+        return pd.DataFrame({"ticker": pd.Series(dtype=object), "sector": pd.Series(dtype=object),
+                             "industry": pd.Series(dtype=object),
+                             **{metric: pd.Series(dtype=float) for metric in self.METRICS},
+                             "fingerprint": pd.Series(dtype=object)})
+
+    def _group_columns(self) -> list[str]:
+        return ["level", "name", "count", *(f"{m}{s}" for m in self.METRICS for s in ("", "_iqr"))]
+
+    def _save(self, companies: pd.DataFrame):
+        os.makedirs(self.path, exist_ok=True)
+        self._write(pa.Table.from_pandas(companies, preserve_index=False), self.COMPANIES_FILENAME)
+        self._write(pa.Table.from_pandas(self._aggregate(companies), preserve_index=False), self.GROUPS_FILENAME)
+        self._companies, self._groups = companies, None
+
+    def _write(self, table: pa.Table, filename: str):
+        path = os.path.join(self.path, filename)
+        tmp_path = f"{path}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    def _read(self, filename: str, empty: pd.DataFrame) -> pd.DataFrame:
+        path = os.path.join(self.path, filename)
+        if not os.path.exists(path):
+            return empty
+        with pa.memory_map(path, "r") as source:
+            return ipc.open_file(source).read_pandas()
@@ -0,0 +1,292 @@
+"""
+Long-running valuation service: keeps an AnalysisPipeline, its connectors and each ticker's processed
+statement metrics warm in memory behind a local HTTP/JSON API.
+
+    POST /valuate   {"tickers": ["KO", "PEP"], "overrides": {"wacc": 0.09}, "sensitivity": false}
+    GET  /metrics   request latency percentiles, cache and coalescing counters
+    GET  /health
+
+    python main.py serve --port 8080 --cache_dir ./.cache
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from aiohttp import web
+
+from data.pipeline import AnalysisPipeline
+from data.report import Report, without_nan
+
+
+@dataclass
+class TickerInputs:
+    # Everything a valuation needs besides the assumptions, loaded once per ticker and kept warm
+    ticker: str
+    sector: str
+    industry: str | None
+    latest: dict
+    metrics_as_of: str
+    current_price: float | None
+    loaded_at: float
+
+
+class ValuationService:
+    """
+    Answers valuation requests from warm per-ticker inputs (fetched data + FundamentalProcessor metrics).
+
+    - Inputs are loaded in a thread pool on first use and reused for 'input_ttl' seconds, for at most
+      'max_inputs' tickers (least recently used ones are dropped). Concurrent requests for a ticker that is being
+      loaded wait for the same load instead of starting their own. A failed load is answered from memory for
+      'error_ttl' seconds instead of being retried on every request.
+    - Results are kept in an LRU of 'cache_size' entries keyed by ticker, effective assumptions and options,
+      so repeated requests and requests that only change assumptions skip fetching and statement processing.
+    """
+
+    # Request overrides: config names (as in config.json) or the matching DCFAssumptions field names
+    OVERRIDE_NAMES = {
+        "revenue_growth_5y": "revenue_growth_5y", "gr_next5y": "revenue_growth_5y",
+        "operating_margin_target": "operating_margin_target",
+        "tax_rate": "tax_rate",
+        "wacc": "wacc",
+        "terminal_growth": "terminal_growth", "terminal_gr": "terminal_growth",
+    }
+
+    def __init__(self, pipeline: AnalysisPipeline, cache_size: int = 4096, input_ttl: float = 15 * 60,
+                 io_workers: int = 8, max_inputs: int = 4096, error_ttl: float = 60):
+        self.pipeline = pipeline
+        self.cache_size = cache_size
+        self.input_ttl = input_ttl
+        self.max_inputs = max_inputs
+        self.error_ttl = error_ttl
+        self._executor = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="valuation-io")
+        self._inputs: OrderedDict[str, TickerInputs] = OrderedDict()
+        self._failures: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._loading: dict[str, asyncio.Future] = {}
+        self._results: OrderedDict[tuple, dict] = OrderedDict()
+        self._latencies: deque[float] = deque(maxlen=10_000)
+        self._started = time.time()
+        self._runner: web.AppRunner | None = None
+        self.stats = {"requests": 0, "bad_requests": 0, "valuations": 0, "result_hits": 0, "result_misses": 0,
+                      "input_loads": 0, "coalesced_loads": 0, "cached_failures": 0, "ticker_errors": 0}
+
+    # -------------------------
+    # Valuation API
+    # -------------------------
+    async def valuate(self, tickers: list[str], overrides: dict | None = None, sensitivity: bool = False) -> dict:
+        """
+        Values the tickers concurrently. Returns {"results": {ticker: ...}, "errors": {ticker: message}}.
+        """
+        overrides = self._normalize_overrides(overrides or {})
+        tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        outcomes = await asyncio.gather(*(self._valuate_one(t, overrides, sensitivity) for t in tickers),
+                                        return_exceptions=True)
+        response = {"results": {}, "errors": {}}
+        for ticker, outcome in zip(tickers, outcomes):
+            if isinstance(outcome, Exception):
+                self.stats["ticker_errors"] += 1
+                response["errors"][ticker] = str(outcome)
+            else:
+                response["results"][ticker] = outcome
+        return response
+
+    def _normalize_overrides(self, overrides: dict) -> dict:
+        unknown = set(overrides) - set(self.OVERRIDE_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown overrides: {sorted(unknown)} (allowed: {sorted(self.OVERRIDE_NAMES)})")
+        return {self.OVERRIDE_NAMES[name]: float(value) for name, value in overrides.items()}
+
+    async def _valuate_one(self, ticker: str, overrides: dict, sensitivity: bool) -> dict:
+        inputs = await self._get_inputs(ticker)
+        dcf_cfg = self.pipeline._resolve_dcf_config(inputs.sector, inputs.industry)
+        dcf_cfg.update(overrides)
+        key = (ticker, inputs.loaded_at, tuple(sorted(dcf_cfg.items())), sensitivity)
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+            self.stats["result_hits"] += 1
+            return {**result, "cached": True}
+
+        self.stats["result_misses"] += 1
+        result = self._compute(inputs, dcf_cfg, sensitivity)
+        self._results[key] = result
+        while len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+        return {**result, "cached": False}
+
+    def _compute(self, inputs: TickerInputs, dcf_cfg: dict, sensitivity: bool) -> dict:
+        # Sub-millisecond: one DCF (plus the sensitivity table if asked for) on warm inputs
+        assumptions = self.pipeline._dcf_assumptions(inputs.sector, dcf_cfg, inputs.latest)
+        dcf = self.pipeline.dcf_model.run_dcf(inputs.latest["rev"], assumptions)
+        self.stats["valuations"] += 1
+        price = inputs.current_price
+        result = {
+            "ticker": inputs.ticker,
+            "sector": inputs.sector,
+            "assumptions": dcf_cfg,
+            "share_price": dcf["share_price"],
+            "enterprise_value": dcf["enterprise_value"],
+            "equity_value": dcf["equity_value"],
+            "current_price": price,
+            "upside": (dcf["share_price"] - price) / price if price else None,
+            "metrics_as_of": inputs.metrics_as_of,
+        }
+        if sensitivity:
+            table = self.pipeline.dcf_model.run_sensitivity_analysis(
+                inputs.latest["rev"], assumptions, **self.pipeline.config.get("sensitivity", {})
+            )
+            result["sensitivity"] = {"index": list(table.index), "columns": list(table.columns),
+                                     "data": table.to_numpy().tolist()}
+        return result
+
+    # -------------------------
+    # Warm inputs
+    # -------------------------
+    async def _get_inputs(self, ticker: str) -> TickerInputs:
+        inputs = self._inputs.get(ticker)
+        if inputs is not None and time.time() - inputs.loaded_at < self.input_ttl:
+            self._inputs.move_to_end(ticker)
+            return inputs
+        failure = self._failures.get(ticker)
+        if failure is not None and time.time() - failure[0] < self.error_ttl:
+            self.stats["cached_failures"] += 1
+            raise ValueError(failure[1])
+
+        loading = self._loading.get(ticker)
+        if loading is not None:
+            self.stats["coalesced_loads"] += 1
+            return await asyncio.shield(loading)
+
+        loading = asyncio.get_running_loop().run_in_executor(self._executor, self._load_inputs, ticker)
+        self._loading[ticker] = loading
+        self.stats["input_loads"] += 1
+        try:
+            inputs = await asyncio.shield(loading)
+        except Exception as e:
+            self._remember(self._failures, ticker, (time.time(), str(e)))
+            raise
+        finally:
+            self._loading.pop(ticker, None)
+        self._failures.pop(ticker, None)
+        self._remember(self._inputs, ticker, inputs)
+        return inputs
+
+    def _remember(self, entries: OrderedDict, ticker: str, value):
+        entries[ticker] = value
+        entries.move_to_end(ticker)
+        while len(entries) > self.max_inputs:
+            entries.popitem(last=False)
+
+    def _load_inputs(self, ticker: str) -> TickerInputs:
+        # Runs in the thread pool: fetch (through the pipeline's cached / rate-limited connectors) and process
+        fundamentals = self.pipeline.fundamental_connector.fetch(ticker)
+        report = Report(ticker)  # Collects the processor's error messages
+        processed = self.pipeline._process_fundamentals(fundamentals, report)
+        if processed is None:
+            notes = [str(value) for kind, _, value in report.entries if kind == "text"]
+            raise ValueError(notes[-1] if notes else f"No metrics for {ticker}")
+        metrics, latest = processed
+        try:
+            prices = self.pipeline.price_connector.fetch(ticker)
+            current_price = float(prices["Close"].iloc[-1])
+        except Exception:
+            current_price = None  # Fair value is still answered, without upside
+        return TickerInputs(
+            ticker=ticker,
+            sector=fundamentals.info.get("sector", "Unknown"),
+            industry=fundamentals.info.get("industry"),
+            latest={name: float(value) for name, value in latest.items()},
+            metrics_as_of=str(pd.Timestamp(metrics.index[-1]).date()),
+            current_price=current_price,
+            loaded_at=time.time(),
+        )
+
+    # -------------------------
+    # HTTP
+    # -------------------------
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._measure])
+        app.router.add_post("/valuate", self._handle_valuate)
+        app.router.add_get("/metrics", self._handle_metrics)
+        app.router.add_get("/health", self._handle_health)
+        return app
+
+    @web.middleware
+    async def _measure(self, request: web.Request, handler):
+        started = time.perf_counter()
+        try:
+            return await handler(request)
+        finally:
+            if request.path == "/valuate":
+                self.stats["requests"] += 1
+                self._latencies.append(time.perf_counter() - started)
+
+    async def _handle_valuate(self, request: web.Request) -> web.Response:
+        try:
+            body = await request.json()
+            tickers = body.get("tickers")
+            if not tickers:
+                raise ValueError("'tickers' is required")
+            if isinstance(tickers, str):
+                tickers = [tickers]
+            response = await self.valuate(tickers, body.get("overrides"), bool(body.get("sensitivity", False)))
+        except (ValueError, TypeError, AttributeError) as e:  # Malformed JSON is a ValueError too
+            self.stats["bad_requests"] += 1
+            return web.json_response({"error": f"Invalid request: {e}"}, status=400)
+        return web.json_response(response, dumps=_dumps)
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.json_response(self.metrics())
+
+    async def _handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+    def metrics(self) -> dict:
+        latencies = np.asarray(self._latencies) * 1000
+        percentiles = dict(zip(("p50_ms", "p95_ms", "p99_ms"), np.percentile(latencies, [50, 95, 99]).round(2))) \
+            if latencies.size else {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+        return {
+            **self.stats,
+            "latency": {**{k: float(v) if v is not None else None for k, v in percentiles.items()},
+                        "max_ms": round(float(latencies.max()), 2) if latencies.size else None,
+                        "window": int(latencies.size)},
+            "warm_tickers": len(self._inputs),
+            "cached_results": len(self._results),
+            "uptime_s": round(time.time() - self._started, 1),
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> str:
+        """
+        Starts serving and returns the base URL (port=0 picks a free port).
+        """
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        return f"http://{host}:{self._runner.addresses[0][1]}"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        self._executor.shutdown(wait=False)
+
+    def serve_forever(self, host: str = "127.0.0.1", port: int = 8080):
+        async def serve():
+            print(f"Valuation service listening on {await self.start(host, port)}")
+            try:
+                await asyncio.Event().wait()
+            finally:
+                await self.stop()
+
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
+
+
+def _dumps(payload) -> str:
+    return json.dumps(without_nan(payload), allow_nan=False)
@@ -0,0 +1,165 @@
+import dataclasses
+import hashlib
+import os
+import pickle
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def fingerprint(*parts) -> str:
+    """
+    Content hash of pipeline stage inputs: DataFrames / Series (values, index, columns and dtypes),
+    numpy arrays, dataclasses, dicts, sequences and scalars. Equal content gives equal hashes across runs.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        _update(digest, part)
+    return digest.hexdigest()
+
+
+def _update(digest, value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest.update(f"{type(value).__name__}{value.shape}".encode())
+        digest.update(repr(list(value.columns) if isinstance(value, pd.DataFrame) else value.name).encode())
+        digest.update(repr(value.dtypes.tolist() if isinstance(value, pd.DataFrame) else value.dtype).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(f"ndarray{value.shape}{value.dtype}".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        digest.update(type(value).__name__.encode())
+        _update(digest, dataclasses.asdict(value))
+    elif isinstance(value, dict):
+        digest.update(b"{")
+        for key in sorted(value, key=repr):
+            _update(digest, key)
+            _update(digest, value[key])
+        digest.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"[")
+        for item in value:
+            _update(digest, item)
+        digest.update(b"]")
+    elif isinstance(value, (bool, np.bool_)):
+        digest.update(repr(bool(value)).encode())
+    elif isinstance(value, (int, float, np.integer, np.floating)):
+        digest.update(repr(float(value)).encode())  # 1, 1.0 and np.float64(1.0) are the same input
+    else:
+        digest.update(f"{type(value).__name__}:{value!r}".encode())
+    digest.update(b";")
+
+
+class StageCache:
+    """
+    On-disk memo of pipeline stage outputs, keyed by stage name and a fingerprint of the stage inputs.
+
+    A stage is recomputed only when its inputs change: e.g. a new --wacc changes the DCF, sensitivity and
+    WACC chart keys, while the price analytics, statement metrics and price charts are served from disk.
+    Bump VERSION when a stage's computation changes, so entries written by older code are not reused.
+    Reading an entry refreshes its modification time, so prune() drops the entries no recent run used
+    (e.g. price stages keyed on yesterday's prices).
+    """
+
+    VERSION = 2
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def key(self, stage: str, *inputs) -> str:
+        return fingerprint(self.VERSION, stage, *inputs)
+
+    def _path(self, stage: str, key: str) -> str:
+        return os.path.join(self.root, stage, f"{key}.pkl")
+
+    def _load(self, stage: str, key: str):
+        path = self._path(stage, key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)  # Last use, for prune()
+            return value
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None  # Missing, corrupt or half-written file
+
+    def get(self, stage: str, key: str):
+        """
+        Stored output of the stage for this key, or None.
+        """
+        value = self._load(stage, key)
+        self._count("misses" if value is None else "hits")
+        return value
+
+    def put(self, stage: str, key: str, value):
+        path = self._path(stage, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)  # Atomic, readers never see a partial file
+
+    def memo(self, stage: str, inputs: tuple, compute):
+        """
+        Output of compute() for these inputs, from disk when the stage already ran on equal inputs.
+        None results (failed stages) are not stored.
+        """
+        key = self.key(stage, *inputs)
+        value = self.get(stage, key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(stage, key, value)
+        return value
+
+    # Stages whose output is a file (charts): the file's path is the key, the inputs it was written from the value
+    def is_current(self, stage: str, path: str, inputs_key: str) -> bool:
+        """
+        Whether the file at 'path' exists and was last written from inputs with this key.
+        """
+        current = os.path.exists(path) and self._load(stage, self.key(stage, path)) == inputs_key
+        self._count("hits" if current else "misses")
+        return current
+
+    def mark(self, stage: str, path: str, inputs_key: str):
+        self.put(stage, self.key(stage, path), inputs_key)
+
+    # -------------------------
+    # Pruning
+    # -------------------------
+    def prune(self, max_age_days: float | None = None, max_bytes: int | None = None) -> tuple[int, int]:
+        """
+        Deletes entries not read or written in the last max_age_days, then the least recently used ones
+        until the cache holds at most max_bytes. Returns (files deleted, bytes freed).
+        """
+        entries = []
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # Deleted by a concurrent run
+                entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        cutoff = time.time() - max_age_days * 24 * 60 * 60 if max_age_days is not None else float("-inf")
+        total = sum(size for _, size, _ in entries)
+        deleted, freed = 0, 0
+        for mtime, size, path in entries:  # Oldest first
+            if mtime >= cutoff and (max_bytes is None or total - freed <= max_bytes):
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            deleted += 1
+            freed += size
+        return deleted, freed
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
@@ -1,5 +1,7 @@
 import argparse
-from data.pipeline import AnalysisPipeline
+import sys
+# data.pipeline (pandas and the analytics modules) is imported once the arguments are valid, so --help and
+# argument errors return immediately; matplotlib, yfinance and aiohttp are only loaded when used
 
 parser = argparse.ArgumentParser()
 # General settings
@@ -8,13 +10,95 @@ parser.add_argument("--output_path", default="output_reports", type=str,
                     help="Specify path, where output will be saved. If None, no output will be saved")
 parser.add_argument( "--show_plt", action="store_true",
                      help="If set, display plots interactively. Otherwise, just save to output_path.")
+parser.add_argument("--plots", choices=["none", "summary", "all"], default="all",
+                    help="Charts to save: none, summary (price vs DCF only) or all")
+parser.add_argument("--render_workers", type=int, default=0,
+                    help="If > 0, render charts in this many background processes")
+parser.add_argument("--outputs", nargs="+", choices=["text", "jsonl", "arrow"], default=["text"],
+                    help="Report outputs: text reports, records.jsonl and/or records.arrow in output_path")
+parser.add_argument("--quiet", action="store_true", help="Do not print the per-ticker reports to the terminal")
+parser.add_argument("--timings", action="store_true",
+                    help="Print wall / CPU time per stage, the slowest tickers and data provider latency")
+parser.add_argument("--profile", type=str,
+                    help="If set, also dump cProfile stats, a tracemalloc snapshot and per-stage timings to this directory")
+parser.add_argument("--cache_dir", type=str, help="If set, cache fetched prices and fundamentals in this directory")
+parser.add_argument("--stage_cache_max_age", type=float, default=30,
+                    help="Days after which unused memoized stage outputs in <cache_dir>/stages are deleted")
+parser.add_argument("--stage_cache_max_mb", type=float,
+                    help="If set, also delete the least recently used stage outputs beyond this size")
+parser.add_argument("--warehouse", type=str,
+                    help="If set, read fundamentals from this local columnar warehouse (missing tickers are fetched and stored)")
+parser.add_argument("--price_panel", type=str,
+                    help="If set, keep daily prices in this memory-mapped dates x tickers panel (missing days are downloaded and "
+                         "appended). Replaces the --cache_dir price cache; statements are still cached")
+parser.add_argument("--sector_stats", type=str,
+                    help="If set, take sector / industry growth and margin assumptions from this peer statistics index (see main.py sectors)")
+parser.add_argument("--offline", action="store_true", help="Serve data from the cache only, never call the data provider")
+parser.add_argument("--workers", type=int, default=1,
+                    help="Worker processes for analysis, valuation and plotting. If > 1, tickers are processed concurrently")
+parser.add_argument("--io_workers", "--io-workers", type=int, default=4, help="Threads fetching data in concurrent mode")
+parser.add_argument("--async_fetch", action="store_true",
+                    help="Fetch data with the asyncio connectors (see the 'async' config section)")
 # Overrides
 parser.add_argument("--growth", type=float, help="Override revenue growth")
 parser.add_argument("--margin", type=float, help="Override target operating margin")
 parser.add_argument("--wacc", type=float, help="Override WACC")
 parser.add_argument("--terminal_growth", type=float, help="Override terminal growth rate")
+# Monte Carlo
+parser.add_argument("--mc_samples", type=int, help="If set, run a Monte Carlo DCF with this many samples per ticker (0 disables it)")
+
+# Screening saved results: python main.py screen --where "roic_wacc_spread > 0.05" --rank upside
+screen_parser = argparse.ArgumentParser(prog="main.py screen")
+screen_parser.add_argument("--results", default="output_reports", type=str,
+                           help="Output path of earlier runs, holding the results table")
+screen_parser.add_argument("--where", type=str, help="Filter expression, e.g. \"roic > 0.15 and sector == 'Technology'\"")
+screen_parser.add_argument("--rank", default="upside", type=str, help="Column or expression to rank by")
+screen_parser.add_argument("--top", default=50, type=int, help="Number of rows to return")
+screen_parser.add_argument("--ascending", action="store_true", help="Rank lowest first")
+screen_parser.add_argument("--columns", nargs="+", type=str, help="Columns to print (default: all)")
+# Valuation service: python main.py serve --port 8080 --cache_dir ./.cache
+serve_parser = argparse.ArgumentParser(prog="main.py serve")
+serve_parser.add_argument("--host", default="127.0.0.1", type=str)
+serve_parser.add_argument("--port", default=8080, type=int)
+serve_parser.add_argument("--cache_dir", type=str, help="If set, cache fetched prices and fundamentals in this directory")
+serve_parser.add_argument("--warehouse", type=str, help="If set, read fundamentals from this local columnar warehouse")
+serve_parser.add_argument("--sector_stats", type=str, help="If set, take sector / industry assumptions from this peer statistics index")
+serve_parser.add_argument("--offline", action="store_true", help="Serve data from the cache only")
+serve_parser.add_argument("--cache_size", default=4096, type=int, help="Valuation results kept in the in-memory LRU")
+serve_parser.add_argument("--input_ttl", default=900, type=float,
+                          help="Seconds before a ticker's fetched data and metrics are reloaded")
+serve_parser.add_argument("--max_inputs", default=4096, type=int, help="Tickers whose fetched data and metrics are kept warm")
+serve_parser.add_argument("--error_ttl", default=60, type=float,
+                          help="Seconds a ticker whose data could not be loaded is answered with the same error")
+# Point-in-time DCF backtest: python main.py backtest --tickers KO PEP --filing_lag 90
+backtest_parser = argparse.ArgumentParser(prog="main.py backtest")
+backtest_parser.add_argument("--tickers", nargs="+", type=str, required=True, help="universe to backtest")
+backtest_parser.add_argument("--output_path", default="output_reports", type=str,
+                             help="Directory for backtest.csv and backtest_summary.csv")
+backtest_parser.add_argument("--filing_lag", type=int,
+                             help="Days between a fiscal period end and the publication of its statements (default 90)")
+backtest_parser.add_argument("--cache_dir", type=str, help="If set, cache fetched prices and fundamentals in this directory")
+backtest_parser.add_argument("--warehouse", type=str, help="If set, read fundamentals from this local columnar warehouse")
+backtest_parser.add_argument("--sector_stats", type=str, help="If set, take sector / industry assumptions from this peer statistics index")
+backtest_parser.add_argument("--offline", action="store_true", help="Serve data from the cache only")
+backtest_parser.add_argument("--io_workers", "--io-workers", type=int, default=4, help="Threads fetching fundamentals")
+# Peer statistics index: python main.py sectors --tickers KO PEP MSFT ... --sector_stats ./sector_stats
+sectors_parser = argparse.ArgumentParser(prog="main.py sectors")
+sectors_parser.add_argument("--tickers", nargs="+", type=str, required=True, help="universe to add to the index")
+sectors_parser.add_argument("--sector_stats", type=str, required=True, help="Directory of the peer statistics index")
+sectors_parser.add_argument("--cache_dir", type=str, help="If set, cache fetched prices and fundamentals in this directory")
+sectors_parser.add_argument("--warehouse", type=str, help="If set, read fundamentals from this local columnar warehouse")
+sectors_parser.add_argument("--offline", action="store_true", help="Serve data from the cache only")
+sectors_parser.add_argument("--io_workers", "--io-workers", type=int, default=4, help="Threads fetching fundamentals")
+
 
 def main(args: argparse.Namespace):
+    if args.async_fetch and args.price_panel:
+        parser.error("--async_fetch cannot be combined with --price_panel")
+    if args.mc_samples is not None and args.mc_samples < 0:
+        parser.error("--mc_samples cannot be negative (0 disables the Monte Carlo DCF)")
+    from data.pipeline import AnalysisPipeline
+
     overrides = {
         "revenue_growth_5y": args.growth,
         "operating_margin_target": args.margin,
@@ -23,12 +107,70 @@ def main(args: argparse.Namespace):
     }
     overrides = {k: v for k, v in overrides.items() if v is not None}
 # Initialize and execute pipeline
-    pipeline = AnalysisPipeline(args.output_path, args.show_plt, overrides=overrides)
-    pipeline.run(args.tickers)
+    with AnalysisPipeline(args.output_path, args.show_plt, overrides=overrides, mc_samples=args.mc_samples,
+                          cache_dir=args.cache_dir, offline=args.offline, plots=args.plots,
+                          render_workers=args.render_workers, warehouse_dir=args.warehouse,
+                          outputs=tuple(args.outputs), quiet=args.quiet, instrument=args.timings,
+                          profile_dir=args.profile, price_panel_dir=args.price_panel,
+                          sector_stats_dir=args.sector_stats, stage_cache_max_age_days=args.stage_cache_max_age,
+                          stage_cache_max_mb=args.stage_cache_max_mb) as pipeline:
+        if args.async_fetch:
+            pipeline.run_async(args.tickers)
+        else:
+            pipeline.run(args.tickers, workers=args.workers, io_workers=args.io_workers)
+
+
+def screen(args: argparse.Namespace):
+    from data.results import ResultsTable
+
+    table = ResultsTable(args.results)
+    if len(table) == 0:
+        print(f"No results in {args.results}, run the pipeline first")
+        return
+    result = table.screen(args.where, rank=args.rank, k=args.top, ascending=args.ascending)
+    if args.columns:
+        result = result[[c for c in ["ticker", *args.columns] if c in result.columns]]
+    print(result.to_string(index=False))
+
+
+def serve(args: argparse.Namespace):
+    from data.pipeline import AnalysisPipeline
+    from data.service import ValuationService
+
+    with AnalysisPipeline(None, cache_dir=args.cache_dir, offline=args.offline, warehouse_dir=args.warehouse,
+                          plots="none", outputs=(), quiet=True, sector_stats_dir=args.sector_stats) as pipeline:
+        ValuationService(pipeline, cache_size=args.cache_size, input_ttl=args.input_ttl, max_inputs=args.max_inputs,
+                         error_ttl=args.error_ttl).serve_forever(args.host, args.port)
+
+
+def backtest(args: argparse.Namespace):
+    from data.pipeline import AnalysisPipeline
+
+    with AnalysisPipeline(args.output_path, cache_dir=args.cache_dir, offline=args.offline,
+                          warehouse_dir=args.warehouse, plots="none", outputs=(), quiet=True,
+                          sector_stats_dir=args.sector_stats) as pipeline:
+        pipeline.backtest(args.tickers, filing_lag_days=args.filing_lag, io_workers=args.io_workers)
+
+
+def sectors(args: argparse.Namespace):
+    from data.pipeline import AnalysisPipeline
+
+    with AnalysisPipeline(None, cache_dir=args.cache_dir, offline=args.offline, warehouse_dir=args.warehouse,
+                          plots="none", outputs=(), quiet=True, sector_stats_dir=args.sector_stats) as pipeline:
+        pipeline.refresh_sector_stats(args.tickers, io_workers=args.io_workers)
 
 
 if __name__ == "__main__":
     # Parse arguments and run
-    arg = parser.parse_args([] if "__file__" not in globals() else None)
-    main(arg)
+    if len(sys.argv) > 1 and sys.argv[1] == "screen":
+        screen(screen_parser.parse_args(sys.argv[2:]))
+    elif len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve(serve_parser.parse_args(sys.argv[2:]))
+    elif len(sys.argv) > 1 and sys.argv[1] == "backtest":
+        backtest(backtest_parser.parse_args(sys.argv[2:]))
+    elif len(sys.argv) > 1 and sys.argv[1] == "sectors":
+        sectors(sectors_parser.parse_args(sys.argv[2:]))
+    else:
+        arg = parser.parse_args([] if "__file__" not in globals() else None)
+        main(arg)
 
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.backtest import DCFBacktest
+from analytics.valuation import DCFModel
+
+TICKERS = ["AAA", "BBB", "CCC", "DDD"]
+
+
+@pytest.fixture
+def universe():
+    rng = np.random.default_rng(0)
+    frames, points = [], []
+    for i, ticker in enumerate(TICKERS):
+        # Each ticker trades on its own calendar, with listing dates a year apart and random missing days
+        dates = pd.bdate_range(f"{2012 + i}-03-01", "2020-12-31")
+        dates = dates[rng.random(len(dates)) > 0.05]
+        close = 50 * np.cumprod(1 + rng.normal(0.0004, 0.02, len(dates)))
+        splits = np.zeros(len(dates))
+        if ticker in ("AAA", "CCC"):
+            splits[rng.choice(len(dates), 2, replace=False)] = [2.0, 3.0]
+        frames.append(pd.DataFrame({"Date": dates, "Ticker": ticker, "Close": close, "Stock Splits": splits}))
+        for year in range(2011, 2021):
+            points.append({"Ticker": ticker, "Date": pd.Timestamp(f"{year}-12-31"), "rev": rng.uniform(1e9, 5e9),
+                           "roic": rng.uniform(0.05, 0.3), "net_debt": rng.uniform(-1e8, 1e9),
+                           "shares": rng.uniform(1e7, 1e8)})
+    prices = pd.concat(frames, ignore_index=True).sample(frac=1, random_state=1)  # Unsorted on purpose
+    history = pd.DataFrame(points).set_index(["Ticker", "Date"])
+    config = pd.DataFrame({"revenue_growth_5y": 0.06, "operating_margin_target": 0.2, "tax_rate": 0.21,
+                           "wacc": 0.09, "terminal_growth": 0.025}, index=TICKERS)
+    return history, prices, config
+
+
+def test_entries_match_merge_asof(universe):
+    history, prices, config = universe
+    results = DCFBacktest(history, prices, config, filing_lag_days=90, max_entry_gap_days=5).run()
+
+    points = history.reset_index()
+    points["available"] = points["Date"] + pd.Timedelta(days=90)
+    expected = pd.merge_asof(
+        points.sort_values("available"),
+        prices.sort_values("Date").rename(columns={"Date": "Entry"})[["Entry", "Ticker", "Close"]],
+        left_on="available", right_on="Entry", by="Ticker", direction="forward", tolerance=pd.Timedelta(days=5),
+    ).dropna(subset=["Entry"]).sort_values(["Ticker", "Date"], ignore_index=True)
+
+    assert len(expected) < len(points)  # Points before listing and after the last price are left out
+    pd.testing.assert_series_equal(results["Entry"], expected["Entry"], check_names=False)
+    np.testing.assert_array_equal(results["Close"], expected["Close"])
+
+
+def test_forward_returns_and_split_adjusted_fair_values(universe):
+    history, prices, config = universe
+    horizons = {"1m": 21, "12m": 252}
+    results = DCFBacktest(history, prices, config, horizons=horizons).run()
+    assert (results["split_factor"] > 1).any() and results["fwd_12m"].isna().any()
+
+    for row in results.itertuples():
+        bars = prices[prices["Ticker"] == row.Ticker].sort_values("Date", ignore_index=True)
+        entry = bars.index[bars["Date"] == row.Entry][0]
+        for name, days in horizons.items():
+            exit_close = bars["Close"].iloc[entry + days] if entry + days < len(bars) else np.nan
+            expected = exit_close / bars["Close"].iloc[entry] - 1
+            assert getattr(row, f"fwd_{name}") == pytest.approx(expected, nan_ok=True)
+
+        # Reported share counts are scaled by the splits after publication, to match split-adjusted closes
+        published = row.Date + pd.Timedelta(days=90)
+        later = bars.loc[(bars["Date"] > published) & (bars["Stock Splits"] > 0), "Stock Splits"]
+        assert row.split_factor == pytest.approx(later.prod())
+
+        point = history.loc[(row.Ticker, row.Date)]
+        fair_value = DCFModel.run_dcf_batch(point["rev"], gr_next5y=0.06, operating_margin_target=0.2, tax_rate=0.21,
+                                            roic_target=point["roic"], wacc=0.09, terminal_gr=0.025,
+                                            shares_outst=point["shares"] * later.prod(),
+                                            net_debt=point["net_debt"])["share_price"]
+        assert row.fair_value == pytest.approx(fair_value, rel=1e-12)
+        assert row.upside == pytest.approx(row.fair_value / row.Close - 1)
+
+
+def test_split_adjusted_share_counts_are_kept(universe):
+    history, prices, config = universe
+    history = history.assign(reported_shares=False)
+    results = DCFBacktest(history, prices, config).run()
+    assert (results["split_factor"] == 1.0).all()
+
+
+def test_yearly_rank_ic_is_spearman_per_year(universe):
+    history, prices, config = universe
+    backtest = DCFBacktest(history, prices, config, horizons={"3m": 63}, min_names=3)
+    results = backtest.run().dropna(subset=["fwd_3m"])
+    ic = backtest.yearly_rank_ic()["3m"].dropna()
+
+    for year, group in results.groupby(results["Date"].dt.year):
+        if len(group) < 3:
+            assert year not in ic.index
+            continue
+        expected = np.corrcoef(group["upside"].rank(), group["fwd_3m"].rank())[0, 1]
+        assert ic[year] == pytest.approx(expected)
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import analytics.monte_carlo as monte_carlo
+from analytics.monte_carlo import Empirical, MonteCarloDCF, Normal, Triangular
+from analytics.valuation import DCFAssumptions, DCFModel
+
+
+@pytest.fixture
+def base() -> DCFAssumptions:
+    return DCFAssumptions("Base", 0.08, 0.25, 0.21, 0.15, 0.09, 0.025, 1e9, 2e9)
+
+
+def spearman(a: np.ndarray, b: np.ndarray) -> float:
+    return np.corrcoef(pd.Series(a).rank(), pd.Series(b).rank())[0, 1]
+
+
+def test_iman_conover_reaches_rank_correlation_and_keeps_marginals(base, monkeypatch):
+    captured = {}
+
+    def capture(current_rev, **inputs):
+        captured.update(inputs)
+        return {"share_price": np.zeros(np.shape(inputs["wacc"]))}
+
+    monkeypatch.setattr(monte_carlo.DCFModel, "run_dcf_batch", staticmethod(capture))
+    distributions = {"wacc": Normal(0.09, 0.01), "gr_next5y": Triangular(0.0, 0.05, 0.2)}
+    model = MonteCarloDCF(50e9, base, distributions, correlation={("wacc", "gr_next5y"): -0.6})
+    monte_carlo._draw_share_prices(model._spec, np.random.default_rng(3), 50_000)
+
+    wacc, growth = captured["wacc"], captured["gr_next5y"]
+    assert spearman(wacc, growth) == pytest.approx(-0.6, abs=0.02)
+    # Reordering only: the marginals are the independent draws of each distribution
+    independent = np.random.default_rng(3)
+    np.testing.assert_array_equal(np.sort(wacc), np.sort(distributions["wacc"].sample(independent, 50_000)))
+    np.testing.assert_array_equal(np.sort(growth), np.sort(distributions["gr_next5y"].sample(independent, 50_000)))
+
+
+def test_uncorrelated_fields_stay_independent(base, monkeypatch):
+    captured = {}
+    monkeypatch.setattr(monte_carlo.DCFModel, "run_dcf_batch",
+                        staticmethod(lambda rev, **inputs: captured.update(inputs) or {"share_price": inputs["wacc"]}))
+    model = MonteCarloDCF(50e9, base, {"wacc": Normal(0.09, 0.01), "terminal_gr": Normal(0.02, 0.005)})
+    monte_carlo._draw_share_prices(model._spec, np.random.default_rng(5), 50_000)
+    assert abs(spearman(captured["wacc"], captured["terminal_gr"])) < 0.02
+
+
+def test_percentiles_match_exact_draws(base):
+    distributions = {"wacc": Normal(0.09, 0.01), "gr_next5y": Normal(0.08, 0.03)}
+    model = MonteCarloDCF(50e9, base, distributions, correlation={("wacc", "gr_next5y"): 0.3},
+                          chunk_size=20_000, bins=4_000, seed=11)
+    result = model.run(100_000, current_price=40.0)
+
+    # Same seeds and chunk sizes as run(): every sample drawn again and held in memory
+    seeds = np.random.SeedSequence(11).spawn(5)
+    values = np.concatenate([monte_carlo._draw_share_prices(model._spec, np.random.default_rng(seed), 20_000)
+                             for seed in seeds])
+    assert result["samples"] == values.size
+    assert result["mean"] == pytest.approx(values.mean(), rel=1e-9)
+    assert result["std"] == pytest.approx(values.std(ddof=1), rel=1e-6)
+    assert result["prob_above_price"] == pytest.approx(np.mean(values > 40.0))
+    bin_width = (np.percentile(values, 99.5) - np.percentile(values, 0.5)) * 2 / 4_000
+    for label, value in result["percentiles"].items():
+        assert value == pytest.approx(np.percentile(values, float(label[1:])), abs=2 * bin_width)
+
+
+def test_seeded_runs_do_not_depend_on_workers(base):
+    distributions = {"wacc": Normal(0.09, 0.01), "operating_margin_target": Empirical([0.2, 0.22, 0.25, 0.3])}
+    one = MonteCarloDCF(50e9, base, distributions, chunk_size=10_000, seed=1, workers=1).run(35_000)
+    two = MonteCarloDCF(50e9, base, distributions, chunk_size=10_000, seed=1, workers=2).run(35_000)
+    assert one["mean"] == pytest.approx(two["mean"], rel=1e-12)
+    pd.testing.assert_series_equal(one["percentiles"], two["percentiles"])
+
+
+def test_deterministic_model_matches_dcf(base):
+    # A zero-width distribution values every sample at the base assumptions
+    result = MonteCarloDCF(50e9, base, {"wacc": Normal(base.wacc, 0.0)}, chunk_size=1_000, seed=0).run(2_500)
+    assert result["mean"] == pytest.approx(DCFModel.run_dcf(50e9, base)["share_price"], rel=1e-12)
+
+
+@pytest.mark.parametrize("n_samples", [0, -5])
+def test_rejects_sample_counts_below_one(base, n_samples):
+    with pytest.raises(ValueError, match="n_samples"):
+        MonteCarloDCF(50e9, base, {"wacc": Normal(0.09, 0.01)}).run(n_samples)
+
+
+def test_rejects_chunk_size_below_one(base):
+    with pytest.raises(ValueError, match="chunk_size"):
+        MonteCarloDCF(50e9, base, {"wacc": Normal(0.09, 0.01)}, chunk_size=0)
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.plotter import Plotter, lttb
+
+
+def reference_lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> list[int]:
+    # Steinarsson's original formulation, one bucket at a time
+    n = len(y)
+    every = (n - 2) / (threshold - 2)
+    indices, a = [0], 0
+    for i in range(threshold - 2):
+        start, end = int(np.floor((i + 1) * every)) + 1, min(int(np.floor((i + 2) * every)) + 1, n)
+        avg_x, avg_y = x[start:end].mean(), y[start:end].mean()
+        lo, hi = int(np.floor(i * every)) + 1, int(np.floor((i + 1) * every)) + 1
+        areas = [abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a])) for j in range(lo, hi)]
+        a = lo + int(np.argmax(areas))
+        indices.append(a)
+    indices.append(n - 1)
+    return indices
+
+
+@pytest.mark.parametrize("n, threshold", [(1_000, 100), (1_001, 37), (500, 3), (10, 9)])
+def test_matches_reference(n, threshold):
+    rng = np.random.default_rng(n)
+    x = np.cumsum(rng.uniform(0.5, 1.5, n))
+    y = np.cumsum(rng.normal(size=n))
+    np.testing.assert_array_equal(lttb(x, y, threshold), reference_lttb(x, y, threshold))
+
+
+def test_keeps_endpoints_and_order():
+    y = np.sin(np.linspace(0, 20, 5_000))
+    keep = lttb(np.arange(5_000), y, 250)
+    assert len(keep) == 250
+    assert keep[0] == 0 and keep[-1] == 4_999
+    assert (np.diff(keep) > 0).all()
+
+
+def test_keeps_isolated_spikes():
+    y = np.zeros(10_000)
+    y[1_234], y[7_777] = 50.0, -40.0
+    keep = lttb(np.arange(10_000), y, 100)
+    assert {1_234, 7_777} <= set(keep.tolist())
+
+
+@pytest.mark.parametrize("threshold", [2, 100, 150])
+def test_short_series_or_small_threshold_kept_whole(threshold):
+    np.testing.assert_array_equal(lttb(np.arange(100), np.arange(100.0), threshold), np.arange(100))
+
+
+def test_price_series_thins_derived_columns_at_the_same_dates(monkeypatch):
+    monkeypatch.setattr(Plotter, "max_points", 50)
+    close = np.cumsum(np.random.default_rng(0).normal(size=400)) + 100
+    prices = pd.DataFrame({"Date": pd.bdate_range("2020-01-01", periods=400), "Close": close})
+    ma = prices["Close"].rolling(20).mean()
+
+    (dates, thinned), (ma_dates, ma_thinned) = Plotter._price_series(prices, ma)
+    assert len(dates) == 50
+    np.testing.assert_array_equal(ma_dates, dates)
+    keep = prices["Date"].searchsorted(dates)
+    np.testing.assert_array_equal(thinned, close[keep])
+    np.testing.assert_array_equal(ma_thinned, ma.to_numpy()[keep])
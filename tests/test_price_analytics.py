@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.price_analytics import PriceAnalytics, StreamingPriceAnalytics, _rolling_cvar
+
+
+def prices(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0.0003, 0.02, n))
+    return pd.DataFrame({"Date": pd.bdate_range("2020-01-01", periods=n), "Close": close})
+
+
+def naive_cvar(window: pd.Series, alpha: float) -> float:
+    var = window.quantile(alpha)
+    return window[window <= var].mean()
+
+
+@pytest.mark.parametrize("window, alpha", [(20, 0.05), (63, 0.05), (50, 0.1), (7, 0.5)])
+def test_rolling_cvar_matches_naive_rolling(window, alpha):
+    returns = PriceAnalytics(prices(400)).returns
+    expected = returns.rolling(window).apply(naive_cvar, args=(alpha,), raw=False)
+    np.testing.assert_allclose(_rolling_cvar(returns.to_numpy(), window, alpha), expected.to_numpy(), rtol=1e-12)
+
+
+def test_rolling_cvar_with_tied_returns():
+    # Rounded returns repeat, so equal values straddle the VaR
+    returns = pd.Series(np.round(np.random.default_rng(4).normal(0, 0.01, 300), 3))
+    expected = returns.rolling(30).apply(naive_cvar, args=(0.05,), raw=False)
+    np.testing.assert_allclose(_rolling_cvar(returns.to_numpy(), 30, 0.05), expected.to_numpy(), rtol=1e-12)
+
+
+def test_rolling_cvar_shorter_than_window():
+    assert np.isnan(_rolling_cvar(np.array([0.01, -0.02]), 5, 0.05)).all()
+
+
+def test_rolling_metrics_match_full_window_metrics():
+    data = prices(300, seed=1)
+    rolling = PriceAnalytics(data).rolling(window=63)
+    # Each row equals the metrics of a PriceAnalytics over the window's returns alone
+    for end in (62, 150, 298):
+        window = PriceAnalytics(data.iloc[end - 62:end + 2].reset_index(drop=True))
+        row = rolling.iloc[end]
+        assert row["Annualized Return"] == pytest.approx(window.annualized_return(), rel=1e-9)
+        assert row["Volatility"] == pytest.approx(window.volatility(), rel=1e-9)
+        assert row["Sharpe Ratio"] == pytest.approx(window.sharpe_ratio(), rel=1e-9)
+        assert row["Sortino Ratio"] == pytest.approx(window.sortino_ratio(), rel=1e-9)
+        assert row["Drawdown"] <= 0
+        assert row["CVaR (5%)"] == pytest.approx(window.cvar(), rel=1e-12)
+
+
+def test_streaming_matches_batch_metrics():
+    data = prices(1_000, seed=2)
+    batch = PriceAnalytics(data).summary(0.02)
+    stream = StreamingPriceAnalytics.from_prices(data, bins=20_000).summary(0.02)
+
+    pd.testing.assert_index_equal(stream.index, batch.index)
+    for metric in ("Annualized Return", "Sharpe Ratio", "Sortino Ratio", "Volatility", "Max Drawdown"):
+        assert stream[metric] == pytest.approx(batch[metric], rel=1e-9)
+    # The histogram CVaR interpolates within a bin instead of using the exact tail
+    assert stream["CVaR (5%)"] == pytest.approx(batch["CVaR (5%)"], rel=0.05)
+
+
+def test_streaming_updates_one_bar_at_a_time():
+    data = prices(200, seed=3)
+    stream = StreamingPriceAnalytics.from_prices(data.iloc[:150])
+    for close in data["Close"].iloc[150:]:
+        stream.update(close)
+    stream.update(np.nan)  # Missing bars are skipped
+    assert stream.n == 199
+    assert stream.volatility() == pytest.approx(PriceAnalytics(data).volatility(), rel=1e-9)
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.connector.base import BaseConnector
+from data.connector.price_panel import PanelPriceConnector, PricePanel
+
+
+def bars(start: str, days: int, close_scale: float = 1.0) -> pd.DataFrame:
+    dates = pd.bdate_range(start, periods=days)
+    close = (100 + np.arange(days, dtype=float)) * close_scale
+    return pd.DataFrame({"Date": dates, "Open": close - 1, "High": close + 1, "Low": close - 2, "Close": close,
+                         "Volume": 1e6})
+
+
+def test_written_bars_read_back(tmp_path):
+    panel = PricePanel(str(tmp_path))
+    frames = {"aaa": bars("2024-01-01", 30), "BBB": bars("2024-01-15", 10)}
+    panel.write(frames)
+
+    assert panel.tickers == ["AAA", "BBB"]
+    for ticker, data in frames.items():
+        pd.testing.assert_frame_equal(panel.frame(ticker), data, check_freq=False)
+    close = panel.close_frame()
+    assert close.shape == (30, 2)
+    assert close["BBB"].isna().sum() == 20
+    assert panel.last_date("BBB") == pd.Timestamp("2024-01-26")
+
+
+def test_new_days_fill_slack_rows_in_place(tmp_path):
+    panel = PricePanel(str(tmp_path), slack_days=10)
+    panel.write({"AAA": bars("2024-01-01", 20)})
+    size = (tmp_path / "Close.f64").stat().st_size
+    panel.write({"AAA": bars("2024-01-01", 25), "BBB": bars("2024-01-20", 5)})
+
+    # Five more days fit in the slack; the new ticker is one more column at the end of the files
+    assert (tmp_path / "Close.f64").stat().st_size == 2 * size
+    pd.testing.assert_frame_equal(panel.frame("AAA"), bars("2024-01-01", 25), check_freq=False)
+    # Another instance (e.g. a worker process) reads the same files
+    pd.testing.assert_frame_equal(PricePanel(str(tmp_path)).frame("BBB"), bars("2024-01-20", 5), check_freq=False)
+
+
+def test_earlier_days_rebuild_the_calendar(tmp_path):
+    panel = PricePanel(str(tmp_path))
+    panel.write({"AAA": bars("2024-02-01", 10)})
+    panel.write({"BBB": bars("2024-01-01", 10)})
+
+    assert panel.calendar[0] == pd.Timestamp("2024-01-01")
+    pd.testing.assert_frame_equal(panel.frame("AAA"), bars("2024-02-01", 10), check_freq=False)
+    pd.testing.assert_frame_equal(panel.frame("BBB"), bars("2024-01-01", 10), check_freq=False)
+
+
+def test_replace_clears_history_without_touching_live_views(tmp_path):
+    panel = PricePanel(str(tmp_path))
+    panel.write({"AAA": bars("2024-01-01", 30), "BBB": bars("2024-01-01", 30)})
+    before = panel.series("AAA")
+    panel.write({"AAA": bars("2024-01-15", 10, close_scale=0.5)}, replace=True)
+
+    pd.testing.assert_frame_equal(panel.frame("AAA"), bars("2024-01-15", 10, 0.5), check_freq=False)
+    pd.testing.assert_frame_equal(panel.frame("BBB"), bars("2024-01-01", 30), check_freq=False)
+    # A view taken before the replace still maps the previous files
+    np.testing.assert_array_equal(before, bars("2024-01-01", 30)["Close"].to_numpy())
+
+
+class FakeSource(BaseConnector):
+    def __init__(self, frames: dict[str, pd.DataFrame]):
+        self.frames = frames
+        self.requests = []
+
+    def fetch(self, ticker: str, **kwargs) -> pd.DataFrame:
+        return self.fetch_many([ticker], **kwargs)[ticker]
+
+    def fetch_many(self, tickers: list[str], start: str = "2015-01-01", **kwargs) -> dict[str, pd.DataFrame]:
+        self.requests.append((tuple(tickers), start))
+        return {t: self.frames[t][self.frames[t]["Date"] >= pd.Timestamp(start)].reset_index(drop=True)
+                for t in tickers}
+
+
+@pytest.mark.parametrize("close_scale, reloads", [(1.0, False), (0.98, True)])
+def test_connector_reloads_restated_history(tmp_path, close_scale, reloads):
+    source = FakeSource({"AAA": bars("2024-01-01", 20)})
+    connector = PanelPriceConnector(PricePanel(str(tmp_path)), source)
+    connector.fetch("AAA", start="2024-01-01")
+    source.frames["AAA"] = bars("2024-01-01", 25, close_scale)
+    data = connector.fetch("AAA", start="2024-01-01")
+
+    starts = [start for _, start in source.requests]
+    assert starts == ["2024-01-01", "2024-01-26"] + (["2024-01-01"] if reloads else [])
+    np.testing.assert_allclose(data["Close"].to_numpy(),
+                               bars("2024-01-01", 25, close_scale if reloads else 1.0)["Close"].to_numpy())
@@ -0,0 +1,95 @@
+import sys
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.connector.price import YahooPriceConnector
+from data.connector.price_store import PriceStore
+from data.connector.rate_limit import TokenBucket
+
+
+class FakeYahoo:
+    """Stand-in for yfinance.download serving a fixed daily history per ticker."""
+
+    def __init__(self, history: dict[str, pd.DataFrame]):
+        self.history = history
+        self.requests = []
+        self.shared = types.SimpleNamespace(_ERRORS={})
+
+    def download(self, tickers, start=None, end=None, **kwargs):
+        self.requests.append((tuple(tickers), start))
+        columns = {}
+        for ticker in tickers:
+            data = self.history[ticker]
+            data = data[data.index >= pd.Timestamp(start)]
+            for field in data.columns:
+                columns[(ticker, field)] = data[field]
+        return pd.DataFrame(columns)
+
+
+def history(days: int, close_scale: float = 1.0) -> pd.DataFrame:
+    index = pd.bdate_range("2024-01-01", periods=days, name="Date")
+    close = (100 + np.arange(days, dtype=float)) * close_scale
+    return pd.DataFrame({"Open": close - 0.5, "Close": close, "Volume": 1e6}, index=index)
+
+
+@pytest.fixture
+def yahoo(monkeypatch):
+    fake = FakeYahoo({"AAA": history(20)})
+    module = types.ModuleType("yfinance")
+    module.download = fake.download
+    module.shared = fake.shared
+    monkeypatch.setitem(sys.modules, "yfinance", module)
+    return fake
+
+
+@pytest.fixture
+def connector(tmp_path):
+    return YahooPriceConnector(store=PriceStore(str(tmp_path)), limiter=TokenBucket(rate=1000, capacity=10))
+
+
+def stored_close(connector: YahooPriceConnector) -> np.ndarray:
+    return connector.store.load("AAA")["Close"].to_numpy()
+
+
+def test_new_bars_are_appended(yahoo, connector):
+    connector.fetch("AAA", start="2024-01-01")
+    yahoo.history["AAA"] = history(25)
+    data = connector.fetch("AAA", start="2024-01-01")
+
+    # The second download starts at the last stored bar, used to check for restated history
+    assert yahoo.requests[-1][1] == "2024-01-26"
+    assert len(data) == 25
+    np.testing.assert_array_equal(stored_close(connector), history(25)["Close"].to_numpy())
+
+
+def test_restated_history_is_reloaded(yahoo, connector):
+    connector.fetch("AAA", start="2024-01-01")
+    # A dividend scales every auto-adjusted price before the ex-date
+    yahoo.history["AAA"] = history(25, close_scale=0.98)
+    data = connector.fetch("AAA", start="2024-01-01")
+
+    assert [start for _, start in yahoo.requests] == ["2024-01-01", "2024-01-26", "2024-01-01"]
+    np.testing.assert_allclose(data["Close"].to_numpy(), history(25, 0.98)["Close"].to_numpy())
+    np.testing.assert_allclose(stored_close(connector), history(25, 0.98)["Close"].to_numpy())
+
+
+def test_differences_within_tolerance_are_not_restatements(yahoo, connector):
+    connector.restatement_rtol = 1e-6
+    connector.fetch("AAA", start="2024-01-01")
+    yahoo.history["AAA"] = history(25, close_scale=1 + 1e-9)
+    connector.fetch("AAA", start="2024-01-01")
+
+    assert len(yahoo.requests) == 2
+    # Earlier bars are kept as stored, only the new bars come from the second download
+    np.testing.assert_array_equal(stored_close(connector)[:20], history(20)["Close"].to_numpy())
+
+
+def test_earlier_start_than_stored_is_reloaded(yahoo, connector):
+    connector.fetch("AAA", start="2024-01-15")
+    data = connector.fetch("AAA", start="2024-01-01")
+
+    assert [start for _, start in yahoo.requests] == ["2024-01-15", "2024-01-01"]
+    assert len(data) == 20
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+from analytics.ec_metric_processor import FundamentalProcessor
+from benchmarks.synthetic import SyntheticUniverse
+from data.models.fundamental_data import FundamentalData
+from data.sector_stats import SectorStatsIndex
+
+
+@pytest.fixture
+def fundamentals() -> dict[str, FundamentalData]:
+    universe = SyntheticUniverse(60, seed=3)
+    return {ticker: universe.fundamentals(ticker) for ticker in universe}
+
+
+def restated(data: FundamentalData, **info) -> FundamentalData:
+    statements = data.statements
+    return FundamentalData({**data.info, **info}, statements["income_statement"] * 1.1,
+                           statements["balance_sheet"], statements["cash_flow"])
+
+
+def test_update_reprocesses_only_changed_companies(tmp_path, fundamentals):
+    index = SectorStatsIndex(str(tmp_path))
+    assert index.update(fundamentals) == 60
+    assert index.update(fundamentals) == 0
+
+    changed = dict(fundamentals)
+    changed["S00007"] = restated(fundamentals["S00007"])
+    changed["S00011"] = FundamentalData({**fundamentals["S00011"].info, "sector": "Utilities"},
+                                        *fundamentals["S00011"].statements.values())
+    changed["NEW"] = SyntheticUniverse(1, seed=9).fundamentals("S00000")
+    assert index.update(changed) == 3
+    assert len(index) == 61
+
+    # Same tables as an index built from scratch over the final statements
+    rebuilt = SectorStatsIndex(str(tmp_path / "rebuilt"))
+    rebuilt.update(changed)
+    pd.testing.assert_frame_equal(index.companies, rebuilt.companies)
+    pd.testing.assert_frame_equal(index.table("industry"), rebuilt.table("industry"))
+
+
+def test_company_medians_match_scalar_processor(tmp_path, fundamentals):
+    index = SectorStatsIndex(str(tmp_path))
+    index.update(fundamentals)
+    companies = index.companies.set_index("ticker")
+    for ticker in ("S00000", "S00013", "S00042"):
+        metrics = FundamentalProcessor(fundamentals[ticker]).get_metrics()
+        row = companies.loc[ticker]
+        assert row["growth"] == pytest.approx(metrics["Growth"].median(), nan_ok=True)
+        assert row["nopat_margin"] == pytest.approx((metrics["NOPAT"] / metrics["Revenue"]).median(), nan_ok=True)
+        assert row["roic"] == pytest.approx(metrics["ROIC"].median(), nan_ok=True)
+
+
+def test_group_statistics_aggregate_company_medians(tmp_path, fundamentals):
+    index = SectorStatsIndex(str(tmp_path))
+    index.update(fundamentals)
+    companies = index.companies.dropna(subset=list(SectorStatsIndex.METRICS), how="all")
+    table = index.table("sector")
+    for sector, group in companies.groupby("sector"):
+        assert table.loc[sector, "count"] == len(group)
+        assert table.loc[sector, "roic"] == pytest.approx(group["roic"].median())
+        iqr = group["growth"].quantile(0.75) - group["growth"].quantile(0.25)
+        assert table.loc[sector, "growth_iqr"] == pytest.approx(iqr)
+
+
+def test_lookup_falls_back_to_sector_below_min_peers(tmp_path, fundamentals):
+    SectorStatsIndex(str(tmp_path)).update(fundamentals)
+    # A fresh instance reads the stored files
+    index = SectorStatsIndex(str(tmp_path), min_peers=1)
+    industry = index.table("industry")
+    name = industry.index[0]
+    sector = index.companies.loc[index.companies["industry"] == name, "sector"].iloc[0]
+
+    assert index.lookup(sector, name)["level"] == "industry"
+    index.min_peers = int(industry.loc[name, "count"]) + 1
+    stats = index.lookup(sector, name)
+    if index.table("sector").loc[sector, "count"] >= index.min_peers:
+        assert (stats["level"], stats["name"]) == ("sector", sector)
+    else:
+        assert stats is None
+    assert index.lookup("No Such Sector", "No Such Industry") is None
+
+
+def test_remove_drops_companies_from_the_groups(tmp_path, fundamentals):
+    index = SectorStatsIndex(str(tmp_path))
+    index.update(fundamentals)
+    ticker, sector = index.companies.dropna(subset=["roic"])[["ticker", "sector"]].iloc[0]
+    count = index.table("sector").loc[sector, "count"]
+    index.remove([ticker.lower()])
+    assert len(index) == 59
+    assert index.table("sector").loc[sector, "count"] == count - 1
@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.valuation import DCFAssumptions, DCFModel, DCF_INPUT_FIELDS
+
+
+def reference_dcf(current_rev: float, a: DCFAssumptions) -> dict:
+    # Scalar DCF as originally written (one year at a time in plain Python), the reference for the batch engine
+    reinvest_rate = a.gr_next5y / a.roic_target if a.roic_target > 0 else 0
+    rev, nopat, sum_pv_fcf, rows = current_rev, 0.0, 0.0, []
+    for year in range(1, 6):
+        rev = rev * (1 + a.gr_next5y)
+        ebit = rev * a.operating_margin_target
+        nopat = ebit * (1 - a.tax_rate)
+        investment = nopat * reinvest_rate
+        fcf = nopat - investment
+        pv_fcf = fcf / (1 + a.wacc) ** year
+        sum_pv_fcf += pv_fcf
+        rows.append([rev, ebit, nopat, investment, fcf, pv_fcf])
+    tv_reinvest_rate = a.terminal_gr / a.roic_target if a.roic_target > 0 else 0
+    terminal_val = nopat * (1 + a.terminal_gr) * (1 - tv_reinvest_rate) / max(a.wacc - a.terminal_gr, 0.001)
+    enterprise_val = sum_pv_fcf + terminal_val / (1 + a.wacc) ** 5
+    equity_val = enterprise_val - a.net_debt
+    return {
+        "share_price": equity_val / (a.shares_outst if a.shares_outst > 0 else 1),
+        "enterprise_value": enterprise_val,
+        "equity_value": equity_val,
+        "terminal_value": terminal_val,
+        "projections": np.array(rows),
+    }
+
+
+def random_assumptions(rng: np.random.Generator, n: int) -> list[DCFAssumptions]:
+    return [
+        DCFAssumptions(
+            name=f"case {i}",
+            gr_next5y=rng.uniform(-0.1, 0.3),
+            operating_margin_target=rng.uniform(-0.1, 0.5),
+            tax_rate=rng.uniform(0.0, 0.35),
+            roic_target=rng.choice([rng.uniform(0.02, 0.5), 0.0, -0.1]),  # Includes the "no reinvestment" branch
+            wacc=rng.uniform(0.04, 0.14),
+            terminal_gr=rng.uniform(-0.02, 0.05),
+            shares_outst=rng.choice([rng.uniform(1e6, 1e9), 0.0]),  # Includes the "no share count" branch
+            net_debt=rng.uniform(-1e9, 5e9),
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def base() -> DCFAssumptions:
+    return DCFAssumptions("Base", 0.08, 0.25, 0.21, 0.15, 0.09, 0.025, 1e9, 2e9)
+
+
+def test_run_dcf_matches_reference(base):
+    result = DCFModel.run_dcf(50e9, base)
+    expected = reference_dcf(50e9, base)
+    for key in ("share_price", "enterprise_value", "equity_value", "terminal_value"):
+        assert result[key] == pytest.approx(expected[key], rel=1e-12)
+    np.testing.assert_allclose(result["projections"].to_numpy(dtype=float), expected["projections"], rtol=1e-12)
+    assert list(result["projections"].index) == [1, 2, 3, 4, 5]
+
+
+def test_batch_matches_scalar_per_assumption_set():
+    rng = np.random.default_rng(7)
+    cases = random_assumptions(rng, 200)
+    revenue = rng.uniform(1e8, 1e11, size=len(cases))
+    inputs = {field: np.array([getattr(case, field) for case in cases]) for field in DCF_INPUT_FIELDS}
+
+    batch = DCFModel.run_dcf_batch(revenue, **inputs, projections=True)
+
+    for i, case in enumerate(cases):
+        scalar = DCFModel.run_dcf(revenue[i], case)
+        expected = reference_dcf(revenue[i], case)
+        for key in ("share_price", "enterprise_value", "equity_value", "terminal_value"):
+            assert batch[key][i] == pytest.approx(scalar[key], rel=1e-12)
+            assert batch[key][i] == pytest.approx(expected[key], rel=1e-9)
+        np.testing.assert_allclose(batch["projections"][i], expected["projections"], rtol=1e-9)
+
+
+def test_batch_broadcasts_scalars_against_arrays(base):
+    waccs = np.linspace(0.06, 0.12, 7)
+    inputs = {field: getattr(base, field) for field in DCF_INPUT_FIELDS}
+    inputs["wacc"] = waccs
+    batch = DCFModel.run_dcf_batch(50e9, **inputs)
+    assert batch["share_price"].shape == (7,)
+    for wacc, price in zip(waccs, batch["share_price"]):
+        case = DCFAssumptions(**{**base.__dict__, "wacc": wacc})
+        assert price == pytest.approx(reference_dcf(50e9, case)["share_price"], rel=1e-12)
+
+
+# -------------------------
+# Reverse DCF
+# -------------------------
+@pytest.mark.parametrize("field", DCF_INPUT_FIELDS)
+def test_reverse_dcf_recovers_each_input(base, field):
+    inputs = {name: getattr(base, name) for name in DCF_INPUT_FIELDS}
+    price = DCFModel.run_dcf(50e9, base)["share_price"]
+    result = DCFModel.run_reverse_dcf(field, price, 50e9, inputs)
+    assert result["solved"]
+    assert result["value"] == pytest.approx(getattr(base, field), rel=1e-6)
+
+
+@pytest.mark.parametrize("field", ["gr_next5y", "wacc", "operating_margin_target"])
+def test_reverse_dcf_solves_a_universe_at_once(field):
+    rng = np.random.default_rng(3)
+    cases = random_assumptions(rng, 50)
+    cases = [c for c in cases if c.roic_target > 0 and c.shares_outst > 0 and c.operating_margin_target > 0]
+    revenue = rng.uniform(1e9, 1e11, size=len(cases))
+    inputs = {name: np.array([getattr(c, name) for c in cases]) for name in DCF_INPUT_FIELDS}
+    prices = DCFModel.run_dcf_batch(revenue, **inputs)["share_price"]
+
+    result = DCFModel.run_reverse_dcf(field, prices, revenue, inputs)
+    # Wherever a value was found, it reprices the company at its market price
+    solved = result["solved"]
+    assert solved.mean() > 0.8
+    repriced = DCFModel.run_dcf_batch(revenue[solved], **{name: values[solved] for name, values in inputs.items()
+                                                         if name != field}, **{field: result["value"][solved]})
+    np.testing.assert_allclose(repriced["share_price"], prices[solved], rtol=1e-6)
+    assert np.isnan(result["value"][~solved]).all()
+
+
+def test_reverse_dcf_marks_unreachable_prices_unsolved(base):
+    inputs = {name: getattr(base, name) for name in DCF_INPUT_FIELDS}
+    # No growth rate in the default bracket gets near this price
+    result = DCFModel.run_reverse_dcf("gr_next5y", [1e6, DCFModel.run_dcf(50e9, base)["share_price"]], 50e9, inputs)
+    assert result["solved"].tolist() == [False, True]
+    assert np.isnan(result["value"][0])
+
+
+def test_reverse_dcf_rejects_unknown_or_missing_fields(base):
+    inputs = {name: getattr(base, name) for name in DCF_INPUT_FIELDS}
+    with pytest.raises(ValueError, match="Unknown"):
+        DCFModel.run_reverse_dcf("beta", 10.0, 50e9, inputs)
+    del inputs["wacc"]
+    with pytest.raises(ValueError, match="Missing"):
+        DCFModel.run_reverse_dcf("gr_next5y", 10.0, 50e9, inputs)
+
+
+# -------------------------
+# Sensitivity grids
+# -------------------------
+def test_sensitivity_analysis_matches_3x3_loop(base):
+    table = DCFModel.run_sensitivity_analysis(50e9, base)
+    # The original nested loop over WACC +-1% and terminal growth +-1%
+    for i, wacc in enumerate([base.wacc - 0.01, base.wacc, base.wacc + 0.01]):
+        for j, growth in enumerate([base.terminal_gr - 0.01, base.terminal_gr, base.terminal_gr + 0.01]):
+            case = DCFAssumptions(**{**base.__dict__, "wacc": wacc, "terminal_gr": growth})
+            assert table.iloc[i, j] == round(reference_dcf(50e9, case)["share_price"], 2)
+    assert table.index[0] == f"WACC {base.wacc - 0.01:.1%}"
+    assert table.columns[2] == f"Terminal Growth {base.terminal_gr + 0.01:.1%}"
+
+
+def test_sensitivity_grid_matches_pointwise_dcf(base):
+    axes = {"wacc": np.linspace(0.07, 0.11, 5), "gr_next5y": np.linspace(0.0, 0.2, 4),
+            "operating_margin_target": np.array([0.2, 0.35])}
+    grid = DCFModel.run_sensitivity_grid(50e9, base, axes, output="enterprise_value")
+    assert grid.shape == (5, 4, 2)
+    frame = grid.to_frame()
+    for (wacc, growth, margin), value in frame["enterprise_value"].items():
+        case = DCFAssumptions(**{**base.__dict__, "wacc": wacc, "gr_next5y": growth,
+                                 "operating_margin_target": margin})
+        assert value == pytest.approx(reference_dcf(50e9, case)["enterprise_value"], rel=1e-12)
+
+    # Fields left out of a table are held at the grid point nearest to their base value
+    table = grid.table("gr_next5y", "wacc")
+    assert table.shape == (4, 5)
+    np.testing.assert_array_equal(table.to_numpy(), grid.values[:, :, 0].T)
+    np.testing.assert_array_equal(grid.sel(wacc=0.09).values, grid.values[2])
+
+
+def test_sensitivity_grid_rejects_unknown_fields(base):
+    with pytest.raises(ValueError, match="Unknown"):
+        DCFModel.run_sensitivity_grid(50e9, base, {"beta": [1.0]})